@@ -2,22 +2,106 @@
 
 """ABRP (A Better Route Planner) telemetry client."""
 
+import asyncio
 import logging
 import time
+from datetime import timedelta
+
 import aiohttp
 
-from .const import ABRP_API_URL
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DOMAIN, CONF_ABRP_TOKEN, ABRP_API_URL, ABRP_REQUEST_TIMEOUT, ABRP_QUEUE_SIZE,
+    ABRP_HEARTBEAT_INTERVAL, PENDING_COMMAND_KEY,
+)
+from .features import Feature
+from .metrics import NULL_METRICS
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class ABRPClient:
-    """Client for sending telemetry to ABRP."""
+    """Client for sending telemetry to ABRP.
+
+    Telemetry is queued with ``enqueue`` and posted by a single background
+    worker, so at most one request is in flight per client. The queue is
+    bounded; when it is full the oldest payload is dropped, since only the
+    most recent telemetry is useful to ABRP.
+    """
 
-    def __init__(self, session: aiohttp.ClientSession, token: str):
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        token: str,
+        timeout: float = ABRP_REQUEST_TIMEOUT,
+        queue_size: int = ABRP_QUEUE_SIZE,
+    ):
         """Initialize ABRP client."""
         self._session = session
         self._token = token
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._worker: asyncio.Task | None = None
+        self.metrics = NULL_METRICS
+
+        # Send metrics
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.last_latency: float | None = None
+        self.total_latency = 0.0
+
+    @property
+    def stats(self) -> dict:
+        """Return a snapshot of the send metrics."""
+        attempts = self.sent + self.failed
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+            "last_latency": self.last_latency,
+            "avg_latency": round(self.total_latency / attempts, 3) if attempts else None,
+        }
+
+    def start(self, hass) -> None:
+        """Start the background send worker."""
+        if self._worker is None or self._worker.done():
+            self._worker = hass.async_create_background_task(
+                self._async_worker(), name="evconduit_abrp_worker"
+            )
+
+    async def async_stop(self) -> None:
+        """Stop the worker and discard any queued telemetry."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    def enqueue(self, vehicle_data: dict) -> None:
+        """Queue vehicle data for sending, dropping the oldest entry if full."""
+        if not vehicle_data:
+            return
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+            self.metrics.inc("abrp_dropped")
+            _LOGGER.debug("ABRP queue full, dropped oldest telemetry (%d dropped)", self.dropped)
+        self._queue.put_nowait(vehicle_data)
+
+    async def _async_worker(self) -> None:
+        """Send queued telemetry one request at a time."""
+        while True:
+            vehicle_data = await self._queue.get()
+            await self.async_send_telemetry(vehicle_data)
 
     def _get_nested(self, data: dict, path: str, default=None):
         """Get a nested value from a dict using dot notation."""
@@ -60,7 +144,12 @@ class ABRPClient:
         if lon is not None:
             payload["lon"] = lon
 
-        is_charging = self._get_nested(vehicle_data, "chargeState.isCharging")
+        # Report what the vehicle says, not a charging command's optimistic state
+        pending = vehicle_data.get(PENDING_COMMAND_KEY)
+        if pending:
+            is_charging = pending.get("isCharging")
+        else:
+            is_charging = self._get_nested(vehicle_data, "chargeState.isCharging")
         if is_charging is not None:
             payload["is_charging"] = 1 if is_charging else 0
 
@@ -73,16 +162,22 @@ class ABRPClient:
             _LOGGER.debug("No SOC data available, skipping ABRP update")
             return False
 
+        start = time.monotonic()
+        ok = False
         try:
-            _LOGGER.debug("Sending telemetry to ABRP: %s", payload)
+            _LOGGER.debug(
+                "Sending telemetry to ABRP: %s",
+                {k: v for k, v in payload.items() if k != "token"},
+            )
             async with self._session.post(
                 ABRP_API_URL,
                 data=payload,
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=self._timeout,
             ) as response:
                 if response.status == 200:
                     _LOGGER.debug("ABRP telemetry sent successfully")
-                    return True
+                    ok = True
                 else:
                     text = await response.text()
                     _LOGGER.warning(
@@ -90,10 +185,73 @@ class ABRPClient:
                         response.status,
                         text,
                     )
-                    return False
-        except aiohttp.ClientError as err:
+        except (TimeoutError, aiohttp.ClientError) as err:
             _LOGGER.warning("Failed to send ABRP telemetry: %s", err)
-            return False
+        except asyncio.CancelledError:
+            raise
         except Exception:
             _LOGGER.exception("Unexpected error sending ABRP telemetry")
-            return False
+        finally:
+            latency = time.monotonic() - start
+            self.last_latency = round(latency, 3)
+            self.total_latency += latency
+            self.metrics.observe("abrp.send", latency * 1000)
+
+        if ok:
+            self.sent += 1
+        else:
+            self.failed += 1
+            self.metrics.inc("abrp_failed")
+        return ok
+
+
+class ABRPFeature(Feature):
+    """Queue ABRP telemetry when a field ABRP receives changes.
+
+    A vehicle that reports in (``lastSeen``) is sent too, and telemetry not
+    sent for ABRP_HEARTBEAT_INTERVAL seconds is re-sent from a timer, so a
+    parked car with unchanged values still keeps ABRP's live data fresh.
+    """
+
+    name = "abrp"
+    watched = (
+        "chargeState.batteryLevel", "chargeState.isCharging", "chargeState.chargeRate",
+        "location", "lastSeen", PENDING_COMMAND_KEY,
+    )
+
+    def __init__(self, hass, entry, client, coordinator, metrics):
+        super().__init__(hass, entry, client, coordinator, metrics)
+        self.abrp = ABRPClient(async_get_clientsession(hass), entry.data[CONF_ABRP_TOKEN])
+        self.abrp.metrics = metrics
+        self._last_enqueued = 0.0
+        self._unsub_heartbeat = None
+
+    @callback
+    def async_start(self) -> None:
+        self.abrp.start(self.hass)
+        self.hass.data[DOMAIN][f"{self.entry.entry_id}_abrp"] = self.abrp
+        self._unsub_heartbeat = async_track_time_interval(
+            self.hass, self._async_heartbeat, timedelta(seconds=ABRP_HEARTBEAT_INTERVAL / 4)
+        )
+        _LOGGER.info("ABRP integration enabled for entry %s", self.entry.entry_id)
+
+    @callback
+    def async_vehicle_updated(self, data: dict, changed: set[str]) -> None:
+        self._enqueue(data)
+
+    @callback
+    def _async_heartbeat(self, _now) -> None:
+        data = self.coordinator.data
+        if data and time.monotonic() - self._last_enqueued >= ABRP_HEARTBEAT_INTERVAL:
+            self._enqueue(data)
+
+    def _enqueue(self, data: dict) -> None:
+        self._last_enqueued = time.monotonic()
+        self.abrp.enqueue(data)
+
+    async def async_unload(self) -> None:
+        if self._unsub_heartbeat:
+            self._unsub_heartbeat()
+            self._unsub_heartbeat = None
+        self.hass.data[DOMAIN].pop(f"{self.entry.entry_id}_abrp", None)
+        await self.abrp.async_stop()
@@ -0,0 +1,145 @@
+# custom_components/evconduit/analytics.py
+
+"""Consumption, cost and charging-loss statistics over the charging history."""
+
+import logging
+from collections import Counter
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def location_key(session: dict) -> str:
+    """Group sessions by station name, falling back to rounded coordinates."""
+    if session.get("station_name"):
+        return session["station_name"]
+    lat, lon = session.get("location_lat"), session.get("location_lon")
+    if lat is not None and lon is not None:
+        return f"{lat:.3f},{lon:.3f}"
+    return "Unknown"
+
+
+class _Totals:
+    __slots__ = ("sessions", "energy_kwh", "costs")
+
+    def __init__(self):
+        self.sessions = 0
+        self.energy_kwh = 0.0
+        self.costs: Counter = Counter()
+
+    def add(self, energy: float, currency: str | None, cost: float) -> None:
+        self.sessions += 1
+        self.energy_kwh += energy
+        if currency:
+            self.costs[currency] += cost
+
+    def as_dict(self) -> dict:
+        return {
+            "sessions": self.sessions,
+            "energy_kwh": round(self.energy_kwh, 2),
+            "cost": {currency: round(total, 2) for currency, total in self.costs.items()},
+        }
+
+
+class ChargingAnalytics:
+    """Running aggregates over a ChargingHistory, updated as sessions merge.
+
+    Consumption uses the charge-to-charge method: the odometer reading
+    stored on a session (see ``update_odometer``) minus the previous one is
+    the distance driven on the energy that session put back. Charging loss
+    compares energy added with the state-of-charge gain times the battery
+    capacity.
+
+    Sessions appended after the last processed one are folded in; a merge
+    that inserts older sessions triggers a full recomputation.
+    """
+
+    def __init__(self, history):
+        self._history = history
+        self._reset()
+
+    def _reset(self) -> None:
+        self._processed = 0
+        self._last_start = ""
+        self.totals = _Totals()
+        self.locations: dict[str, _Totals] = {}
+        # Charge-to-charge consumption
+        self._last_odometer: float | None = None
+        self.distance_km = 0.0
+        self.distance_energy_kwh = 0.0
+        self.distance_costs: Counter = Counter()
+        # Charging loss: SoC points gained vs. energy added, same sessions
+        self.soc_gain_pct = 0.0
+        self.soc_energy_kwh = 0.0
+
+    @callback
+    def async_update(self, earliest: str | None = None) -> None:
+        """Fold in newly merged sessions; `earliest` is the oldest new start_time."""
+        sessions = self._history.sessions
+        if earliest is None or earliest < self._last_start or self._processed > len(sessions):
+            self._reset()
+        for session in sessions[self._processed:]:
+            self._add(session)
+        self._processed = len(sessions)
+        if sessions:
+            self._last_start = sessions[-1].get("start_time") or ""
+
+    def _add(self, s: dict) -> None:
+        energy = s.get("energy_added_kwh") or 0.0
+        cost = s.get("total_cost") or 0.0
+        currency = s.get("currency")
+        self.totals.add(energy, currency, cost)
+        self.locations.setdefault(location_key(s), _Totals()).add(energy, currency, cost)
+
+        odometer = s.get("odometer_km")
+        if odometer is not None:
+            if self._last_odometer is not None and odometer > self._last_odometer:
+                self.distance_km += odometer - self._last_odometer
+                self.distance_energy_kwh += energy
+                if currency:
+                    self.distance_costs[currency] += cost
+            self._last_odometer = odometer
+
+        start, end = s.get("battery_level_start"), s.get("battery_level_end")
+        if start is not None and end is not None and end > start and energy > 0:
+            self.soc_gain_pct += end - start
+            self.soc_energy_kwh += energy
+
+    @property
+    def currency(self) -> str | None:
+        """The most used currency; cost figures are reported in it."""
+        common = self.totals.costs.most_common(1)
+        return common[0][0] if common else None
+
+    @property
+    def consumption_kwh_100km(self) -> float | None:
+        if not self.distance_km:
+            return None
+        return round(self.distance_energy_kwh / self.distance_km * 100, 1)
+
+    @property
+    def cost_per_km(self) -> float | None:
+        currency = self.currency
+        if not self.distance_km or currency is None:
+            return None
+        return round(self.distance_costs[currency] / self.distance_km, 3)
+
+    def charging_loss_pct(self, capacity_kwh: float | None) -> float | None:
+        if not capacity_kwh or not self.soc_energy_kwh:
+            return None
+        stored = self.soc_gain_pct / 100 * capacity_kwh
+        return round(max(0.0, 1 - stored / self.soc_energy_kwh) * 100, 1)
+
+    def as_dict(self, capacity_kwh: float | None) -> dict:
+        """Full statistics, including per-location totals (most used first)."""
+        locations = sorted(self.locations.items(), key=lambda item: item[1].sessions, reverse=True)
+        return {
+            **self.totals.as_dict(),
+            "currency": self.currency,
+            "distance_km": round(self.distance_km, 1),
+            "consumption_kwh_100km": self.consumption_kwh_100km,
+            "cost_per_km": self.cost_per_km,
+            "charging_loss_pct": self.charging_loss_pct(capacity_kwh),
+            "locations": [{"location": name, **totals.as_dict()} for name, totals in locations],
+        }
@@ -2,14 +2,22 @@
 EVConduit API client for fetching user and vehicle information and 
 handling rate‐limit (HTTP 429) with persistent notifications.
 """
-from datetime import datetime
 import asyncio
 import aiohttp
 import logging
+import time
+from collections import deque
 
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import DIAGNOSTICS_REQUESTS
+from .log import RateLimitedLogger
+from .metrics import NULL_METRICS
 
 _LOGGER = logging.getLogger(__name__)
+# Poll failures repeat every cycle while the backend is down
+_POLL_LOGGER = RateLimitedLogger(_LOGGER)
 
 class EVConduitClient:
     """
@@ -26,26 +34,60 @@ class EVConduitClient:
         self.api_key    = api_key
         self.base_url   = base_url.rstrip("/")
         self.vehicle_id = vehicle_id
+        self.metrics    = NULL_METRICS
+        # Set once vehicle data exists (live or restored), after which a
+        # 429 fails the refresh instead of returning empty data
+        self.has_initial_data = False
+
+        # Recent requests and rate-limit state, kept for diagnostics
+        self.recent_requests: deque = deque(maxlen=DIAGNOSTICS_REQUESTS)
+        self.rate_limited_count = 0
+        self.last_rate_limited: str | None = None
+
+    @property
+    def rate_limit_state(self) -> dict:
+        """Return the rate-limit counters for diagnostics."""
+        return {
+            "rate_limited_count": self.rate_limited_count,
+            "last_rate_limited": self.last_rate_limited,
+            "has_initial_data": self.has_initial_data,
+        }
+
+    def _record(self, endpoint: str, start: float, status: int) -> None:
+        """Record request latency (ms) per endpoint and count rate limiting."""
+        elapsed = (time.perf_counter() - start) * 1000
+        self.metrics.observe(f"request.{endpoint}", elapsed)
+        now = dt_util.utcnow().isoformat()
+        self.recent_requests.append(
+            {"endpoint": endpoint, "status": status, "ms": round(elapsed, 1), "at": now}
+        )
+        if status == 429:
+            self.rate_limited_count += 1
+            self.last_rate_limited = now
+            self.metrics.inc("rate_limited")
 
     async def async_get_userinfo(self) -> dict | None:
         url = f"{self.base_url}/api/me"
         headers = {"Authorization": f"Bearer {self.api_key}"}
-        _LOGGER.debug(f"[EVConduitClient] GET userinfo: {url}")
+        _LOGGER.debug("[EVConduitClient] GET userinfo: %s", url)
+        start = time.perf_counter()
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.get(url, headers=headers, timeout=15) as resp:
+                    self._record("userinfo", start, resp.status)
                     if resp.status == 200:
                         data = await resp.json()
-                        _LOGGER.debug(f"[EVConduitClient] Userinfo: {data}")
+                        _LOGGER.debug("[EVConduitClient] Userinfo: %s", data)
                         return data
 
-                    _LOGGER.debug(f"[EVConduitClient] Failed userinfo: HTTP {resp.status}")
+                    _LOGGER.debug("[EVConduitClient] Failed userinfo: HTTP %s", resp.status)
         except (TimeoutError, aiohttp.ClientError) as err:
-            _LOGGER.debug(f"[EVConduitClient] Userinfo request failed (will retry): {err}")
+            self.metrics.inc("request_errors")
+            _LOGGER.debug("[EVConduitClient] Userinfo request failed (will retry): %s", err)
         except asyncio.CancelledError:
             raise
         except Exception as err:
-            _LOGGER.exception(f"[EVConduitClient] Exception fetching userinfo: {err}")
+            _LOGGER.exception("[EVConduitClient] Exception fetching userinfo: %s", err)
         return None
 
     async def async_get_vehicle_status(self) -> dict:
@@ -55,34 +97,38 @@ class EVConduitClient:
         unless it's the first refresh (no previous data) in which case
         returns empty dict so setup can complete.
         """
-        _LOGGER.info("Polling vehicle status at %s", datetime.now())
         url = f"{self.base_url}/api/status/{self.vehicle_id}"
         headers = {"Authorization": f"Bearer {self.api_key}"}
-        _LOGGER.debug(f"[EVConduitClient] GET vehicle status: {url}")
+        _LOGGER.debug("[EVConduitClient] GET vehicle status: %s", url)
 
+        start = time.perf_counter()
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.get(url, headers=headers, timeout=15) as resp:
+                    self._record("vehicle_status", start, resp.status)
                     if resp.status == 200:
                         data = await resp.json()
-                        _LOGGER.debug(f"[EVConduitClient] Vehicle status: {data}")
-                        self._has_initial_data = True
+                        _LOGGER.debug("[EVConduitClient] Vehicle status: %s", data)
+                        self.has_initial_data = True
                         return data
 
                     if resp.status == 429:
-                        _LOGGER.debug(f"[EVConduitClient] Rate limited (429) on {url}")
+                        _LOGGER.debug("[EVConduitClient] Rate limited (429) on %s", url)
                         # On first refresh, return empty data so setup completes
                         # and the next poll cycle can fetch real data
-                        if not getattr(self, "_has_initial_data", False):
+                        if not self.has_initial_data:
                             _LOGGER.debug("[EVConduitClient] Rate limited on first refresh, returning empty data to allow setup")
-                            self._has_initial_data = True
+                            self.has_initial_data = True
                             return {}
                         raise UpdateFailed("429 rate limited by EVConduit")
                     
                     # Bad request (e.g. invalid vehicle_id, backend error, etc)
                     if resp.status == 400:
                         text = await resp.text()
-                        _LOGGER.warning(f"[EVConduitClient] Vehicle status fetch rejected (400): {text}")
+                        _POLL_LOGGER.warning(
+                            f"status_{self.vehicle_id}",
+                            "[EVConduitClient] Vehicle status fetch rejected (400): %s", text,
+                        )
                         self.hass.async_create_task(
                             self.hass.services.async_call(
                                 "persistent_notification",
@@ -100,19 +146,23 @@ class EVConduitClient:
 
                     # Other errors - raise UpdateFailed to preserve previous data
                     text = await resp.text()
-                    _LOGGER.error(f"[EVConduitClient] Vehicle status fetch failed HTTP {resp.status}: {text}")
+                    _POLL_LOGGER.error(
+                        f"status_{self.vehicle_id}",
+                        "[EVConduitClient] Vehicle status fetch failed HTTP %s: %s", resp.status, text,
+                    )
                     raise UpdateFailed(f"HTTP {resp.status}: {text}")
 
         except UpdateFailed:
             # Re-raise UpdateFailed so coordinator preserves previous data
             raise
         except (TimeoutError, aiohttp.ClientError) as err:
-            _LOGGER.debug(f"[EVConduitClient] Vehicle status request failed (will retry): {err}")
+            self.metrics.inc("request_errors")
+            _LOGGER.debug("[EVConduitClient] Vehicle status request failed (will retry): %s", err)
             raise UpdateFailed(f"Network error: {err}")
         except asyncio.CancelledError:
             raise
         except Exception as err:
-            _LOGGER.exception(f"[EVConduitClient] Exception fetching vehicle status: {err}")
+            _LOGGER.exception("[EVConduitClient] Exception fetching vehicle status: %s", err)
             raise UpdateFailed(f"Exception: {err}")
 
     async def async_set_charging(self, action: str) -> dict | None:
@@ -122,22 +172,23 @@ class EVConduitClient:
             "Content-Type": "application/json",
         }
         payload = {"action": action.upper()}
-        _LOGGER.debug(f"[EVConduitClient] POST charging: {url} payload={payload}")
+        _LOGGER.debug("[EVConduitClient] POST charging: %s payload=%s", url, payload)
+        start = time.perf_counter()
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.post(url, json=payload, headers=headers, timeout=15) as resp:
+                    self._record("set_charging", start, resp.status)
                     text = await resp.text()
                     if resp.status in (200, 201):
                         data = await resp.json()
-                        _LOGGER.debug(f"[EVConduitClient] Charging response: {data}")
+                        _LOGGER.debug("[EVConduitClient] Charging response: %s", data)
                         return data
-                    _LOGGER.error(
-                        f"[EVConduitClient] Charging failed HTTP {resp.status}: {text}"
-                    )
+                    _LOGGER.error("[EVConduitClient] Charging failed HTTP %s: %s", resp.status, text)
         except (TimeoutError, aiohttp.ClientError) as err:
-            _LOGGER.warning(f"[EVConduitClient] Charging request failed (network error): {err}")
+            self.metrics.inc("request_errors")
+            _LOGGER.warning("[EVConduitClient] Charging request failed (network error): %s", err)
         except Exception as err:
-            _LOGGER.exception(f"[EVConduitClient] Exception setting charging: {err}")
+            _LOGGER.exception("[EVConduitClient] Exception setting charging: %s", err)
         return None
 
     async def async_get_vehicles(self) -> list[dict]:
@@ -147,27 +198,31 @@ class EVConduitClient:
         """
         url = f"{self.base_url}/api/user/vehicles"
         headers = {"Authorization": f"Bearer {self.api_key}"}
-        _LOGGER.debug(f"[EVConduitClient] GET vehicles: {url}")
+        _LOGGER.debug("[EVConduitClient] GET vehicles: %s", url)
+        start = time.perf_counter()
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.get(url, headers=headers, timeout=10) as resp:
+                    self._record("vehicles", start, resp.status)
                     if resp.status == 200:
                         data = await resp.json()
-                        _LOGGER.debug(f"[EVConduitClient] Vehicles: {data}")
+                        _LOGGER.debug("[EVConduitClient] Vehicles: %s", data)
                         # Expects: [{"id": "...", "displayName": "...", ...}, ...]
                         return data if isinstance(data, list) else []
-                    _LOGGER.error(f"[EVConduitClient] Failed to get vehicles: HTTP {resp.status}")
+                    _LOGGER.error("[EVConduitClient] Failed to get vehicles: HTTP %s", resp.status)
         except (TimeoutError, aiohttp.ClientError) as err:
-            _LOGGER.warning(f"[EVConduitClient] Vehicles request failed (will retry): {err}")
+            self.metrics.inc("request_errors")
+            _LOGGER.warning("[EVConduitClient] Vehicles request failed (will retry): %s", err)
         except Exception as err:
-            _LOGGER.exception(f"[EVConduitClient] Exception fetching vehicles: {err}")
+            _LOGGER.exception("[EVConduitClient] Exception fetching vehicles: %s", err)
         return []
 
-    async def async_register_webhook(self, webhook_id: str, external_url: str, vehicle_id: str = "") -> bool:
+    async def async_register_webhook(self, webhook_id: str, external_url: str, vehicle_id: str = "") -> bool | None:
         """
         Register the Home Assistant webhook URL with EVConduit.
         This enables push notifications for real-time vehicle updates.
-        Returns True if successful, False otherwise.
+        Returns True if successful, None if the account is not allowed to
+        use webhooks (retrying will not help), False otherwise.
         """
         url = f"{self.base_url}/api/ha/webhook/register"
         headers = {
@@ -179,26 +234,29 @@ class EVConduitClient:
             "external_url": external_url.rstrip("/"),
             "vehicle_id": vehicle_id,
         }
-        _LOGGER.debug(f"[EVConduitClient] POST webhook register: {url}")
+        _LOGGER.debug("[EVConduitClient] POST webhook register: %s", url)
+        start = time.perf_counter()
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.post(url, json=payload, headers=headers, timeout=15) as resp:
+                    self._record("webhook_register", start, resp.status)
                     if resp.status == 200:
                         data = await resp.json()
-                        _LOGGER.info(f"[EVConduitClient] Webhook registered successfully: {data}")
+                        _LOGGER.info("[EVConduitClient] Webhook registered successfully: %s", data)
                         return True
                     elif resp.status == 403:
                         text = await resp.text()
-                        _LOGGER.warning(f"[EVConduitClient] Webhook registration denied (Pro tier required): {text}")
-                        return False
+                        _LOGGER.warning("[EVConduitClient] Webhook registration denied (Pro tier required): %s", text)
+                        return None
                     else:
                         text = await resp.text()
-                        _LOGGER.error(f"[EVConduitClient] Webhook registration failed HTTP {resp.status}: {text}")
+                        _LOGGER.error("[EVConduitClient] Webhook registration failed HTTP %s: %s", resp.status, text)
                         return False
         except (TimeoutError, aiohttp.ClientError) as err:
-            _LOGGER.warning(f"[EVConduitClient] Webhook registration failed (network error): {err}")
+            self.metrics.inc("request_errors")
+            _LOGGER.warning("[EVConduitClient] Webhook registration failed (network error): %s", err)
         except Exception as err:
-            _LOGGER.exception(f"[EVConduitClient] Exception registering webhook: {err}")
+            _LOGGER.exception("[EVConduitClient] Exception registering webhook: %s", err)
         return False
 
     async def async_unregister_webhook(self) -> bool:
@@ -208,21 +266,24 @@ class EVConduitClient:
         """
         url = f"{self.base_url}/api/ha/webhook/register"
         headers = {"Authorization": f"Bearer {self.api_key}"}
-        _LOGGER.debug(f"[EVConduitClient] DELETE webhook unregister: {url}")
+        _LOGGER.debug("[EVConduitClient] DELETE webhook unregister: %s", url)
+        start = time.perf_counter()
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.delete(url, headers=headers, timeout=15) as resp:
+                    self._record("webhook_unregister", start, resp.status)
                     if resp.status == 200:
                         _LOGGER.info("[EVConduitClient] Webhook unregistered successfully")
                         return True
                     else:
                         text = await resp.text()
-                        _LOGGER.error(f"[EVConduitClient] Webhook unregister failed HTTP {resp.status}: {text}")
+                        _LOGGER.error("[EVConduitClient] Webhook unregister failed HTTP %s: %s", resp.status, text)
                         return False
         except (TimeoutError, aiohttp.ClientError) as err:
-            _LOGGER.warning(f"[EVConduitClient] Webhook unregister failed (network error): {err}")
+            self.metrics.inc("request_errors")
+            _LOGGER.warning("[EVConduitClient] Webhook unregister failed (network error): %s", err)
         except Exception as err:
-            _LOGGER.exception(f"[EVConduitClient] Exception unregistering webhook: {err}")
+            _LOGGER.exception("[EVConduitClient] Exception unregistering webhook: %s", err)
         return False
 
     async def async_push_electricity_rate(self, cost_per_kwh: float, currency: str) -> dict | None:
@@ -236,22 +297,62 @@ class EVConduitClient:
             "Content-Type": "application/json",
         }
         payload = {"cost_per_kwh": cost_per_kwh, "currency": currency}
-        _LOGGER.debug(f"[EVConduitClient] POST electricity rate: {url} payload={payload}")
+        _LOGGER.debug("[EVConduitClient] POST electricity rate: %s payload=%s", url, payload)
+        start = time.perf_counter()
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.post(url, json=payload, headers=headers, timeout=15) as resp:
+                    self._record("electricity_rate", start, resp.status)
                     if resp.status == 200:
                         data = await resp.json()
-                        _LOGGER.info(f"[EVConduitClient] Electricity rate pushed: {cost_per_kwh} {currency}")
+                        _LOGGER.debug("[EVConduitClient] Electricity rate pushed: %s %s", cost_per_kwh, currency)
                         return data
                     else:
                         text = await resp.text()
-                        _LOGGER.error(f"[EVConduitClient] Electricity rate push failed HTTP {resp.status}: {text}")
+                        _LOGGER.error("[EVConduitClient] Electricity rate push failed HTTP %s: %s", resp.status, text)
                         return None
         except (TimeoutError, aiohttp.ClientError) as err:
-            _LOGGER.warning(f"[EVConduitClient] Electricity rate push failed (network error): {err}")
+            self.metrics.inc("request_errors")
+            _LOGGER.warning("[EVConduitClient] Electricity rate push failed (network error): %s", err)
+        except Exception as err:
+            _LOGGER.exception("[EVConduitClient] Exception pushing electricity rate: %s", err)
+        return None
+
+    async def async_push_electricity_tariff(self, prices: list[dict], currency: str) -> dict | bool | None:
+        """
+        Upload an electricity price curve to EVConduit.
+        `prices` is a list of {"start", "end", "cost_per_kwh"} dicts with ISO 8601 times.
+        Returns the response dict if successful, False if the backend has no
+        tariff endpoint (HTTP 404/405, retrying will not help), None otherwise.
+        """
+        url = f"{self.base_url}/api/ha/electricity-tariff"
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        payload = {"currency": currency, "prices": prices}
+        _LOGGER.debug("[EVConduitClient] POST electricity tariff: %s (%d intervals)", url, len(prices))
+        start = time.perf_counter()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(url, json=payload, headers=headers, timeout=30) as resp:
+                    self._record("electricity_tariff", start, resp.status)
+                    if resp.status == 200:
+                        data = await resp.json()
+                        _LOGGER.info("[EVConduitClient] Electricity tariff uploaded: %d intervals %s", len(prices), currency)
+                        return data
+                    text = await resp.text()
+                    if resp.status in (404, 405):
+                        _LOGGER.warning("[EVConduitClient] Electricity tariff upload not supported by the backend: %s", text)
+                        return False
+                    _LOGGER.error("[EVConduitClient] Electricity tariff upload failed HTTP %s: %s", resp.status, text)
+        except (TimeoutError, aiohttp.ClientError) as err:
+            self.metrics.inc("request_errors")
+            _LOGGER.warning("[EVConduitClient] Electricity tariff upload failed (network error): %s", err)
+        except asyncio.CancelledError:
+            raise
         except Exception as err:
-            _LOGGER.exception(f"[EVConduitClient] Exception pushing electricity rate: {err}")
+            _LOGGER.exception("[EVConduitClient] Exception uploading electricity tariff: %s", err)
         return None
 
     async def async_get_charging_sessions(self, since: str | None = None, limit: int = 50) -> dict | None:
@@ -265,9 +366,11 @@ class EVConduitClient:
         url = f"{self.base_url}/api/ha/charging/sessions"
         headers = {"Authorization": f"Bearer {self.api_key}"}
         _LOGGER.debug("[EVConduitClient] GET charging sessions: %s params=%s", url, params)
+        start = time.perf_counter()
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.get(url, headers=headers, params=params, timeout=30) as resp:
+                    self._record("charging_sessions", start, resp.status)
                     if resp.status == 200:
                         data = await resp.json()
                         _LOGGER.debug("[EVConduitClient] Charging sessions: %d returned", len(data.get("sessions", [])))
@@ -275,6 +378,7 @@ class EVConduitClient:
                     text = await resp.text()
                     _LOGGER.error("[EVConduitClient] Charging sessions fetch failed HTTP %s: %s", resp.status, text)
         except (TimeoutError, aiohttp.ClientError) as err:
+            self.metrics.inc("request_errors")
             _LOGGER.warning("[EVConduitClient] Charging sessions request failed (network error): %s", err)
         except asyncio.CancelledError:
             raise
@@ -294,25 +398,28 @@ class EVConduitClient:
             "Content-Type": "application/json",
         }
         payload = {"odometer_km": odometer_km}
-        _LOGGER.debug(f"[EVConduitClient] POST odometer update: {url} payload={payload}")
+        _LOGGER.debug("[EVConduitClient] POST odometer update: %s payload=%s", url, payload)
+        start = time.perf_counter()
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.post(url, json=payload, headers=headers, timeout=15) as resp:
+                    self._record("odometer", start, resp.status)
                     if resp.status == 200:
                         data = await resp.json()
-                        _LOGGER.info(f"[EVConduitClient] Odometer updated successfully: {data}")
+                        _LOGGER.info("[EVConduitClient] Odometer updated successfully: %s", data)
                         return data
                     elif resp.status == 404:
                         text = await resp.text()
-                        _LOGGER.warning(f"[EVConduitClient] No charging session found to update: {text}")
+                        _LOGGER.warning("[EVConduitClient] No charging session found to update: %s", text)
                         return None
                     else:
                         text = await resp.text()
-                        _LOGGER.error(f"[EVConduitClient] Odometer update failed HTTP {resp.status}: {text}")
+                        _LOGGER.error("[EVConduitClient] Odometer update failed HTTP %s: %s", resp.status, text)
                         return None
         except (TimeoutError, aiohttp.ClientError) as err:
-            _LOGGER.warning(f"[EVConduitClient] Odometer update failed (network error): {err}")
+            self.metrics.inc("request_errors")
+            _LOGGER.warning("[EVConduitClient] Odometer update failed (network error): %s", err)
         except Exception as err:
-            _LOGGER.exception(f"[EVConduitClient] Exception updating odometer: {err}")
+            _LOGGER.exception("[EVConduitClient] Exception updating odometer: %s", err)
         return None
 
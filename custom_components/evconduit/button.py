@@ -0,0 +1,71 @@
+# custom_components/evconduit/button.py
+
+import logging
+
+from homeassistant.components.button import ButtonEntity
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity import DeviceInfo
+
+from .const import DOMAIN, ICONS
+from .sensor import _build_device_info
+
+_LOGGER = logging.getLogger(__name__)
+
+# Button key -> (name, charging action)
+CHARGING_BUTTONS = {
+    "start_charging": ("Start Charging", "START"),
+    "stop_charging": ("Stop Charging", "STOP"),
+}
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up the EVConduit start/stop charging buttons."""
+    vehicle_coordinator = hass.data[DOMAIN].get(f"{entry.entry_id}_vehicle")
+    commands = hass.data[DOMAIN].get(f"{entry.entry_id}_commands")
+
+    if vehicle_coordinator is None or commands is None:
+        _LOGGER.error("Vehicle coordinator not found for charging buttons")
+        return
+
+    async_add_entities(
+        EVConduitChargingButton(vehicle_coordinator, entry, commands, key, name, action)
+        for key, (name, action) in CHARGING_BUTTONS.items()
+    )
+
+
+class EVConduitChargingButton(ButtonEntity):
+    """Send one charging command through the entry's command pipeline.
+
+    Buttons have no state, so they do not listen to the coordinator; the
+    charging switch and sensors show the (optimistic) result.
+    """
+
+    _attr_should_poll = False
+
+    def __init__(self, coordinator, entry, commands, key, name, action):
+        self._coordinator = coordinator
+        self._entry = entry
+        self._commands = commands
+        self._key = key
+        self._name = name
+        self._action = action
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return _build_device_info(self._entry, self._coordinator.data)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def icon(self):
+        return ICONS.get(self._key)
+
+    @property
+    def unique_id(self):
+        return f"{DOMAIN}-{self._entry.entry_id}-{self._key}"
+
+    async def async_press(self) -> None:
+        if not await self._commands.async_send(self._action):
+            raise HomeAssistantError(f"Charging {self._action} was not accepted by EVConduit")
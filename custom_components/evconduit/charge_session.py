@@ -0,0 +1,243 @@
+# custom_components/evconduit/charge_session.py
+
+"""Charge session state machine driven by vehicle updates."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    DOMAIN, SIGNAL_CHARGE_SESSION, PENDING_COMMAND_KEY,
+    CHARGE_SESSION_HYSTERESIS, CHARGE_SESSION_FINALIZE_DELAYS,
+)
+from .features import Feature
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_UNPLUGGED = "unplugged"
+STATE_PLUGGED = "plugged"
+STATE_CHARGING = "charging"
+STATE_FINISHED = "finished"
+
+# Emitted once the backend has a finalized session for the charge that just ended
+EVENT_FINALIZED = "finalized"
+# Emitted instead when the finalized session never showed up
+EVENT_FINALIZE_FAILED = "finalize_failed"
+
+# Allowed clock skew between HA and the backend when matching sessions
+_MATCH_MARGIN = timedelta(minutes=15)
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+
+
+class ChargeSessionTracker:
+    """Track plugged/charging/finished transitions for one vehicle.
+
+    A new state is only committed after it has been observed for
+    ``hysteresis`` seconds, so flapping ``isCharging`` values do not produce
+    spurious sessions. Each committed transition is sent once on the
+    ``SIGNAL_CHARGE_SESSION`` dispatcher signal as ``(event, details)``.
+
+    When a charge finishes the tracker polls the backend until the finalized
+    session shows up and then emits ``EVENT_FINALIZED`` with it, or
+    ``EVENT_FINALIZE_FAILED`` if it never appeared. Each charge is finalized
+    at most once, however many finalize requests (hysteresis commit, webhook)
+    it gets. A newer transition cancels the poll.
+    """
+
+    def __init__(self, hass, entry_id: str, client, hysteresis: float = CHARGE_SESSION_HYSTERESIS):
+        self.hass = hass
+        self._client = client
+        self._signal = SIGNAL_CHARGE_SESSION.format(entry_id)
+        self._hysteresis = hysteresis
+        self.state: str | None = None
+        self.started_at: datetime | None = None
+        self.ended_at: datetime | None = None
+        self._pending_state: str | None = None
+        self._unsub_pending = None
+        self._finalize_task: asyncio.Task | None = None
+        # Set once the current charge is finalized; cleared by the next plug-in or charge
+        self._finalized = False
+        self._finalized_id: str | None = None
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel pending transitions and finalization polls."""
+        self._cancel_pending()
+        if self._finalize_task:
+            self._finalize_task.cancel()
+            self._finalize_task = None
+
+    def _observed_state(self, vehicle_data: dict) -> str:
+        charge_state = vehicle_data.get("chargeState") or {}
+        # Ignore the optimistic isCharging of a charging command until confirmed
+        pending = vehicle_data.get(PENDING_COMMAND_KEY)
+        is_charging = pending.get("isCharging") if pending else charge_state.get("isCharging")
+        if is_charging:
+            return STATE_CHARGING
+        if charge_state.get("isPluggedIn"):
+            # Still plugged in after a charge: the session has finished
+            if self.state in (STATE_CHARGING, STATE_FINISHED):
+                return STATE_FINISHED
+            return STATE_PLUGGED
+        return STATE_UNPLUGGED
+
+    @callback
+    def async_update(self, vehicle_data: dict | None) -> None:
+        """Feed the latest vehicle data into the state machine."""
+        if not vehicle_data:
+            return
+        observed = self._observed_state(vehicle_data)
+
+        if self.state is None:
+            # First observation: adopt it without emitting a transition
+            self.state = observed
+            if observed == STATE_CHARGING:
+                self.started_at = datetime.now(timezone.utc)
+            return
+
+        if observed == self.state:
+            self._cancel_pending()
+            return
+        if observed == self._pending_state:
+            return
+
+        self._cancel_pending()
+        self._pending_state = observed
+        self._unsub_pending = async_call_later(self.hass, self._hysteresis, self._async_commit_pending)
+
+    def _cancel_pending(self) -> None:
+        if self._unsub_pending:
+            self._unsub_pending()
+        self._unsub_pending = None
+        self._pending_state = None
+
+    @callback
+    def _async_commit_pending(self, _now) -> None:
+        new_state = self._pending_state
+        self._unsub_pending = None
+        self._pending_state = None
+        if new_state is None or new_state == self.state:
+            return
+
+        previous = self.state
+        now = datetime.now(timezone.utc)
+        _LOGGER.debug("Charge session transition %s -> %s", previous, new_state)
+        if new_state in (STATE_PLUGGED, STATE_CHARGING):
+            self._finalized = False
+        if new_state == STATE_CHARGING:
+            self.started_at = now
+            self.ended_at = None
+            if self._finalize_task:
+                self._finalize_task.cancel()
+                self._finalize_task = None
+        elif previous == STATE_CHARGING:
+            self.ended_at = now
+            if new_state == STATE_UNPLUGGED:
+                # Unplugged straight from charging still ends a session
+                self._set_state(STATE_FINISHED)
+            self.async_request_finalize()
+        self._set_state(new_state)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        self._emit(state)
+
+    def _emit(self, event: str, session: dict | None = None) -> None:
+        details = {
+            "state": self.state,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "ended_at": self.ended_at.isoformat() if self.ended_at else None,
+            "session": session,
+        }
+        async_dispatcher_send(self.hass, self._signal, event, details)
+
+    @callback
+    def async_request_finalize(self, immediate: bool = False) -> None:
+        """(Re)start polling the backend for the just-finished session.
+
+        ``immediate`` skips the first delay, e.g. when the backend has already
+        announced the session through the webhook. Does nothing once the
+        current charge has been finalized.
+        """
+        if self._finalized:
+            _LOGGER.debug("Charging session already finalized, not polling again")
+            return
+        if self._finalize_task:
+            self._finalize_task.cancel()
+        self._finalize_task = self.hass.async_create_background_task(
+            self._async_poll_finalized(immediate), name="evconduit_charge_session_finalize"
+        )
+
+    async def _async_poll_finalized(self, immediate: bool = False) -> None:
+        ended = self.ended_at or datetime.now(timezone.utc)
+        started = self.started_at or ended - timedelta(days=1)
+        since = (started - _MATCH_MARGIN).isoformat()
+        session = None
+        for attempt, delay in enumerate(CHARGE_SESSION_FINALIZE_DELAYS):
+            if attempt or not immediate:
+                await asyncio.sleep(delay)
+            result = await self._client.async_get_charging_sessions(since=since, limit=10)
+            session = self._match_session((result or {}).get("sessions") or [], ended)
+            if session:
+                break
+        self._finalize_task = None
+        if session is None:
+            _LOGGER.debug("No finalized charging session found after %s polls", len(CHARGE_SESSION_FINALIZE_DELAYS))
+            self._emit(EVENT_FINALIZE_FAILED)
+            return
+        self._finalized = True
+        if session.get("session_id") is not None and session["session_id"] == self._finalized_id:
+            _LOGGER.debug("Charging session %s already finalized", self._finalized_id)
+            return
+        self._finalized_id = session.get("session_id")
+        self._emit(EVENT_FINALIZED, session)
+
+    @staticmethod
+    def _match_session(sessions: list[dict], ended: datetime) -> dict | None:
+        """Return the newest session that ended around `ended`."""
+        best = best_end = None
+        for s in sessions:
+            end = _parse_time(s.get("end_time"))
+            if end is None or end < ended - _MATCH_MARGIN:
+                continue
+            # Compare parsed times: the backend mixes offsets and precision
+            if best_end is None or end > best_end:
+                best, best_end = s, end
+        return best
+
+
+class ChargeSessionFeature(Feature):
+    """Feed plug and charge changes into the entry's ChargeSessionTracker."""
+
+    name = "charge_session"
+    watched = ("chargeState.isCharging", "chargeState.isPluggedIn", PENDING_COMMAND_KEY)
+
+    def __init__(self, hass, entry, client, coordinator, metrics):
+        super().__init__(hass, entry, client, coordinator, metrics)
+        self.tracker = ChargeSessionTracker(hass, entry.entry_id, client)
+
+    @callback
+    def async_start(self) -> None:
+        # The webhook handler asks the tracker to finalize completed sessions
+        self.hass.data[DOMAIN][f"{self.entry.entry_id}_charge_session"] = self.tracker
+        self.tracker.async_update(self.coordinator.data)
+
+    @callback
+    def async_vehicle_updated(self, data: dict, changed: set[str]) -> None:
+        self.tracker.async_update(data)
+
+    async def async_unload(self) -> None:
+        self.hass.data[DOMAIN].pop(f"{self.entry.entry_id}_charge_session", None)
+        self.tracker.async_stop()
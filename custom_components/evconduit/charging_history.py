@@ -0,0 +1,370 @@
+# custom_components/evconduit/charging_history.py
+
+"""Local charging session history synced incrementally from EVConduit."""
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .analytics import ChargingAnalytics, location_key
+from .charge_session import EVENT_FINALIZED, EVENT_FINALIZE_FAILED
+from .const import (
+    DOMAIN, CONF_VEHICLE_ID, SIGNAL_CHARGE_SESSION,
+    CHARGING_HISTORY_SYNC_INTERVAL, CHARGING_HISTORY_SAFETY_SYNC_INTERVAL,
+)
+from .features import Feature
+from .metrics import NULL_METRICS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def utc_key(value) -> str:
+    """Return a timestamp as a fixed-width UTC ISO string, so strings sort chronologically.
+
+    Accepts ISO strings with any offset (or "Z"), dates and datetimes; naive
+    values are taken as UTC. Unparseable strings are returned unchanged.
+    """
+    if not value:
+        return ""
+    parsed = dt_util.parse_datetime(value) if isinstance(value, str) else value
+    if parsed is None:
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _start_time(session: dict) -> str:
+    return session.get("start_time") or ""
+
+
+def _normalize(session: dict) -> dict:
+    """Store start_time in utc_key form (stored sessions are sorted and bisected by it)."""
+    start = session.get("start_time")
+    key = utc_key(start)
+    return session if not start or key == start else {**session, "start_time": key}
+
+
+class _BulkMerge:
+    __slots__ = ("_history", "added", "earliest")
+
+    def __init__(self, history):
+        self._history = history
+        self.added = 0
+        self.earliest: str | None = None
+
+    def __call__(self, sessions: list[dict]) -> None:
+        added, earliest = self._history._merge(sessions)
+        self.added += added
+        if earliest is not None and (self.earliest is None or earliest < self.earliest):
+            self.earliest = earliest
+
+
+class ChargingHistory:
+    """Charging sessions for one vehicle, persisted in a Store.
+
+    New sessions normally arrive through ``async_handle_charge_event`` when
+    the charge-session tracker reports a finalized session; a slow periodic
+    incremental sync is kept as a safety net. Sessions are kept oldest-first.
+    """
+
+    def __init__(self, hass, entry_id: str, client):
+        self.hass = hass
+        self._client = client
+        self.store = Store(hass, 1, f"{DOMAIN}.charging_sessions.{entry_id}")
+        self.data: dict = {"last_sync": None, "sessions": []}
+        self._ids: set[str] = set()
+        self._currencies: Counter = Counter()
+        # Session positions per location (casefolded), built on first query
+        self._location_index: dict[str, list[int]] | None = None
+        self._last_sync_time = 0.0  # monotonic timestamp of last API sync
+        self._lock = asyncio.Lock()
+        self._unsub_timer = None
+        self.metrics = NULL_METRICS
+        # Running consumption/cost aggregates, and optional ChargingStatistics,
+        # both fed with every merge
+        self.analytics = ChargingAnalytics(self)
+        self.statistics = None
+
+        async def _ch_update():
+            return self.data
+
+        self.coordinator = DataUpdateCoordinator(
+            hass, _LOGGER,
+            name=f"{DOMAIN} charging history",
+            update_method=_ch_update,
+            update_interval=None,  # Manual updates only
+        )
+
+    @property
+    def sessions(self) -> list[dict]:
+        return self.data["sessions"]
+
+    @property
+    def summary(self) -> dict:
+        """Return store and index statistics without scanning the sessions."""
+        sessions = self.sessions
+        return {
+            "sessions": len(sessions),
+            "indexed_ids": len(self._ids),
+            "oldest_start": sessions[0].get("start_time") if sessions else None,
+            "newest_start": sessions[-1].get("start_time") if sessions else None,
+            "currencies": dict(self._currencies),
+            "last_sync": self.data.get("last_sync"),
+        }
+
+    def query(
+        self, start: str | None = None, end: str | None = None, location: str | None = None,
+        currency: str | None = None, min_energy: float | None = None,
+        limit: int = 50, offset: int = 0,
+    ) -> dict:
+        """Return one page of matching sessions, newest first, and the match count.
+
+        The start_time range is found by bisection (sessions are sorted) and
+        a location filter uses the location index, so only candidate
+        sessions are scanned for the currency and energy filters.
+        """
+        sessions = self.sessions
+        start, end = utc_key(start), utc_key(end)
+        lo = bisect_left(sessions, start, key=_start_time) if start else 0
+        hi = bisect_left(sessions, end, key=_start_time) if end else len(sessions)
+        if location is not None:
+            positions = self._location_positions(location)
+            window = positions[bisect_left(positions, lo):bisect_left(positions, hi)]
+            candidates = (sessions[i] for i in reversed(window))
+        else:
+            candidates = (sessions[i] for i in range(hi - 1, lo - 1, -1))
+
+        total = 0
+        page = []
+        for s in candidates:
+            if currency and s.get("currency") != currency:
+                continue
+            if min_energy is not None and (s.get("energy_added_kwh") or 0) < min_energy:
+                continue
+            if offset <= total < offset + limit:
+                page.append(s)
+            total += 1
+        return {"total": total, "offset": offset, "sessions": page}
+
+    def _location_positions(self, location: str) -> list[int]:
+        if self._location_index is None:
+            index: dict[str, list[int]] = {}
+            for i, s in enumerate(self.sessions):
+                index.setdefault(location_key(s).casefold(), []).append(i)
+            self._location_index = index
+        return self._location_index.get(location.casefold(), [])
+
+    async def async_load(self) -> None:
+        """Load stored sessions and prime the sensor coordinator."""
+        self.data = await self.store.async_load() or {"last_sync": None, "sessions": []}
+        # Safety: if last_sync is set but no sessions, reset to force full sync
+        if self.data.get("last_sync") and not self.data.get("sessions"):
+            _LOGGER.debug("Charging history store has last_sync but no sessions, resetting for full sync")
+            self.data["last_sync"] = None
+        # Stores written before start times were normalized may mix offsets
+        sessions = self.data.setdefault("sessions", [])
+        normalized = [_normalize(s) for s in sessions]
+        if any(a is not b for a, b in zip(normalized, sessions)):
+            normalized.sort(key=_start_time)
+            self.data["sessions"] = normalized
+        self._ids = {s["session_id"] for s in self.sessions}
+        self._currencies = Counter(s.get("currency") for s in self.sessions if s.get("currency"))
+        self._location_index = None
+        self.analytics.async_update()
+        # Do a first refresh so CoordinatorEntity considers the data valid
+        await self.coordinator.async_config_entry_first_refresh()
+
+    @callback
+    def async_start(self) -> None:
+        """Start the safety-net sync timer and run an initial sync."""
+        self._unsub_timer = async_track_time_interval(
+            self.hass, self._async_safety_sync,
+            timedelta(seconds=CHARGING_HISTORY_SAFETY_SYNC_INTERVAL),
+        )
+        self.hass.async_create_task(self.async_sync(force=True))
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    async def _async_safety_sync(self, _now) -> None:
+        await self.async_sync()
+
+    @callback
+    def async_handle_charge_event(self, event: str, details: dict) -> None:
+        """Merge the finalized session reported by the charge-session tracker."""
+        if event == EVENT_FINALIZED:
+            self.hass.async_create_task(self.async_add_sessions([details["session"]]))
+        elif event == EVENT_FINALIZE_FAILED:
+            # The tracker could not find the session; fall back to a full incremental sync
+            self.hass.async_create_task(self.async_sync(force=True))
+
+    async def async_add_sessions(self, sessions: list[dict]) -> int:
+        """Merge sessions into the store. Returns the number of new sessions."""
+        async with self._lock:
+            start = time.perf_counter()
+            added, earliest = self._merge(sessions)
+            self.metrics.observe("history.merge", (time.perf_counter() - start) * 1000)
+            if added:
+                await self._async_commit(earliest)
+            return added
+
+    @asynccontextmanager
+    async def async_bulk_merge(self):
+        """Merge many chunks of sessions under one lock and a single commit.
+
+        Yields a callable that merges one chunk; its ``added`` attribute
+        counts the new sessions. The store is saved (and analytics and
+        statistics updated) once on exit, also if merging was interrupted.
+        """
+        async with self._lock:
+            bulk = _BulkMerge(self)
+            try:
+                yield bulk
+            finally:
+                if bulk.added:
+                    await self._async_commit(bulk.earliest)
+
+    def _merge(self, sessions: list[dict]) -> tuple[int, str | None]:
+        """Merge sessions; returns the number added and the earliest added start_time."""
+        stored = self.sessions
+        added = 0
+        earliest = None
+        needs_sort = False
+        latest_created = self.data.get("last_sync") or ""
+        for s in sessions:
+            if s["session_id"] in self._ids:
+                continue
+            s = _normalize(s)
+            if stored and (s.get("start_time") or "") < (stored[-1].get("start_time") or ""):
+                needs_sort = True
+            stored.append(s)
+            self._ids.add(s["session_id"])
+            if s.get("currency"):
+                self._currencies[s["currency"]] += 1
+            added += 1
+            if earliest is None or (s.get("start_time") or "") < earliest:
+                earliest = s.get("start_time") or ""
+            # Advance last_sync to the latest session's created_at timestamp
+            # (not datetime.now(), because sessions are created when charging
+            # ends and their start_time can be hours before created_at)
+            latest_created = max(latest_created, s.get("created_at", s.get("start_time", "")) or "")
+        if needs_sort:
+            stored.sort(key=_start_time)
+        if added:
+            self._location_index = None
+        if stored:
+            self.data["last_sync"] = latest_created or datetime.now(timezone.utc).isoformat()
+        else:
+            self.data["last_sync"] = None
+        return added, earliest
+
+    async def _async_commit(self, earliest: str | None) -> None:
+        """Persist the store, update the analytics, notify the sensors and import the new statistics."""
+        await self.store.async_save(self.data)
+        self.analytics.async_update(earliest)
+        self.coordinator.async_set_updated_data(self.data)
+        if self.statistics:
+            self.statistics.async_import(earliest)
+
+    async def async_sync(self, force: bool = False) -> None:
+        """Incremental sync of charging sessions from backend."""
+        now_mono = time.monotonic()
+        if not force and (now_mono - self._last_sync_time) < CHARGING_HISTORY_SYNC_INTERVAL:
+            _LOGGER.debug("Charging history sync throttled, skipping")
+            return
+
+        async with self._lock:
+            start = time.perf_counter()
+            pages = 0
+            try:
+                # Paginate through all new sessions
+                since = self.data.get("last_sync")
+                all_new = []
+                while True:
+                    result = await self._client.async_get_charging_sessions(since=since, limit=50)
+                    pages += 1
+                    if not result or not result.get("sessions"):
+                        break
+                    batch = result["sessions"]
+                    all_new.extend(batch)
+                    if not result.get("has_more"):
+                        break
+                    # Use the last session's start_time as the next `since`
+                    since = batch[-1]["start_time"]
+
+                added, earliest = self._merge(all_new)
+                self._last_sync_time = now_mono
+                if added:
+                    await self._async_commit(earliest)
+                else:
+                    self.coordinator.async_set_updated_data(self.data)
+                _LOGGER.debug(
+                    "Charging history sync complete: %d new, %d total sessions",
+                    added, len(self.sessions),
+                )
+            except Exception as exc:
+                self.metrics.inc("history_sync_failed")
+                _LOGGER.warning("Charging history sync failed: %s", exc, exc_info=True)
+            finally:
+                self.metrics.observe("history.sync", (time.perf_counter() - start) * 1000)
+                self.metrics.observe("history.pages", pages)
+
+
+class ChargingHistoryFeature(Feature):
+    """Load, sync and expose the entry's charging history."""
+
+    name = "charging_history"
+
+    def __init__(self, hass, entry, client, coordinator, metrics):
+        super().__init__(hass, entry, client, coordinator, metrics)
+        self.history = ChargingHistory(hass, entry.entry_id, client)
+        self.history.metrics = metrics
+        self._unsub = None
+        if "recorder" in hass.config.components:
+            from .statistics import ChargingStatistics
+            self.history.statistics = ChargingStatistics(
+                hass, self.history, entry.data[CONF_VEHICLE_ID], entry.title
+            )
+
+    async def async_setup(self) -> None:
+        await self.history.async_load()
+        entry_id = self.entry.entry_id
+        self.hass.data[DOMAIN][f"{entry_id}_ch_store"] = self.history
+        self.hass.data[DOMAIN][f"{entry_id}_ch_coordinator"] = self.history.coordinator
+        # Store the sync function for the service
+        self.hass.data[DOMAIN][f"{entry_id}_ch_sync"] = self.history.async_sync
+
+    @callback
+    def async_start(self) -> None:
+        _LOGGER.info("Charging history sync enabled for entry %s", self.entry.entry_id)
+        # Fetch finalized sessions as soon as a charge ends
+        self._unsub = async_dispatcher_connect(
+            self.hass, SIGNAL_CHARGE_SESSION.format(self.entry.entry_id),
+            self.history.async_handle_charge_event,
+        )
+        self.history.async_start()
+        if self.history.statistics:
+            self.hass.async_create_task(self.history.statistics.async_start())
+
+    async def async_unload(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        self.history.async_stop()
+        for key in ("ch_store", "ch_coordinator", "ch_sync"):
+            self.hass.data[DOMAIN].pop(f"{self.entry.entry_id}_{key}", None)
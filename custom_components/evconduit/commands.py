@@ -0,0 +1,239 @@
+# custom_components/evconduit/commands.py
+
+"""Charging commands with optimistic state, confirmation polling and rollback."""
+
+import asyncio
+import logging
+import time
+
+from homeassistant.core import callback
+
+from .const import (
+    PENDING_COMMAND_KEY, COMMAND_CONFIRM_POLL_DELAYS, COMMAND_DEDUP_WINDOW,
+)
+from .metrics import NULL_METRICS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Command:
+    __slots__ = ("action", "target", "started", "accepted", "confirmed", "task")
+
+    def __init__(self, action: str):
+        self.action = action
+        self.target = action == "START"
+        self.started = time.monotonic()
+        # Resolved with the backend's answer only (never by supersession or
+        # confirmation); awaited by duplicate commands
+        self.accepted: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.confirmed = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+
+class ChargingCommandPipeline:
+    """Send START/STOP charging commands for one vehicle and track their outcome.
+
+    While a command is pending, every vehicle update (poll or webhook) passes
+    through ``apply``, which shows the commanded ``chargeState.isCharging``
+    and keeps the vehicle's own value under PENDING_COMMAND_KEY, so features
+    that must not act on optimistic state (the charge-session tracker, ABRP
+    and the trip log) can still read it. The command is confirmed as soon as the vehicle reports
+    the commanded state; until then the vehicle is polled after each of
+    COMMAND_CONFIRM_POLL_DELAYS, and the optimistic state is rolled back if
+    it never does.
+
+    A command for the state already pending, or confirmed less than
+    COMMAND_DEDUP_WINDOW seconds ago, is not sent again; an opposite command
+    supersedes the pending one.
+    """
+
+    def __init__(self, hass, client, metrics=NULL_METRICS):
+        self.hass = hass
+        self._client = client
+        self.metrics = metrics
+        self.coordinator = None
+        self._pending: _Command | None = None
+        # (target, monotonic time) of the last confirmed command
+        self._last_confirmed: tuple[bool, float] | None = None
+
+        # Outcome counters
+        self.sent = 0
+        self.confirmed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.superseded = 0
+        self.deduplicated = 0
+        self.last_latency: float | None = None
+        self.total_latency = 0.0
+
+    @property
+    def pending_action(self) -> str | None:
+        return self._pending.action if self._pending else None
+
+    @property
+    def stats(self) -> dict:
+        """Return a snapshot of the command outcomes."""
+        finished = self.confirmed + self.failed + self.timed_out
+        return {
+            "sent": self.sent,
+            "confirmed": self.confirmed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "superseded": self.superseded,
+            "deduplicated": self.deduplicated,
+            "pending": self.pending_action,
+            "success_rate": round(self.confirmed / finished * 100, 1) if finished else None,
+            "last_latency": self.last_latency,
+            "avg_latency": round(self.total_latency / self.confirmed, 1) if self.confirmed else None,
+        }
+
+    async def async_fetch_vehicle_status(self) -> dict:
+        """Vehicle coordinator update method: the polled status with any pending command applied."""
+        return self.apply(await self._client.async_get_vehicle_status())
+
+    @staticmethod
+    def strip(data: dict | None) -> dict | None:
+        """Return the vehicle data without optimistic state."""
+        if not data or PENDING_COMMAND_KEY not in data:
+            return data
+        data = dict(data)
+        pending = data.pop(PENDING_COMMAND_KEY)
+        charge_state = dict(data.get("chargeState") or {})
+        if "isCharging" in pending:
+            charge_state["isCharging"] = pending["isCharging"]
+        else:
+            # The vehicle never reported it
+            charge_state.pop("isCharging", None)
+        data["chargeState"] = charge_state
+        return data
+
+    @callback
+    def apply(self, data: dict | None, fresh: bool = True) -> dict | None:
+        """Confirm the pending command against fresh vehicle data, or overlay it.
+
+        Data that was already known when the command was sent (``fresh`` is
+        False) only gets the overlay; it cannot confirm anything.
+        """
+        data = self.strip(data)
+        command = self._pending
+        if not data or command is None:
+            return data
+        charge_state = data.get("chargeState") or {}
+        is_charging = charge_state.get("isCharging")
+        if fresh and bool(is_charging) == command.target:
+            self._confirm(command)
+            return data
+        pending = {"action": command.action}
+        if "isCharging" in charge_state:
+            pending["isCharging"] = is_charging
+        return {
+            **data,
+            "chargeState": dict(charge_state, isCharging=command.target),
+            PENDING_COMMAND_KEY: pending,
+        }
+
+    async def async_send(self, action: str) -> bool:
+        """Send a charging command; returns True if the backend accepted it.
+
+        Confirmation by the vehicle continues in the background.
+        """
+        action = action.upper()
+        target = action == "START"
+        pending = self._pending
+        if pending is not None and pending.target == target:
+            self.deduplicated += 1
+            self.metrics.inc("command_deduplicated")
+            _LOGGER.debug("Charging %s already pending, not sent again", action)
+            return await asyncio.shield(pending.accepted)
+        if pending is None and self._last_confirmed is not None:
+            last_target, confirmed_at = self._last_confirmed
+            if last_target == target and time.monotonic() - confirmed_at < COMMAND_DEDUP_WINDOW:
+                self.deduplicated += 1
+                self.metrics.inc("command_deduplicated")
+                _LOGGER.debug("Charging %s confirmed moments ago, not sent again", action)
+                return True
+        if pending is not None:
+            self.superseded += 1
+            self.metrics.inc("command_superseded")
+            self._end(pending)
+
+        command = self._pending = _Command(action)
+        self.sent += 1
+        self.metrics.inc("command_sent")
+        self._publish()
+        result = None
+        try:
+            result = await self._client.async_set_charging(action)
+        except Exception:
+            _LOGGER.exception("Error sending charging %s", action)
+        finally:
+            # Also resolved if the request is cancelled, so waiters never hang
+            command.accepted.set_result(bool(result))
+        accepted = bool(result)
+
+        if self._pending is not command:
+            # Superseded (or confirmed by a webhook) while the request was in flight
+            return accepted
+        if not accepted:
+            self.failed += 1
+            self.metrics.inc("command_failed")
+            self._end(command)
+            self._publish()
+            return False
+        command.task = self.hass.async_create_background_task(
+            self._async_confirm(command), name=f"evconduit_charging_{action.lower()}"
+        )
+        return True
+
+    async def _async_confirm(self, command: _Command) -> None:
+        for delay in COMMAND_CONFIRM_POLL_DELAYS:
+            try:
+                await asyncio.wait_for(command.confirmed.wait(), delay)
+                return
+            except TimeoutError:
+                pass
+            if self._pending is not command:
+                return
+            await self.coordinator.async_request_refresh()
+            if command.confirmed.is_set() or self._pending is not command:
+                return
+
+        self.timed_out += 1
+        self.metrics.inc("command_timeout")
+        _LOGGER.warning(
+            "Charging %s not confirmed by the vehicle after %d s, reverting",
+            command.action, sum(COMMAND_CONFIRM_POLL_DELAYS),
+        )
+        self._end(command)
+        self._publish()
+
+    def _confirm(self, command: _Command) -> None:
+        latency = (time.monotonic() - command.started) * 1000
+        self.confirmed += 1
+        self.last_latency = round(latency)
+        self.total_latency += latency
+        self.metrics.inc("command_confirmed")
+        self.metrics.observe("command.confirm", latency)
+        self._last_confirmed = (command.target, time.monotonic())
+        _LOGGER.info("Charging %s confirmed by the vehicle after %.1f s", command.action, latency / 1000)
+        command.confirmed.set()
+        self._pending = None
+
+    def _end(self, command: _Command) -> None:
+        """Drop a command without confirmation; the caller republishes the state."""
+        if command.task and command.task is not asyncio.current_task():
+            command.task.cancel()
+        if self._pending is command:
+            self._pending = None
+
+    @callback
+    def _publish(self) -> None:
+        """Push the vehicle data with the current optimistic state to the listeners."""
+        if self.coordinator is None or not self.coordinator.data:
+            return
+        self.coordinator.async_set_updated_data(self.apply(self.coordinator.data, fresh=False))
+
+    @callback
+    def async_stop(self) -> None:
+        if self._pending is not None:
+            self._end(self._pending)
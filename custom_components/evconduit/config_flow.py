@@ -6,10 +6,14 @@ from .const import (
     DOMAIN, CONF_API_KEY, CONF_VEHICLE_ID, CONF_UPDATE_INTERVAL,
     CONF_ENVIRONMENT, CONF_ABRP_TOKEN, CONF_ODOMETER_ENTITY,
     CONF_ELECTRICITY_RATE_ENTITY, CONF_ELECTRICITY_RATE_CURRENCY,
-    CONF_CHARGING_HISTORY, ENVIRONMENTS,
+    CONF_ELECTRICITY_RATE_TOLERANCE, CONF_ELECTRICITY_RATE_FORECAST,
+    CONF_CHARGING_HISTORY, CONF_PERFORMANCE_METRICS, ENVIRONMENTS,
+    CONF_TRACKER_MIN_DISTANCE, CONF_TRACKER_HEARTBEAT, CONF_TRIP_LOG,
+    DEFAULT_TRACKER_MIN_DISTANCE, DEFAULT_TRACKER_HEARTBEAT,
 )
 
 from .api import EVConduitClient
+from .log import redact
 
 DEFAULT_UPDATE_INTERVAL = 6
 _LOGGER = logging.getLogger(__name__)
@@ -48,7 +52,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             api_key = user_input[CONF_API_KEY]
             environment = user_input[CONF_ENVIRONMENT]
             base_url = ENVIRONMENTS[environment]
-            _LOGGER.debug(f"[ConfigFlow] User entered API key: {api_key}, environment: {environment}")
+            _LOGGER.debug("[ConfigFlow] User entered API key: %s, environment: %s", redact(api_key), environment)
 
             try:
                 client = EVConduitClient(self.hass, api_key, base_url, "dummy")
@@ -64,7 +68,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     self.context["abrp_token"] = user_input.get(CONF_ABRP_TOKEN, "")
                     return await self.async_step_vehicle()
             except Exception as e:
-                _LOGGER.exception(f"[ConfigFlow] Exception during API key validation: {e}")
+                _LOGGER.exception("[ConfigFlow] Exception during API key validation: %s", e)
                 errors["base"] = "cannot_connect"
 
         return self.async_show_form(
@@ -89,7 +93,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         for v in vehicles:
             id = v.get("id")  # CORRECT
             if not id:
-                _LOGGER.warning(f"[ConfigFlow] Vehicle without ID found: {v}")
+                _LOGGER.warning("[ConfigFlow] Vehicle without ID found: %s", v)
                 continue
 
 # Build name from information
@@ -114,7 +118,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         }
         choices = {vid: name for vid, name in choices.items() if vid not in configured_ids}
 
-        _LOGGER.debug(f"[ConfigFlow] Available vehicles (excluding configured): {choices}")
+        _LOGGER.debug("[ConfigFlow] Available vehicles (excluding configured): %s", choices)
 
         if not choices:
             errors["base"] = "no_vehicles"
@@ -204,9 +208,33 @@ class EVConduitOptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_ELECTRICITY_RATE_CURRENCY, ""
                     ) or self.hass.config.currency or "",
                 ): str,
+                vol.Optional(
+                    CONF_ELECTRICITY_RATE_TOLERANCE,
+                    default=self.config_entry.options.get(CONF_ELECTRICITY_RATE_TOLERANCE, 0.0),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_ELECTRICITY_RATE_FORECAST,
+                    default=self.config_entry.options.get(CONF_ELECTRICITY_RATE_FORECAST, False),
+                ): bool,
                 vol.Optional(
                     CONF_CHARGING_HISTORY,
                     default=self.config_entry.options.get(CONF_CHARGING_HISTORY, False),
                 ): bool,
+                vol.Optional(
+                    CONF_TRIP_LOG,
+                    default=self.config_entry.options.get(CONF_TRIP_LOG, False),
+                ): bool,
+                vol.Optional(
+                    CONF_TRACKER_MIN_DISTANCE,
+                    default=self.config_entry.options.get(CONF_TRACKER_MIN_DISTANCE, DEFAULT_TRACKER_MIN_DISTANCE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10000)),
+                vol.Optional(
+                    CONF_TRACKER_HEARTBEAT,
+                    default=self.config_entry.options.get(CONF_TRACKER_HEARTBEAT, DEFAULT_TRACKER_HEARTBEAT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                vol.Optional(
+                    CONF_PERFORMANCE_METRICS,
+                    default=self.config_entry.options.get(CONF_PERFORMANCE_METRICS, False),
+                ): bool,
             }),
         )
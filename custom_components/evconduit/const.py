@@ -9,14 +9,100 @@ CONF_ABRP_TOKEN = "abrp_token"
 CONF_ODOMETER_ENTITY = "odometer_entity"
 CONF_ELECTRICITY_RATE_ENTITY = "electricity_rate_entity"
 CONF_ELECTRICITY_RATE_CURRENCY = "electricity_rate_currency"
+CONF_ELECTRICITY_RATE_TOLERANCE = "electricity_rate_tolerance"
+CONF_ELECTRICITY_RATE_FORECAST = "electricity_rate_forecast"
 CONF_CHARGING_HISTORY = "charging_history"
+CONF_PERFORMANCE_METRICS = "performance_metrics"
+CONF_TRACKER_MIN_DISTANCE = "tracker_min_distance"
+CONF_TRACKER_HEARTBEAT = "tracker_heartbeat"
+CONF_TRIP_LOG = "trip_log"
 DEFAULT_UPDATE_INTERVAL = 4
 
+# Device tracker: metres the vehicle must move before a new position is published
+DEFAULT_TRACKER_MIN_DISTANCE = 50
+# Device tracker: minutes after which an unchanged position is published anyway
+DEFAULT_TRACKER_HEARTBEAT = 30
+
 # Minimum seconds between charging history syncs (15 minutes)
 CHARGING_HISTORY_SYNC_INTERVAL = 900
 
+# Seconds between safety-net charging history syncs (6 hours); charge-end
+# events normally fetch new sessions as soon as they are finalized
+CHARGING_HISTORY_SAFETY_SYNC_INTERVAL = 21600
+
+# Sessions per chunk when exporting or importing the charging history
+EXPORT_CHUNK_SIZE = 1000
+
+# Trip log: seconds without movement after which a trip is finished
+TRIP_END_IDLE = 600
+# Trip log: metres between two positions that count as driving
+TRIP_MOVE_THRESHOLD = 200
+# Trip log: trips shorter than this (km) are dropped as GPS noise
+TRIP_MIN_DISTANCE = 0.5
+# Trip log: maximum number of finished trips kept in the store
+TRIPS_MAX_STORED = 2000
+# Trip log: seconds to coalesce saves of the trip in progress while driving
+TRIP_SAVE_DELAY = 60
+
+# Charging commands: seconds between confirmation polls; the optimistic
+# state is rolled back if the vehicle has not followed after the last one
+COMMAND_CONFIRM_POLL_DELAYS = (10, 15, 20, 30, 45, 60)
+# Charging commands: seconds after a confirmation in which a repeat is ignored
+COMMAND_DEDUP_WINDOW = 30
+# Vehicle data key holding the pending command and the vehicle's own isCharging
+PENDING_COMMAND_KEY = "pendingCommand"
+
+# Webhook payload "event" value sent when the backend finalizes a session
+WEBHOOK_EVENT_SESSION_COMPLETED = "charging_session_completed"
+
+# Charge session tracking: seconds a new charging state must persist before it is committed
+CHARGE_SESSION_HYSTERESIS = 60
+# Charge session tracking: delays (seconds) between polls for the finalized backend session
+CHARGE_SESSION_FINALIZE_DELAYS = (15, 30, 60, 120, 300)
+
+# Dispatcher signal for charge session events, formatted with the entry_id
+SIGNAL_CHARGE_SESSION = f"{DOMAIN}_charge_session_{{}}"
+
+# Electricity rate push: coalesce bursts of state changes (seconds)
+RATE_PUSH_DEBOUNCE = 30
+# Electricity rate push: periodic safety-net push interval (minutes)
+RATE_PUSH_INTERVAL = 5
+# Electricity rate push: retry backoff after a failed push (seconds)
+RATE_PUSH_RETRY_MIN = 30
+RATE_PUSH_RETRY_MAX = 1800
+
+# Price-curve attributes exposed by common spot-price integrations
+# (Nord Pool, ENTSO-e, Energi Data Service, Tibber and generic forecasts)
+PRICE_CURVE_ATTRIBUTES = (
+    "raw_today", "raw_tomorrow",
+    "prices_today", "prices_tomorrow", "prices",
+    "today", "tomorrow", "forecast",
+)
+PRICE_CURVE_START_KEYS = ("start", "startsAt", "start_time", "time", "hour")
+PRICE_CURVE_END_KEYS = ("end", "endsAt", "end_time")
+PRICE_CURVE_VALUE_KEYS = ("value", "price", "total", "cost_per_kwh")
+
 ABRP_API_URL = "https://api.iternio.com/1/tlm/send"
 
+# Per-request timeout for ABRP telemetry posts (seconds)
+ABRP_REQUEST_TIMEOUT = 10
+
+# Pending ABRP payloads kept while a send is in flight; oldest is dropped when full
+ABRP_QUEUE_SIZE = 3
+# Seconds after which unchanged telemetry is re-sent, so ABRP does not mark
+# a parked vehicle offline
+ABRP_HEARTBEAT_INTERVAL = 240
+
+# Seconds to coalesce writes of the persisted last-known vehicle state
+VEHICLE_STATE_SAVE_DELAY = 60
+
+# Delays (seconds) between retries of the backend webhook registration
+WEBHOOK_REGISTER_RETRY_DELAYS = (30, 120, 600, 1800)
+
+# Recent webhook payloads and API requests kept in memory for diagnostics
+DIAGNOSTICS_WEBHOOK_PAYLOADS = 10
+DIAGNOSTICS_REQUESTS = 20
+
 WEBHOOK_ID = f"{DOMAIN}_push_webhook"
 
 ENVIRONMENTS = {
@@ -26,6 +112,9 @@ ENVIRONMENTS = {
 # "sandbox2": "http://161.97.70.223:8000"
 
 ICONS = {
+    "charging_switch": "mdi:ev-station",
+    "start_charging": "mdi:play-circle-outline",
+    "stop_charging": "mdi:stop-circle-outline",
     "tier": "mdi:star",
     "email": "mdi:email",
     "name": "mdi:account",
@@ -82,6 +171,94 @@ ICONS = {
     "monthly_charge_energy": "mdi:lightning-bolt",
     "monthly_charge_cost": "mdi:currency-usd",
     "monthly_charge_count": "mdi:counter",
+    "charging_consumption": "mdi:car-electric",
+    "charging_cost_per_km": "mdi:cash",
+    "charging_loss": "mdi:transmission-tower-off",
+    # Trip log sensors
+    "last_trip_distance": "mdi:map-marker-distance",
+    "last_trip_energy": "mdi:lightning-bolt",
+    "last_trip_efficiency": "mdi:leaf",
+    "last_trip_average_speed": "mdi:speedometer",
+    "last_trip_duration": "mdi:timer-outline",
+    "last_trip_end": "mdi:flag-checkered",
+    # Performance diagnostics sensors
+    "request_latency": "mdi:timer-outline",
+    "rate_limited": "mdi:speedometer-slow",
+    "webhook_rate": "mdi:webhook",
+    "entity_writes_per_update": "mdi:database-edit",
+    "abrp_latency": "mdi:timer-outline",
+    "history_sync_duration": "mdi:timer-sync-outline",
+    "command_latency": "mdi:ev-plug-type2",
+}
+
+# Sensor metadata keyed like ICONS: (device_class, state_class, suggested_display_precision).
+# Only fields with a state_class are compiled into long-term statistics.
+SENSOR_CLASSES = {
+    "sms_credits": (None, "measurement", 0),
+    "lastSeen": ("timestamp", None, None),
+    "chargeState.batteryLevel": ("battery", "measurement", 0),
+    "chargeState.batteryCapacity": ("energy_storage", "measurement", 1),
+    "chargeState.chargeLimit": (None, None, 0),
+    "chargeState.chargeRate": ("power", "measurement", 1),
+    "chargeState.chargeTimeRemaining": ("duration", "measurement", 0),
+    "chargeState.range": ("distance", "measurement", 0),
+    "location.latitude": (None, None, 5),
+    "location.longitude": (None, None, 5),
+    "odometer.distance": ("distance", "total_increasing", 0),
+    "smartChargingPolicy.minimumChargeLimit": (None, None, 0),
+    "abrp_extra.soh": (None, "measurement", 1),
+    "abrp_extra.voltage": ("voltage", "measurement", 0),
+    "abrp_extra.current": ("current", "measurement", 1),
+    "abrp_extra.batt_temp": ("temperature", "measurement", 1),
+    "abrp_extra.ext_temp": ("temperature", "measurement", 1),
+    "abrp_extra.cabin_temp": ("temperature", "measurement", 1),
+    "abrp_extra.hvac_power": ("power", "measurement", 1),
+    "abrp_extra.speed": ("speed", "measurement", 0),
+    "abrp_extra.elevation": ("distance", "measurement", 0),
+    "abrp_extra.odometer": ("distance", "total_increasing", 0),
+    "abrp_extra.tire_pressure_fl": ("pressure", "measurement", 2),
+    "abrp_extra.tire_pressure_fr": ("pressure", "measurement", 2),
+    "abrp_extra.tire_pressure_rl": ("pressure", "measurement", 2),
+    "abrp_extra.tire_pressure_rr": ("pressure", "measurement", 2),
+    "last_charge_energy": ("energy", None, 2),
+    "last_charge_cost": (None, None, 2),
+    "last_charge_date": ("timestamp", None, None),
+    "last_charge_duration": ("duration", None, 0),
+    "monthly_charge_energy": ("energy", None, 1),
+    "monthly_charge_cost": (None, None, 2),
+    "monthly_charge_count": (None, None, 0),
+    "charging_consumption": (None, "measurement", 1),
+    "charging_cost_per_km": (None, "measurement", 2),
+    "charging_loss": (None, "measurement", 1),
+    "last_trip_distance": ("distance", None, 1),
+    "last_trip_energy": ("energy", None, 2),
+    "last_trip_efficiency": (None, None, 0),
+    "last_trip_average_speed": ("speed", None, 0),
+    "last_trip_duration": ("duration", None, 0),
+    "last_trip_end": ("timestamp", None, None),
+    "request_latency": ("duration", "measurement", 0),
+    "rate_limited": (None, "total_increasing", 0),
+    "webhook_rate": (None, "measurement", 1),
+    "entity_writes_per_update": (None, "measurement", 1),
+    "abrp_latency": ("duration", "measurement", 0),
+    "history_sync_duration": ("duration", "measurement", 0),
+    "command_latency": ("duration", "measurement", 0),
+}
+
+# Sensors listed under "Diagnostic" on the device page
+DIAGNOSTIC_FIELDS = {
+    "tier", "email", "name", "role", "webhookId",
+    "lastSeen", "isReachable", "vendor",
+    "information.displayName", "information.vin", "information.brand",
+    "information.model", "information.year",
+    "location.latitude", "location.longitude",
+}
+
+# Vehicle identity fields that (almost) never change. Their sensors do not
+# listen to every coordinator update, only to changes of their own field.
+STATIC_FIELDS = {
+    "vehicleName", "vendor", "information.displayName", "information.vin",
+    "information.brand", "information.model", "information.year",
 }
 
 USER_FIELDS = {
@@ -152,3 +329,31 @@ CHARGING_HISTORY_MONTHLY_FIELDS = {
     "monthly_charge_cost": ("Monthly Charge Cost", None),
     "monthly_charge_count": ("Monthly Charge Count", "sessions"),
 }
+
+CHARGING_ANALYTICS_FIELDS = {
+    "charging_consumption": ("Consumption", "kWh/100km"),
+    "charging_cost_per_km": ("Charging Cost per km", None),
+    "charging_loss": ("Charging Loss", "%"),
+}
+
+TRIP_FIELDS = {
+    "last_trip_distance": ("Last Trip Distance", "km"),
+    "last_trip_energy": ("Last Trip Energy", "kWh"),
+    "last_trip_efficiency": ("Last Trip Efficiency", "Wh/km"),
+    "last_trip_average_speed": ("Last Trip Average Speed", "km/h"),
+    "last_trip_duration": ("Last Trip Duration", "min"),
+    "last_trip_end": ("Last Trip End", None),
+}
+
+# Seconds between updates of the performance diagnostics sensors
+PERFORMANCE_SENSOR_INTERVAL = 300
+
+PERFORMANCE_FIELDS = {
+    "request_latency": ("API Request Latency", "ms"),
+    "rate_limited": ("API Rate Limited Responses", None),
+    "webhook_rate": ("Webhook Pushes per Hour", "pushes/h"),
+    "entity_writes_per_update": ("Entity Writes per Update", None),
+    "abrp_latency": ("ABRP Send Latency", "ms"),
+    "history_sync_duration": ("Charging History Sync Duration", "ms"),
+    "command_latency": ("Charging Command Confirmation Time", "ms"),
+}
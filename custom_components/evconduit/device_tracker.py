@@ -1,13 +1,21 @@
 # custom_components/evconduit/device_tracker.py
 
 import logging
+import time
+
+from homeassistant.components import zone
 from homeassistant.components.device_tracker import SourceType
 from homeassistant.components.device_tracker.config_entry import TrackerEntity
+from homeassistant.const import STATE_HOME, STATE_NOT_HOME
+from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util.location import distance
 
-from .const import DOMAIN
-from .sensor import _build_device_info
+from .const import (
+    DOMAIN, CONF_TRACKER_MIN_DISTANCE, CONF_TRACKER_HEARTBEAT,
+    DEFAULT_TRACKER_MIN_DISTANCE, DEFAULT_TRACKER_HEARTBEAT,
+)
+from .sensor import EVConduitCoordinatorEntity, _build_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,13 +32,74 @@ async def async_setup_entry(hass, entry, async_add_entities):
     _LOGGER.debug("EVConduit device tracker entity added")
 
 
-class EVConduitDeviceTracker(CoordinatorEntity, TrackerEntity):
-    """Device tracker for EVConduit vehicle location."""
+class EVConduitDeviceTracker(EVConduitCoordinatorEntity, TrackerEntity):
+    """Device tracker for EVConduit vehicle location.
+
+    A new position is published only when the vehicle has moved at least
+    the configured distance, or when the heartbeat interval has passed, so
+    GPS jitter does not write state (tracker states are force-updated).
+    The zone is resolved once per published position and reported as
+    location_name.
+    """
 
     def __init__(self, coordinator, entry):
         """Initialize the device tracker."""
         super().__init__(coordinator)
         self._entry = entry
+        self._min_distance = entry.options.get(CONF_TRACKER_MIN_DISTANCE, DEFAULT_TRACKER_MIN_DISTANCE)
+        self._heartbeat = entry.options.get(CONF_TRACKER_HEARTBEAT, DEFAULT_TRACKER_HEARTBEAT) * 60
+        self._position: tuple[float, float] | None = None
+        self._accuracy = 0
+        self._zone_state: str | None = None
+        self._published_at = 0.0
+        self._published_key = None
+
+    async def async_added_to_hass(self) -> None:
+        """Resolve the initial position before the first state write."""
+        self._update_position()
+        await super().async_added_to_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._update_position():
+            super()._handle_coordinator_update()
+
+    def _update_position(self) -> bool:
+        """Take the coordinator's position if it should be published; returns True if so."""
+        data = self.coordinator.data or {}
+        location = data.get("location") or {}
+        try:
+            lat = float(location["latitude"])
+            lon = float(location["longitude"])
+        except (KeyError, TypeError, ValueError):
+            lat = lon = None
+
+        # An update without a position leaves the published one unchanged
+        moved = lat is not None and (
+            self._position is None
+            or (distance(*self._position, lat, lon) or 0) >= self._min_distance
+        )
+        now = time.monotonic()
+        # Availability or name changes are always written
+        key = (self.available, self.name)
+        if not moved and key == self._published_key and now - self._published_at < self._heartbeat:
+            return False
+
+        if lat is not None:
+            self._position = (lat, lon)
+            self._accuracy = int(location.get("accuracy") or 0)
+            self._zone_state = self._resolve_zone(lat, lon)
+        self._published_at = now
+        self._published_key = key
+        return True
+
+    def _resolve_zone(self, lat: float, lon: float) -> str:
+        zone_state = zone.async_active_zone(self.hass, lat, lon, self._accuracy)
+        if zone_state is None:
+            return STATE_NOT_HOME
+        if zone_state.entity_id == zone.ENTITY_ID_HOME:
+            return STATE_HOME
+        return zone_state.name
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -53,17 +122,23 @@ class EVConduitDeviceTracker(CoordinatorEntity, TrackerEntity):
 
     @property
     def latitude(self) -> float | None:
-        """Return latitude value of the device."""
-        data = self.coordinator.data or {}
-        location = data.get("location") or {}
-        return location.get("latitude")
+        """Return the last published latitude."""
+        return self._position[0] if self._position else None
 
     @property
     def longitude(self) -> float | None:
-        """Return longitude value of the device."""
-        data = self.coordinator.data or {}
-        location = data.get("location") or {}
-        return location.get("longitude")
+        """Return the last published longitude."""
+        return self._position[1] if self._position else None
+
+    @property
+    def location_accuracy(self) -> int:
+        """Return the accuracy of the published position in metres."""
+        return self._accuracy
+
+    @property
+    def location_name(self) -> str | None:
+        """Return the zone of the published position, resolved when it was published."""
+        return self._zone_state
 
     @property
     def source_type(self) -> SourceType:
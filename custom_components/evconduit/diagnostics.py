@@ -0,0 +1,54 @@
+# custom_components/evconduit/diagnostics.py
+
+"""Diagnostics download for EVConduit config entries.
+
+Everything here is read from in-memory state that is maintained as the
+integration runs, so a download never calls the backend or scans the
+charging history.
+"""
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import DOMAIN, CONF_API_KEY, CONF_ABRP_TOKEN
+from .metrics import get_metrics
+
+TO_REDACT = {
+    CONF_API_KEY, CONF_ABRP_TOKEN, "token",
+    # Personal data in userinfo and vehicle status
+    "email", "name", "vin", "latitude", "longitude",
+    "location_lat", "location_lon", "vehicleName", "displayName",
+}
+
+
+async def async_get_config_entry_diagnostics(hass, entry) -> dict:
+    """Return diagnostics for a config entry."""
+    domain_data = hass.data.get(DOMAIN, {})
+    metrics = get_metrics(hass, entry.entry_id)
+    user_coord = domain_data.get(entry.entry_id)
+    vehicle_coord = domain_data.get(f"{entry.entry_id}_vehicle")
+    client = domain_data.get(f"{entry.entry_id}_client")
+    abrp = domain_data.get(f"{entry.entry_id}_abrp")
+    history = domain_data.get(f"{entry.entry_id}_ch_store")
+    commands = domain_data.get(f"{entry.entry_id}_commands")
+    webhook_log = domain_data.get(f"{entry.entry_id}_webhook_log") or ()
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "coordinators": {
+            "user": async_redact_data(user_coord.data or {}, TO_REDACT) if user_coord else None,
+            "vehicle": async_redact_data(vehicle_coord.data or {}, TO_REDACT) if vehicle_coord else None,
+            "last_update_success": vehicle_coord.last_update_success if vehicle_coord else None,
+        },
+        "webhook_payloads": async_redact_data(list(webhook_log), TO_REDACT),
+        "requests": {
+            "recent": list(client.recent_requests),
+            "rate_limit": client.rate_limit_state,
+        } if client else None,
+        "metrics": metrics.snapshot() if metrics.enabled else None,
+        "abrp": abrp.stats if abrp else None,
+        "charging_commands": commands.stats if commands else None,
+        "charging_history": history.summary if history else None,
+    }
@@ -0,0 +1,356 @@
+# custom_components/evconduit/electricity_rate.py
+
+"""Per-account electricity rate publisher."""
+
+import logging
+from datetime import datetime, timedelta
+
+from homeassistant.core import callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN, CONF_API_KEY,
+    CONF_ELECTRICITY_RATE_ENTITY, CONF_ELECTRICITY_RATE_CURRENCY,
+    CONF_ELECTRICITY_RATE_TOLERANCE, CONF_ELECTRICITY_RATE_FORECAST,
+    RATE_PUSH_DEBOUNCE, RATE_PUSH_INTERVAL,
+    RATE_PUSH_RETRY_MIN, RATE_PUSH_RETRY_MAX,
+    PRICE_CURVE_ATTRIBUTES, PRICE_CURVE_START_KEYS,
+    PRICE_CURVE_END_KEYS, PRICE_CURVE_VALUE_KEYS,
+)
+from .features import Feature
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _parse_rate(state) -> float | None:
+    """Return a non-negative rate from a state object, or None."""
+    if state is None or state.state in ("unknown", "unavailable"):
+        return None
+    try:
+        rate = float(state.state)
+    except (ValueError, TypeError):
+        _LOGGER.debug("Invalid electricity rate value: %s", state.state)
+        return None
+    return rate if rate >= 0 else None
+
+
+def _first(item: dict, keys: tuple):
+    for key in keys:
+        if item.get(key) is not None:
+            return item[key]
+    return None
+
+
+def _as_datetime(value) -> datetime | None:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return dt_util.parse_datetime(value)
+    return None
+
+
+def _parse_price_curve(state) -> list[dict]:
+    """Extract the day-ahead price curve from a spot-price entity's attributes.
+
+    Returns a sorted list of {"start", "end", "cost_per_kwh"} dicts with ISO
+    8601 times, or an empty list when the entity exposes no usable curve.
+    Intervals without an explicit end run until the next start (or one hour).
+    """
+    if state is None:
+        return []
+    points: dict[datetime, tuple[datetime | None, float]] = {}
+    for attr in PRICE_CURVE_ATTRIBUTES:
+        items = state.attributes.get(attr)
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            start = _as_datetime(_first(item, PRICE_CURVE_START_KEYS))
+            value = _first(item, PRICE_CURVE_VALUE_KEYS)
+            if start is None or value is None:
+                continue
+            try:
+                value = float(value)
+            except (ValueError, TypeError):
+                continue
+            points[start] = (_as_datetime(_first(item, PRICE_CURVE_END_KEYS)), value)
+
+    starts = sorted(points)
+    curve = []
+    for i, start in enumerate(starts):
+        end, value = points[start]
+        if end is None:
+            end = starts[i + 1] if i + 1 < len(starts) else start + timedelta(hours=1)
+        curve.append({
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "cost_per_kwh": value,
+        })
+    return curve
+
+
+class ElectricityRatePublisher:
+    """Push the electricity rate for one EVConduit account.
+
+    The backend stores one rate per account, so all config entries sharing
+    an API key share a publisher. State changes are debounced, changes within
+    the tolerance of the last pushed rate are ignored, and failed pushes are
+    retried with exponential backoff.
+
+    In forecast mode the entity's day-ahead price curve is uploaded instead
+    of the current rate, and only when it holds intervals the backend has not
+    seen yet - typically once a day when tomorrow's prices are published.
+    Entities without a curve, and failed uploads, fall back to scalar pushes;
+    a backend without the tariff endpoint gets scalar pushes only.
+    """
+
+    def __init__(
+        self, hass, client, entity_id: str, currency: str,
+        tolerance: float = 0.0, forecast: bool = False,
+    ):
+        self.hass = hass
+        self._client = client
+        self._entity_id = entity_id
+        self._currency = currency
+        self._tolerance = tolerance
+        self._forecast = forecast
+        self._uploaded: dict[str, float] = {}
+        # Cleared when the backend turns out not to accept price curves
+        self._curve_supported = True
+        # Configuration per attached entry, in attach order; the last one is active
+        self._entries: dict[str, tuple] = {}
+        self._last_pushed: float | None = None
+        self._retry_delay = RATE_PUSH_RETRY_MIN
+        self._unsub_state = None
+        self._unsub_timer = None
+        self._unsub_retry = None
+        self._debouncer = Debouncer(
+            hass, _LOGGER,
+            cooldown=RATE_PUSH_DEBOUNCE,
+            immediate=False,
+            function=self._async_push_current,
+        )
+
+    def add_entry(
+        self, entry_id: str, client, entity_id: str, currency: str,
+        tolerance: float, forecast: bool = False,
+    ) -> None:
+        """Attach a config entry; the most recently attached configuration wins."""
+        self._entries.pop(entry_id, None)
+        self._entries[entry_id] = (client, entity_id, currency, tolerance, forecast)
+        self._configure(client, entity_id, currency, tolerance, forecast)
+
+    def remove_entry(self, entry_id: str) -> bool:
+        """Detach a config entry. Returns True when no entries remain.
+
+        If the detached entry supplied the active configuration, the most
+        recently attached remaining entry takes over.
+        """
+        was_active = bool(self._entries) and next(reversed(self._entries)) == entry_id
+        self._entries.pop(entry_id, None)
+        if not self._entries:
+            return True
+        if was_active:
+            self._configure(*next(reversed(self._entries.values())))
+        return False
+
+    def _configure(self, client, entity_id: str, currency: str, tolerance: float, forecast: bool) -> None:
+        self._client = client
+        self._tolerance = tolerance
+        self._forecast = forecast
+        if currency != self._currency:
+            self._currency = currency
+            self._last_pushed = None
+            self._uploaded = {}
+        if entity_id != self._entity_id:
+            _LOGGER.debug(
+                "Electricity rate entity changed from %s to %s", self._entity_id, entity_id
+            )
+            self._entity_id = entity_id
+            self._last_pushed = None
+            self._uploaded = {}
+            if self._unsub_state:
+                self._unsub_state()
+                self._unsub_state = self._track_entity()
+            self._debouncer.async_schedule_call()
+
+    @callback
+    def async_start(self) -> None:
+        """Start listening for rate changes and push the current value."""
+        self._unsub_state = self._track_entity()
+        self._unsub_timer = async_track_time_interval(
+            self.hass, self._async_periodic_push, timedelta(minutes=RATE_PUSH_INTERVAL)
+        )
+        self._debouncer.async_schedule_call()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop all listeners, timers and pending retries."""
+        for unsub in (self._unsub_state, self._unsub_timer, self._unsub_retry):
+            if unsub:
+                unsub()
+        self._unsub_state = self._unsub_timer = self._unsub_retry = None
+        self._debouncer.async_cancel()
+
+    def _track_entity(self):
+        return async_track_state_change_event(
+            self.hass, [self._entity_id], self._on_rate_change
+        )
+
+    @callback
+    def _on_rate_change(self, event) -> None:
+        """Schedule a debounced push when the rate entity changes."""
+        if self._unsub_retry is not None:
+            # A retry is pending; it pushes the then-current rate
+            return
+        new_state = event.data.get("new_state")
+        if self._forecast or _parse_rate(new_state) is not None:
+            self._debouncer.async_schedule_call()
+
+    @callback
+    def _async_periodic_push(self, _now) -> None:
+        """Safety-net push; skipped when the rate is within tolerance."""
+        if self._unsub_retry is not None:
+            return
+        self._debouncer.async_schedule_call()
+
+    @callback
+    def _async_retry(self, _now) -> None:
+        self._unsub_retry = None
+        self._debouncer.async_schedule_call()
+
+    async def _async_push_current(self) -> None:
+        """Read the rate entity and push it if it moved beyond the tolerance."""
+        state = self.hass.states.get(self._entity_id)
+        curve_failed = False
+        if self._forecast and self._curve_supported:
+            curve = _parse_price_curve(state)
+            if curve:
+                if await self._async_upload_curve(curve):
+                    return
+                curve_failed = self._curve_supported
+        rate = _parse_rate(state)
+        if rate is None:
+            if curve_failed:
+                self._handle_result(False)
+            return
+        if self._last_pushed is not None and abs(rate - self._last_pushed) <= self._tolerance:
+            _LOGGER.debug(
+                "Electricity rate %.4f within tolerance of %.4f, skipping push",
+                rate, self._last_pushed,
+            )
+            return
+
+        result = await self._client.async_push_electricity_rate(rate, self._currency)
+        if result:
+            self._last_pushed = rate
+            _LOGGER.debug("Pushed electricity rate: %.4f %s", rate, self._currency)
+        self._handle_result(bool(result))
+
+    async def _async_upload_curve(self, curve: list[dict]) -> bool:
+        """Upload the price curve if it holds new or changed intervals.
+
+        Returns False when the upload failed; the caller then pushes the
+        current rate instead.
+        """
+        if all(self._uploaded.get(p["start"]) == p["cost_per_kwh"] for p in curve):
+            _LOGGER.debug("Electricity price curve unchanged, skipping upload")
+            return True
+        result = await self._client.async_push_electricity_tariff(curve, self._currency)
+        if result is False:
+            _LOGGER.info("Backend does not accept price curves, pushing the current rate instead")
+            self._curve_supported = False
+            return False
+        if not result:
+            return False
+        self._uploaded = {p["start"]: p["cost_per_kwh"] for p in curve}
+        self._handle_result(True)
+        return True
+
+    def _handle_result(self, ok: bool) -> None:
+        """Reset the backoff on success, or schedule a retry on failure."""
+        if ok:
+            self._retry_delay = RATE_PUSH_RETRY_MIN
+            if self._unsub_retry:
+                self._unsub_retry()
+                self._unsub_retry = None
+            return
+
+        if self._unsub_retry is None:
+            _LOGGER.debug("Electricity rate push failed, retrying in %s s", self._retry_delay)
+            self._unsub_retry = async_call_later(self.hass, self._retry_delay, self._async_retry)
+            self._retry_delay = min(self._retry_delay * 2, RATE_PUSH_RETRY_MAX)
+
+
+def async_attach_rate_publisher(
+    hass, entry_id: str, api_key: str, client, entity_id: str, currency: str,
+    tolerance: float, forecast: bool = False,
+) -> ElectricityRatePublisher:
+    """Attach a config entry to its account's publisher, creating it if needed."""
+    publishers = hass.data.setdefault(DOMAIN, {}).setdefault("rate_publishers", {})
+    publisher = publishers.get(api_key)
+    if publisher is None:
+        publisher = ElectricityRatePublisher(hass, client, entity_id, currency, tolerance, forecast)
+        publishers[api_key] = publisher
+        publisher.async_start()
+    publisher.add_entry(entry_id, client, entity_id, currency, tolerance, forecast)
+    return publisher
+
+
+def async_detach_rate_publisher(hass, entry_id: str, api_key: str) -> None:
+    """Detach a config entry, stopping the publisher when it was the last one."""
+    publishers = hass.data.get(DOMAIN, {}).get("rate_publishers", {})
+    publisher = publishers.get(api_key)
+    if publisher and publisher.remove_entry(entry_id):
+        publisher.async_stop()
+        publishers.pop(api_key, None)
+
+
+class ElectricityRateFeature(Feature):
+    """Attach the entry to its account's electricity rate publisher."""
+
+    name = "electricity_rate"
+
+    def __init__(self, hass, entry, client, coordinator, metrics):
+        super().__init__(hass, entry, client, coordinator, metrics)
+        options = entry.options
+        self.entity_id = options.get(CONF_ELECTRICITY_RATE_ENTITY) or ""
+        currency = (options.get(CONF_ELECTRICITY_RATE_CURRENCY) or "").strip().upper()
+        if not currency or len(currency) != 3:
+            currency = (hass.config.currency or "").strip().upper()
+        self.currency = currency
+        self.tolerance = options.get(CONF_ELECTRICITY_RATE_TOLERANCE, 0.0) or 0.0
+        self.forecast = options.get(CONF_ELECTRICITY_RATE_FORECAST, False)
+        self._attached = False
+
+    @callback
+    def async_start(self) -> None:
+        if not self.currency or len(self.currency) != 3:
+            _LOGGER.warning(
+                "Electricity rate entity configured (%s) but currency could not be determined (%s). "
+                "Set a 3-letter currency code in options, or configure your HA currency in Settings → General.",
+                self.entity_id, self.currency,
+            )
+            return
+        _LOGGER.info(
+            "Electricity rate push enabled: entity=%s, currency=%s",
+            self.entity_id, self.currency,
+        )
+        # One publisher per account: vehicles sharing an API key push once
+        async_attach_rate_publisher(
+            self.hass, self.entry.entry_id, self.entry.data[CONF_API_KEY], self.client,
+            self.entity_id, self.currency, self.tolerance, self.forecast,
+        )
+        self._attached = True
+
+    async def async_unload(self) -> None:
+        if self._attached:
+            async_detach_rate_publisher(self.hass, self.entry.entry_id, self.entry.data[CONF_API_KEY])
+            self._attached = False
@@ -0,0 +1,157 @@
+# custom_components/evconduit/features.py
+
+"""Per-entry feature subsystems driven by a single vehicle update listener."""
+
+import logging
+import time
+from collections import defaultdict
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def changed_paths(old: dict, new: dict) -> set[str]:
+    """Return the vehicle fields that differ, as top-level keys or "key.sub" paths.
+
+    Nested dicts are compared one level deep. Webhook merges keep untouched
+    sub-dicts as the same objects, so those are skipped by identity.
+    """
+    changed = set()
+    for key in old.keys() | new.keys():
+        before, after = old.get(key), new.get(key)
+        if before is after:
+            continue
+        if isinstance(before, dict) and isinstance(after, dict):
+            for sub in before.keys() | after.keys():
+                if before.get(sub) != after.get(sub):
+                    changed.add(f"{key}.{sub}")
+        elif before != after:
+            changed.add(key)
+    return changed
+
+
+def matches(watched, changed: set[str]) -> bool:
+    """Return True if any changed path is, contains or lies inside a watched path."""
+    for path in changed:
+        for field in watched:
+            if path == field or path.startswith(f"{field}.") or field.startswith(f"{path}."):
+                return True
+    return False
+
+
+class Feature:
+    """An optional subsystem of a config entry (ABRP, odometer, rate push, ...).
+
+    ``watched`` lists the vehicle fields the feature reacts to, as dotted
+    paths matched by prefix ("location" covers "location.latitude"). ``None``
+    means every change, an empty tuple means the feature does not look at
+    vehicle updates at all.
+
+    Lifecycle: ``async_setup`` runs concurrently with the first coordinator
+    refreshes, ``async_start`` once vehicle data is available, and
+    ``async_unload`` when the entry is unloaded.
+    """
+
+    name = "feature"
+    watched: tuple[str, ...] | None = ()
+
+    def __init__(self, hass, entry, client, coordinator, metrics):
+        self.hass = hass
+        self.entry = entry
+        self.client = client
+        self.coordinator = coordinator
+        self.metrics = metrics
+
+    def wants(self, changed: set[str]) -> bool:
+        if self.watched is None:
+            return True
+        return matches(self.watched, changed)
+
+    async def async_setup(self) -> None:
+        """Load state; runs concurrently with the first refreshes."""
+
+    @callback
+    def async_start(self) -> None:
+        """Start listeners and timers once the coordinators have data."""
+
+    @callback
+    def async_vehicle_updated(self, data: dict, changed: set[str]) -> None:
+        """Handle a vehicle update that touched one of the watched fields."""
+
+    async def async_unload(self) -> None:
+        """Stop the feature and release its resources."""
+
+
+class FeatureDispatcher:
+    """The only vehicle coordinator listener for the entry's features.
+
+    Each update is diffed against the previous one and passed to the
+    features whose watched fields changed, and to path listeners (entities
+    that only care about a single field, such as the VIN).
+    """
+
+    def __init__(self, coordinator, metrics):
+        self._coordinator = coordinator
+        self._metrics = metrics
+        self._last: dict = {}
+        self._unsub = None
+        self._path_listeners: dict[str, list] = defaultdict(list)
+        self.features: list[Feature] = []
+
+    def add(self, feature: Feature) -> None:
+        self.features.append(feature)
+
+    @callback
+    def async_add_path_listener(self, path: str, listener):
+        """Call listener(data) when the vehicle field at path changes; returns an unsubscribe."""
+        self._path_listeners[path].append(listener)
+
+        @callback
+        def remove() -> None:
+            self._path_listeners[path].remove(listener)
+            if not self._path_listeners[path]:
+                del self._path_listeners[path]
+
+        return remove
+
+    @callback
+    def async_start(self) -> None:
+        for feature in self.features:
+            feature.async_start()
+        self._last = self._coordinator.data or {}
+        self._unsub = self._coordinator.async_add_listener(self._async_handle_update)
+
+    async def async_unload(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        for feature in reversed(self.features):
+            try:
+                await feature.async_unload()
+            except Exception:
+                _LOGGER.exception("Error unloading %s feature", feature.name)
+
+    @callback
+    def _async_handle_update(self) -> None:
+        data = self._coordinator.data
+        if not data:
+            return
+        self._metrics.inc("vehicle_updates")
+        changed = changed_paths(self._last, data)
+        self._last = data
+        if not changed:
+            return
+        for feature in self.features:
+            if not feature.wants(changed):
+                continue
+            if self._metrics.enabled:
+                start = time.perf_counter()
+                feature.async_vehicle_updated(data, changed)
+                self._metrics.observe(f"feature.{feature.name}", (time.perf_counter() - start) * 1000)
+            else:
+                feature.async_vehicle_updated(data, changed)
+        for path, listeners in list(self._path_listeners.items()):
+            if matches((path,), changed):
+                for listener in list(listeners):
+                    listener(data)
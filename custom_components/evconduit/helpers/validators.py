@@ -9,10 +9,10 @@ async def validate_api_key(hass, api_key: str, base_url: str = "https://backend.
         client = EVConduitClient(hass, api_key, base_url, "dummy")
         _LOGGER.debug("[Validator] Created EVConduitClient for API key validation")
         userinfo = await client.async_get_userinfo()
-        _LOGGER.debug(f"[Validator] Result from async_get_userinfo: {userinfo}")
+        _LOGGER.debug("[Validator] Result from async_get_userinfo: %s", userinfo)
         return bool(userinfo)
     except Exception as e:
-        _LOGGER.exception(f"[Validator] Exception during API key validation: {e}")
+        _LOGGER.exception("[Validator] Exception during API key validation: %s", e)
         return False
 
 async def validate_vehicle_id(hass, api_key: str, vehicle_id: str, base_url: str = "https://backend.evconduit.com") -> bool:
@@ -20,8 +20,8 @@ async def validate_vehicle_id(hass, api_key: str, vehicle_id: str, base_url: str
     try:
         client = EVConduitClient(hass, api_key, base_url, vehicle_id)
         data = await client.async_get_vehicle_status()
-        _LOGGER.debug(f"[Validator] Vehicle status fetched for id {vehicle_id}: {data}")
+        _LOGGER.debug("[Validator] Vehicle status fetched for id %s: %s", vehicle_id, data)
         return data is not None
     except Exception as e:
-        _LOGGER.exception(f"[Validator] Exception during vehicle_id validation: {e}")
+        _LOGGER.exception("[Validator] Exception during vehicle_id validation: %s", e)
         return False
@@ -0,0 +1,299 @@
+# custom_components/evconduit/history_export.py
+
+"""Export and import of the charging history as CSV or a packed columnar file.
+
+Files are written and read in chunks of EXPORT_CHUNK_SIZE sessions, each
+chunk in the executor, so neither direction holds a second copy of the
+history in memory. Imports are merged through ``ChargingHistory`` like a
+backend sync, so duplicates are skipped and the analytics, statistics and
+sensors are updated once at the end.
+
+Formats:
+
+- ``csv``: one row per session, the SESSION_COLUMNS first and any other
+  session keys JSON-encoded in an ``extra`` column.
+- ``packed``: a ``EVCH`` header followed by zlib-compressed blocks, each
+  holding one chunk column by column (``{"rows": n, "columns": {...}}``).
+- ``parquet``: one row group per chunk; only offered when ``pyarrow`` is
+  installed.
+"""
+
+import csv
+import importlib.util
+import json
+import logging
+import os
+import struct
+import zlib
+
+from .const import EXPORT_CHUNK_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Known session fields and their types, in file column order
+SESSION_COLUMNS = {
+    "session_id": str,
+    "start_time": str,
+    "end_time": str,
+    "created_at": str,
+    "energy_added_kwh": float,
+    "cost_per_kwh": float,
+    "total_cost": float,
+    "currency": str,
+    "station_name": str,
+    "location_lat": float,
+    "location_lon": float,
+    "battery_level_start": float,
+    "battery_level_end": float,
+    "odometer_km": float,
+}
+
+EXTRA_COLUMN = "extra"
+
+_PACKED_MAGIC = b"EVCH\x01"
+_BLOCK_HEADER = struct.Struct(">I")
+
+
+class ExportError(Exception):
+    """Raised for unreadable, unwritable or unsupported export files."""
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def format_from_path(path: str) -> str | None:
+    """Guess the file format from the extension."""
+    ext = os.path.splitext(path)[1].lower()
+    return {".csv": "csv", ".evch": "packed", ".parquet": "parquet"}.get(ext)
+
+
+FORMAT_EXTENSIONS = {"csv": "csv", "packed": "evch", "parquet": "parquet"}
+
+
+def _convert(value, kind):
+    """Convert a CSV cell back to the session field type ('' is None)."""
+    if value == "" or value is None:
+        return None
+    if kind is float:
+        number = float(value)
+        return int(number) if number.is_integer() and "." not in value else number
+    return value
+
+
+def _clean(row: dict) -> dict | None:
+    """Drop missing values; rows without a session_id are skipped."""
+    session = {key: value for key, value in row.items() if value is not None}
+    return session if session.get("session_id") else None
+
+
+class _CsvWriter:
+    def __init__(self, path: str):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([*SESSION_COLUMNS, EXTRA_COLUMN])
+
+    def write(self, sessions: list[dict]) -> None:
+        rows = []
+        for s in sessions:
+            extra = {k: v for k, v in s.items() if k not in SESSION_COLUMNS}
+            rows.append([
+                *("" if s.get(col) is None else s[col] for col in SESSION_COLUMNS),
+                json.dumps(extra, separators=(",", ":")) if extra else "",
+            ])
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _CsvReader:
+    def __init__(self, path: str):
+        self._file = open(path, newline="", encoding="utf-8")
+        self._reader = csv.DictReader(self._file)
+        try:
+            fieldnames = self._reader.fieldnames
+        except (UnicodeDecodeError, csv.Error) as err:
+            self._file.close()
+            raise ExportError(f"Invalid export file {path}: {err}") from err
+        if not fieldnames or "session_id" not in fieldnames:
+            self._file.close()
+            raise ExportError(f"{path} is not a charging history CSV export")
+
+    def read(self, size: int) -> list[dict]:
+        sessions = []
+        for row in self._reader:
+            extra = row.pop(EXTRA_COLUMN, None)
+            session = {
+                key: _convert(value, SESSION_COLUMNS.get(key, str))
+                for key, value in row.items() if key is not None
+            }
+            if extra:
+                session.update(json.loads(extra))
+            session = _clean(session)
+            if session:
+                sessions.append(session)
+            if len(sessions) >= size:
+                break
+        return sessions
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _PackedWriter:
+    def __init__(self, path: str):
+        self._file = open(path, "wb")
+        self._file.write(_PACKED_MAGIC)
+
+    def write(self, sessions: list[dict]) -> None:
+        names = list(SESSION_COLUMNS)
+        for s in sessions:
+            names.extend(k for k in s if k not in SESSION_COLUMNS and k not in names)
+        columns = {name: [s.get(name) for s in sessions] for name in names}
+        # Leave out columns that are empty throughout this block
+        block = {"rows": len(sessions), "columns": {k: v for k, v in columns.items() if any(x is not None for x in v)}}
+        payload = zlib.compress(json.dumps(block, separators=(",", ":")).encode(), 6)
+        self._file.write(_BLOCK_HEADER.pack(len(payload)))
+        self._file.write(payload)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _PackedReader:
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        if self._file.read(len(_PACKED_MAGIC)) != _PACKED_MAGIC:
+            self._file.close()
+            raise ExportError(f"{path} is not a packed charging history export")
+        self._pending: list[dict] = []
+
+    def _read_block(self) -> list[dict]:
+        header = self._file.read(_BLOCK_HEADER.size)
+        if len(header) < _BLOCK_HEADER.size:
+            return []
+        (length,) = _BLOCK_HEADER.unpack(header)
+        payload = self._file.read(length)
+        if len(payload) < length:
+            raise ExportError("Packed export is truncated")
+        block = json.loads(zlib.decompress(payload))
+        columns = block["columns"]
+        return [
+            {name: values[i] for name, values in columns.items()}
+            for i in range(block["rows"])
+        ]
+
+    def read(self, size: int) -> list[dict]:
+        sessions = self._pending
+        while len(sessions) < size:
+            block = self._read_block()
+            if not block:
+                break
+            sessions.extend(s for s in map(_clean, block) if s)
+        sessions, self._pending = sessions[:size], sessions[size:]
+        return sessions
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [(name, pa.float64() if kind is float else pa.string()) for name, kind in SESSION_COLUMNS.items()]
+            + [(EXTRA_COLUMN, pa.string())]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write(self, sessions: list[dict]) -> None:
+        rows = []
+        for s in sessions:
+            extra = {k: v for k, v in s.items() if k not in SESSION_COLUMNS}
+            row = {col: s.get(col) for col in SESSION_COLUMNS}
+            row[EXTRA_COLUMN] = json.dumps(extra, separators=(",", ":")) if extra else None
+            rows.append(row)
+        self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class _ParquetReader:
+    def __init__(self, path: str):
+        import pyarrow.parquet as pq
+
+        self._batches = pq.ParquetFile(path).iter_batches(batch_size=EXPORT_CHUNK_SIZE)
+
+    def read(self, size: int) -> list[dict]:
+        # Batches are EXPORT_CHUNK_SIZE rows, the size the importer asks for
+        for batch in self._batches:
+            sessions = []
+            for row in batch.to_pylist():
+                extra = row.pop(EXTRA_COLUMN, None)
+                if extra:
+                    row.update(json.loads(extra))
+                session = _clean(row)
+                if session:
+                    sessions.append(session)
+            if sessions:
+                return sessions
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+_WRITERS = {"csv": _CsvWriter, "packed": _PackedWriter, "parquet": _ParquetWriter}
+_READERS = {"csv": _CsvReader, "packed": _PackedReader, "parquet": _ParquetReader}
+
+
+def _open(classes: dict, path: str, fmt: str):
+    if fmt == "parquet" and not parquet_available():
+        raise ExportError("The parquet format needs the pyarrow package")
+    try:
+        return classes[fmt](path)
+    except OSError as err:
+        raise ExportError(f"Cannot open {path}: {err}") from err
+
+
+async def async_export_history(hass, history, path: str, fmt: str) -> int:
+    """Write all stored sessions of `history` to `path`; returns the session count."""
+    # Copy the list (not the sessions) so merges during the export are not seen
+    sessions = list(history.sessions)
+    directory = os.path.dirname(path)
+    if directory:
+        await hass.async_add_executor_job(os.makedirs, directory, 0o755, True)
+    writer = await hass.async_add_executor_job(_open, _WRITERS, path, fmt)
+    try:
+        for index in range(0, len(sessions), EXPORT_CHUNK_SIZE):
+            await hass.async_add_executor_job(writer.write, sessions[index:index + EXPORT_CHUNK_SIZE])
+    finally:
+        await hass.async_add_executor_job(writer.close)
+    _LOGGER.info("Exported %d charging sessions to %s", len(sessions), path)
+    return len(sessions)
+
+
+async def async_import_history(hass, history, path: str, fmt: str) -> dict:
+    """Merge the sessions in `path` into `history`; returns read and added counts."""
+    reader = await hass.async_add_executor_job(_open, _READERS, path, fmt)
+    read = 0
+    try:
+        async with history.async_bulk_merge() as merge:
+            while True:
+                try:
+                    chunk = await hass.async_add_executor_job(reader.read, EXPORT_CHUNK_SIZE)
+                except (ValueError, KeyError, TypeError, zlib.error, csv.Error) as err:
+                    raise ExportError(f"Invalid export file {path}: {err}") from err
+                if not chunk:
+                    break
+                read += len(chunk)
+                merge(chunk)
+    finally:
+        await hass.async_add_executor_job(reader.close)
+    _LOGGER.info("Imported %d charging sessions from %s (%d new)", read, path, merge.added)
+    return {"read": read, "added": merge.added}
@@ -0,0 +1,54 @@
+# custom_components/evconduit/log.py
+
+"""Logging helpers: secret redaction and rate-limited logging for hot paths."""
+
+import logging
+import time
+
+
+def redact(secret: str | None, keep: int = 4) -> str:
+    """Mask a secret such as an API key, keeping only its last few characters."""
+    if not secret:
+        return ""
+    if len(secret) <= keep * 2:
+        return "****"
+    return f"****{secret[-keep:]}"
+
+
+class RateLimitedLogger:
+    """Emit a message at most once per interval per key.
+
+    Meant for events that can fire on every poll or webhook push. Suppressed
+    occurrences are counted and reported with the next emitted message. The
+    level check comes first, so a disabled level costs one method call.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = 300.0):
+        self._logger = logger
+        self._interval = interval
+        self._last: dict[str, float] = {}
+        self._suppressed: dict[str, int] = {}
+
+    def log(self, level: int, key: str, msg: str, *args) -> None:
+        if not self._logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        last = self._last.get(key)
+        if last is not None and now - last < self._interval:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return
+        self._last[key] = now
+        suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            msg = f"{msg} (%d similar messages suppressed)"
+            args = (*args, suppressed)
+        self._logger.log(level, msg, *args)
+
+    def debug(self, key: str, msg: str, *args) -> None:
+        self.log(logging.DEBUG, key, msg, *args)
+
+    def warning(self, key: str, msg: str, *args) -> None:
+        self.log(logging.WARNING, key, msg, *args)
+
+    def error(self, key: str, msg: str, *args) -> None:
+        self.log(logging.ERROR, key, msg, *args)
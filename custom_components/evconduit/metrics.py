@@ -0,0 +1,112 @@
+# custom_components/evconduit/metrics.py
+
+"""Lightweight in-memory performance counters and histograms."""
+
+import time
+from collections import Counter, deque
+
+from .const import DOMAIN
+
+# Recent samples kept per histogram for percentiles
+HISTOGRAM_SAMPLES = 256
+
+
+class Histogram:
+    """Running count/sum/min/max plus a bounded window for percentiles."""
+
+    __slots__ = ("count", "total", "min", "max", "_recent")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+        self._recent: deque = deque(maxlen=HISTOGRAM_SAMPLES)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None or value < self.min else self.min
+        self.max = value if self.max is None or value > self.max else self.max
+        self._recent.append(value)
+
+    def percentile(self, pct: float) -> float | None:
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 2) if self.count else None,
+            "min": None if self.min is None else round(self.min, 2),
+            "max": None if self.max is None else round(self.max, 2),
+            "p50": None if not self._recent else round(self.percentile(0.5), 2),
+            "p95": None if not self._recent else round(self.percentile(0.95), 2),
+        }
+
+
+class Metrics:
+    """Counters and histograms for one config entry.
+
+    Durations are recorded in milliseconds by the call sites.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.counters: Counter = Counter()
+        self.histograms: dict[str, Histogram] = {}
+
+    def inc(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = Histogram()
+        hist.observe(value)
+
+    def histogram(self, name: str) -> dict | None:
+        hist = self.histograms.get(name)
+        return hist.as_dict() if hist else None
+
+    def histograms_with_prefix(self, prefix: str) -> dict[str, dict]:
+        return {
+            name[len(prefix):]: hist.as_dict()
+            for name, hist in self.histograms.items()
+            if name.startswith(prefix)
+        }
+
+    def rate_per_hour(self, name: str) -> float:
+        hours = (time.monotonic() - self.started) / 3600
+        return round(self.counters[name] / hours, 2) if hours > 0 else 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            "counters": dict(self.counters),
+            "histograms": {name: hist.as_dict() for name, hist in self.histograms.items()},
+        }
+
+
+class NullMetrics(Metrics):
+    """Metrics sink used when performance metrics are disabled."""
+
+    enabled = False
+
+    def inc(self, name: str, value: int = 1) -> None:
+        pass
+
+    def observe(self, name: str, value: float) -> None:
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+def get_metrics(hass, entry_id: str) -> Metrics:
+    """Return the metrics for an entry, or the shared no-op sink."""
+    return hass.data.get(DOMAIN, {}).get(f"{entry_id}_metrics", NULL_METRICS)
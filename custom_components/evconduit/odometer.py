@@ -0,0 +1,73 @@
+# custom_components/evconduit/odometer.py
+
+"""Automatic odometer push after a charge session."""
+
+import logging
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .charge_session import STATE_FINISHED, EVENT_FINALIZED, EVENT_FINALIZE_FAILED
+from .const import CONF_ODOMETER_ENTITY, SIGNAL_CHARGE_SESSION
+from .features import Feature
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OdometerFeature(Feature):
+    """Capture the odometer when a charge ends and push it once the session is finalized."""
+
+    name = "odometer"
+
+    def __init__(self, hass, entry, client, coordinator, metrics):
+        super().__init__(hass, entry, client, coordinator, metrics)
+        self.entity_id = entry.options.get(CONF_ODOMETER_ENTITY) or ""
+        # Odometer reading captured when the charge ended
+        self._odometer_at_end: float | None = None
+        self._unsub = None
+
+    @callback
+    def async_start(self) -> None:
+        _LOGGER.info("Auto-odometer update enabled with entity: %s", self.entity_id)
+        self._unsub = async_dispatcher_connect(
+            self.hass, SIGNAL_CHARGE_SESSION.format(self.entry.entry_id), self._on_charge_session_event
+        )
+
+    async def async_unload(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _on_charge_session_event(self, event: str, details: dict) -> None:
+        if event == STATE_FINISHED:
+            self._odometer_at_end = self._read_odometer()
+            return
+        if event == EVENT_FINALIZE_FAILED:
+            # Without a finalized session the reading would land on the wrong one
+            self._odometer_at_end = None
+            return
+
+        if event != EVENT_FINALIZED or self._odometer_at_end is None:
+            return
+        odometer_km = self._odometer_at_end
+        self._odometer_at_end = None
+        self.hass.async_create_task(self._async_push(odometer_km))
+
+    def _read_odometer(self) -> float | None:
+        state = self.hass.states.get(self.entity_id)
+        if state is None:
+            _LOGGER.warning("Odometer entity %s not found", self.entity_id)
+            return None
+        try:
+            return float(state.state)
+        except (ValueError, TypeError):
+            _LOGGER.warning("Invalid odometer value from %s: %s", self.entity_id, state.state)
+            return None
+
+    async def _async_push(self, odometer_km: float) -> None:
+        result = await self.client.async_update_odometer(odometer_km)
+        if result:
+            _LOGGER.info("Auto-updated odometer to %s km after charge ended", odometer_km)
+        else:
+            _LOGGER.warning("Failed to auto-update odometer after charge ended")
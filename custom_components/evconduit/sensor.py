@@ -1,14 +1,21 @@
 # custom_components/evconduit/sensor.py
 
+from homeassistant.const import EntityCategory
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 from .const import (
     DOMAIN, ICONS, USER_FIELDS, VEHICLE_FIELDS, WEBHOOK_FIELDS,
+    SENSOR_CLASSES, DIAGNOSTIC_FIELDS, STATIC_FIELDS,
     CONF_CHARGING_HISTORY, CHARGING_HISTORY_LAST_SESSION_FIELDS,
-    CHARGING_HISTORY_MONTHLY_FIELDS,
+    CHARGING_HISTORY_MONTHLY_FIELDS, CHARGING_ANALYTICS_FIELDS, PERFORMANCE_FIELDS, TRIP_FIELDS,
+    PERFORMANCE_SENSOR_INTERVAL,
 )
+from .metrics import get_metrics
 from datetime import datetime, timedelta, timezone
 import logging
 _LOGGER = logging.getLogger(__name__)
@@ -47,6 +54,48 @@ def _build_device_info(entry, vehicle_data: dict | None = None) -> DeviceInfo:
     }
 
 
+def _apply_sensor_classes(entity: SensorEntity, field: str) -> None:
+    """Set device class, state class, display precision and category for a field."""
+    device_class, state_class, precision = SENSOR_CLASSES.get(field, (None, None, None))
+    if device_class:
+        entity._attr_device_class = SensorDeviceClass(device_class)
+    if state_class:
+        entity._attr_state_class = SensorStateClass(state_class)
+    if precision is not None:
+        entity._attr_suggested_display_precision = precision
+    if field in DIAGNOSTIC_FIELDS:
+        entity._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+
+def _get_path(data: dict | None, field: str):
+    """Return the value at a dotted field path in the vehicle status, or None."""
+    val = data or {}
+    for p in field.split("."):
+        if not isinstance(val, dict):
+            return None
+        val = val.get(p)
+    return val
+
+
+def _parse_timestamp(value) -> datetime | None:
+    """Parse an ISO 8601 timestamp from the backend for timestamp sensors."""
+    if not value:
+        return None
+    parsed = dt_util.parse_datetime(value)
+    if parsed is not None and parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class EVConduitCoordinatorEntity(CoordinatorEntity):
+    """CoordinatorEntity that counts state writes in the entry's metrics."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        get_metrics(self.hass, self._entry.entry_id).inc("entity_writes")
+        super()._handle_coordinator_update()
+
+
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up EVConduit sensors."""
     user_coordinator = hass.data[DOMAIN].get(entry.entry_id)
@@ -54,38 +103,17 @@ async def async_setup_entry(hass, entry, async_add_entities):
 
     entities = []
 
-    vehicle_data = vehicle_coordinator.data or {}
-    capabilities = vehicle_data.get("capabilities", {})
-    _LOGGER.debug("[EVConduit] Vehicle capabilities: %s", capabilities)
-
-    def is_field_capable(field):
-        cap_key = field.split(".")[0]
-        cap = capabilities.get(cap_key, {})
-        is_cap = cap.get("isCapable", True)  # Default True för bakåtkompabilitet
-        _LOGGER.debug("[EVConduit] Field '%s' capability '%s': %s", field, cap_key, is_cap)
-        return is_cap
-
     # Userinfo sensors
     for field, (label, unit) in USER_FIELDS.items():
         entities.append(EVConduitSensor(user_coordinator, entry, field, label, unit, vehicle_coordinator))
 
-    # Vehicle status sensors, nu med filtrering!
+    # Vehicle status sensors follow the vehicle's capabilities at runtime
     if vehicle_coordinator:
-        for field, (label, unit) in VEHICLE_FIELDS.items():
-            if is_field_capable(field):
-                entities.append(
-                    EVConduitVehicleSensor(vehicle_coordinator, entry, field, label, unit)
-                )
-                _LOGGER.warning(
-                    "[EVConduit] Sensor created: %s, field: %s",
-                    f"{DOMAIN}-{entry.entry_id}-vehicle-{field}",
-                    field,
-                )
-            else:
-                _LOGGER.warning(
-                    "[EVConduit] Skipping sensor for field '%s' since capability '%s' isCapable: False",
-                    field, field.split(".")[0]
-                )
+        manager = VehicleSensorManager(hass, entry, vehicle_coordinator, async_add_entities)
+        manager.async_reconcile()
+        hass.data[DOMAIN][f"{entry.entry_id}_sensor_unsub"] = vehicle_coordinator.async_add_listener(
+            manager.async_reconcile
+        )
 
     entities.append(
         EVConduitLocation(
@@ -122,11 +150,108 @@ async def async_setup_entry(hass, entry, async_add_entities):
                     ch_coordinator, entry, field, label, unit, vehicle_coordinator
                 )
             )
+        history = hass.data[DOMAIN][f"{entry.entry_id}_ch_store"]
+        for field, (label, unit) in CHARGING_ANALYTICS_FIELDS.items():
+            entities.append(
+                EVConduitChargingAnalyticsSensor(
+                    ch_coordinator, history.analytics, entry, field, label, unit, vehicle_coordinator
+                )
+            )
+
+    # Trip log sensors (only if the trip log is enabled in options)
+    trip_log = hass.data[DOMAIN].get(f"{entry.entry_id}_trips")
+    if trip_log:
+        for field, (label, unit) in TRIP_FIELDS.items():
+            entities.append(
+                EVConduitTripSensor(trip_log.coordinator, entry, field, label, unit, vehicle_coordinator)
+            )
+
+    # Performance diagnostics sensors (only if metrics are enabled in options)
+    metrics = get_metrics(hass, entry.entry_id)
+    if metrics.enabled:
+        for field, (label, unit) in PERFORMANCE_FIELDS.items():
+            entities.append(
+                EVConduitPerformanceSensor(metrics, entry, field, label, unit, vehicle_coordinator)
+            )
 
     async_add_entities(entities)
 
 
-class EVConduitSensor(CoordinatorEntity, SensorEntity):
+class VehicleSensorManager:
+    """Add and remove vehicle status sensors as the vehicle's capabilities change.
+
+    Nothing is created until vehicle data is available, so an empty first
+    refresh (e.g. rate limited) does not create sensors the car can't
+    support. Sensors for fields that become unsupported are removed from
+    the entity registry.
+    """
+
+    def __init__(self, hass, entry, coordinator, async_add_entities):
+        self.hass = hass
+        self._entry = entry
+        self._coordinator = coordinator
+        self._async_add_entities = async_add_entities
+        self._entities: dict[str, SensorEntity] = {}
+        self._capabilities = None
+
+    def _unique_id(self, field: str) -> str:
+        return f"{DOMAIN}-{self._entry.entry_id}-vehicle-{field}"
+
+    @staticmethod
+    def _capable_fields(capabilities: dict) -> set[str]:
+        capable = set()
+        for field in VEHICLE_FIELDS:
+            cap = capabilities.get(field.split(".")[0], {})
+            if cap.get("isCapable", True):  # Default True för bakåtkompabilitet
+                capable.add(field)
+        return capable
+
+    @callback
+    def async_reconcile(self) -> None:
+        """Bring the sensor set in line with the current capabilities."""
+        data = self._coordinator.data
+        if not data:
+            return
+        capabilities = data.get("capabilities") or {}
+        if self._capabilities is not None and (
+            capabilities is self._capabilities or capabilities == self._capabilities
+        ):
+            return
+        self._capabilities = capabilities
+        _LOGGER.debug("[EVConduit] Vehicle capabilities: %s", capabilities)
+
+        wanted = self._capable_fields(capabilities)
+        new_entities = []
+        for field, (label, unit) in VEHICLE_FIELDS.items():
+            if field in wanted and field not in self._entities:
+                sensor_cls = EVConduitStaticVehicleSensor if field in STATIC_FIELDS else EVConduitVehicleSensor
+                entity = sensor_cls(self._coordinator, self._entry, field, label, unit)
+                self._entities[field] = entity
+                new_entities.append(entity)
+                _LOGGER.debug("[EVConduit] Sensor created: %s, field: %s", self._unique_id(field), field)
+        if new_entities:
+            self._async_add_entities(new_entities)
+
+        ent_reg = er.async_get(self.hass)
+        for field in VEHICLE_FIELDS:
+            if field in wanted:
+                continue
+            entity = self._entities.pop(field, None)
+            entity_id = ent_reg.async_get_entity_id("sensor", DOMAIN, self._unique_id(field))
+            if entity_id:
+                # Removing the registry entry also removes a live entity
+                ent_reg.async_remove(entity_id)
+            elif entity is not None:
+                self.hass.async_create_task(entity.async_remove(force_remove=True))
+            else:
+                continue
+            _LOGGER.debug(
+                "[EVConduit] Removed sensor for field '%s' since capability '%s' isCapable: False",
+                field, field.split(".")[0],
+            )
+
+
+class EVConduitSensor(EVConduitCoordinatorEntity, SensorEntity):
     """Sensor for user information."""
 
     def __init__(self, coordinator, entry, field, name, unit, vehicle_coordinator=None):
@@ -136,6 +261,7 @@ class EVConduitSensor(CoordinatorEntity, SensorEntity):
         self._name = name
         self._unit = unit
         self._vehicle_coordinator = vehicle_coordinator
+        _apply_sensor_classes(self, field)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -147,12 +273,12 @@ class EVConduitSensor(CoordinatorEntity, SensorEntity):
         return self._name
 
     @property
-    def state(self):
+    def native_value(self):
         data = self.coordinator.data or {}
         return data.get(self._field)
 
     @property
-    def unit_of_measurement(self):
+    def native_unit_of_measurement(self):
         return self._unit
 
     @property
@@ -164,7 +290,7 @@ class EVConduitSensor(CoordinatorEntity, SensorEntity):
         # Fallback to entry_id if data is missing
         return f"{DOMAIN}-{self._entry.entry_id}-{self._field}"
 
-class EVConduitVehicleSensor(CoordinatorEntity, SensorEntity):
+class EVConduitVehicleSensor(EVConduitCoordinatorEntity, SensorEntity):
     """Sensor for vehicle status."""
 
     def __init__(self, coordinator, entry, field, name, unit):
@@ -173,6 +299,7 @@ class EVConduitVehicleSensor(CoordinatorEntity, SensorEntity):
         self._field = field
         self._name = name
         self._unit = unit
+        _apply_sensor_classes(self, field)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -183,26 +310,25 @@ class EVConduitVehicleSensor(CoordinatorEntity, SensorEntity):
         return self._name
 
     @property
-    def state(self):
+    def native_value(self):
         # Retrieve the value from the nested JSON
         data = self.coordinator.data or {}
-        parts = self._field.split(".")
-        val = data
-        for p in parts:
-            if not isinstance(val, dict):
-                val = None
-                break
-            val = val.get(p)
-
-        # Special handling for null values on chargeRate and chargeTimeRemaining
-        if self._field in ("chargeState.chargeRate", "chargeState.chargeTimeRemaining"):
-            return "--" if val is None else val
+        val = _get_path(data, self._field)
+
+        # The backend reports no charge rate while not charging; that is 0 kW,
+        # not an unknown value
+        if self._field == "chargeState.chargeRate" and val is None:
+            charge_state = data.get("chargeState") or {}
+            return None if charge_state.get("isCharging") else 0
+
+        if self._field == "lastSeen":
+            return _parse_timestamp(val)
 
         # Other sensors: return as usual (None → Unknown)
         return val
 
     @property
-    def unit_of_measurement(self):
+    def native_unit_of_measurement(self):
         return self._unit
 
     @property
@@ -214,7 +340,64 @@ class EVConduitVehicleSensor(CoordinatorEntity, SensorEntity):
         # Consistent id independent of response data
         return f"{DOMAIN}-{self._entry.entry_id}-vehicle-{self._field}"
 
-class EVConduitLocation(CoordinatorEntity, SensorEntity):
+class EVConduitStaticVehicleSensor(SensorEntity):
+    """Vehicle identity field (VIN, brand, model, ...).
+
+    Not a coordinator listener: the value is read once when the entity is
+    added and written again only when the feature dispatcher reports a
+    change to this field.
+    """
+
+    _attr_should_poll = False
+
+    def __init__(self, coordinator, entry, field, name, unit):
+        self.coordinator = coordinator
+        self._entry = entry
+        self._field = field
+        self._name = name
+        self._unit = unit
+        _apply_sensor_classes(self, field)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._attr_native_value = _get_path(self.coordinator.data, self._field)
+        dispatcher = self.hass.data[DOMAIN].get(f"{self._entry.entry_id}_features")
+        if dispatcher:
+            self.async_on_remove(
+                dispatcher.async_add_path_listener(self._field, self._handle_field_update)
+            )
+
+    @callback
+    def _handle_field_update(self, data: dict) -> None:
+        value = _get_path(data, self._field)
+        if value == self._attr_native_value:
+            return
+        self._attr_native_value = value
+        get_metrics(self.hass, self._entry.entry_id).inc("entity_writes")
+        self.async_write_ha_state()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return _build_device_info(self._entry, self.coordinator.data)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def native_unit_of_measurement(self):
+        return self._unit
+
+    @property
+    def icon(self):
+        return ICONS.get(self._field)
+
+    @property
+    def unique_id(self):
+        return f"{DOMAIN}-{self._entry.entry_id}-vehicle-{self._field}"
+
+
+class EVConduitLocation(EVConduitCoordinatorEntity, SensorEntity):
     """Template sensor for vehicle position with lat/lon attributes."""
 
     def __init__(self, coordinator, entry):
@@ -230,7 +413,7 @@ class EVConduitLocation(CoordinatorEntity, SensorEntity):
         return "Location"
 
     @property
-    def state(self) -> str:
+    def native_value(self) -> str:
         """Use vehicleName as the state (or any field)."""
         data = self.coordinator.data or {}
         # vehicleName comes from /status/:vehicle_id
@@ -250,14 +433,20 @@ class EVConduitLocation(CoordinatorEntity, SensorEntity):
     def unique_id(self) -> str:
         return f"{DOMAIN}-{self._entry.entry_id}-location"
 
-class EVConduitWebhookIdSensor(CoordinatorEntity, SensorEntity):
+class EVConduitWebhookIdSensor(SensorEntity):
+    """The entry's webhook ID; static, so it is written once and never polled."""
+
+    _attr_should_poll = False
+
     def __init__(self, coordinator, entry, field, name, unit, vehicle_coordinator=None):
-        super().__init__(coordinator)
         self._entry = entry
         self._field = field
         self._name = name
         self._unit = unit
         self._vehicle_coordinator = vehicle_coordinator
+        # Returnera entry_id som är unikt för denna integration/instans.
+        self._attr_native_value = entry.entry_id
+        _apply_sensor_classes(self, field)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -269,12 +458,7 @@ class EVConduitWebhookIdSensor(CoordinatorEntity, SensorEntity):
         return self._name
 
     @property
-    def state(self):
-        # Returnera entry_id som är unikt för denna integration/instans.
-        return self._entry.entry_id
-
-    @property
-    def unit_of_measurement(self):
+    def native_unit_of_measurement(self):
         return self._unit
 
     @property
@@ -287,7 +471,7 @@ class EVConduitWebhookIdSensor(CoordinatorEntity, SensorEntity):
         return f"{DOMAIN}-{self._entry.entry_id}-{self._field}"
 
 
-class EVConduitLastSeenLocalSensor(CoordinatorEntity, SensorEntity):
+class EVConduitLastSeenLocalSensor(EVConduitCoordinatorEntity, SensorEntity):
     """Sensor that displays Last Seen time in Home Assistant's local timezone."""
 
     def __init__(self, coordinator, entry, hass):
@@ -304,7 +488,7 @@ class EVConduitLastSeenLocalSensor(CoordinatorEntity, SensorEntity):
         return "Last Seen Local"
 
     @property
-    def state(self):
+    def native_value(self):
         """Convert UTC lastSeen to local timezone."""
         data = self.coordinator.data or {}
         last_seen_utc = data.get("lastSeen")
@@ -349,9 +533,13 @@ class EVConduitLastSeenLocalSensor(CoordinatorEntity, SensorEntity):
         return f"{DOMAIN}-{self._entry.entry_id}-vehicle-lastSeenLocal"
 
 
-class EVConduitChargingHistorySensor(CoordinatorEntity, SensorEntity):
+class EVConduitChargingHistorySensor(EVConduitCoordinatorEntity, SensorEntity):
     """Sensor for charging history data (last session and monthly aggregates)."""
 
+    # The session list is for dashboard cards; long-term totals are kept as
+    # external statistics instead of in the recorder's state attributes
+    _unrecorded_attributes = frozenset({"recent_sessions"})
+
     def __init__(self, coordinator, entry, field, name, unit, vehicle_coordinator=None):
         super().__init__(coordinator)
         self._entry = entry
@@ -359,6 +547,7 @@ class EVConduitChargingHistorySensor(CoordinatorEntity, SensorEntity):
         self._name = name
         self._unit = unit
         self._vehicle_coordinator = vehicle_coordinator
+        _apply_sensor_classes(self, field)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -378,7 +567,7 @@ class EVConduitChargingHistorySensor(CoordinatorEntity, SensorEntity):
         return f"{DOMAIN}-{self._entry.entry_id}-ch-{self._field}"
 
     @property
-    def unit_of_measurement(self):
+    def native_unit_of_measurement(self):
         return self._unit
 
     def _get_sessions(self) -> list:
@@ -394,11 +583,12 @@ class EVConduitChargingHistorySensor(CoordinatorEntity, SensorEntity):
 
     def _get_30_day_sessions(self) -> list:
         sessions = self._get_sessions()
-        cutoff = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+        # Same fixed-width UTC form as the stored start times
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat(timespec="microseconds")
         return [s for s in sessions if (s.get("start_time") or "") >= cutoff]
 
     @property
-    def state(self):
+    def native_value(self):
         if self._field == "last_charge_energy":
             s = self._get_last_session()
             if not s:
@@ -423,7 +613,7 @@ class EVConduitChargingHistorySensor(CoordinatorEntity, SensorEntity):
             s = self._get_last_session()
             if not s:
                 return None
-            return s.get("start_time")
+            return _parse_timestamp(s.get("start_time"))
 
         if self._field == "last_charge_duration":
             s = self._get_last_session()
@@ -510,3 +700,277 @@ class EVConduitChargingHistorySensor(CoordinatorEntity, SensorEntity):
             return round((et - st).total_seconds() / 60, 1)
         except (ValueError, TypeError):
             return None
+
+
+class EVConduitChargingAnalyticsSensor(EVConduitCoordinatorEntity, SensorEntity):
+    """Consumption, cost per km and charging loss from the charging analytics."""
+
+    def __init__(self, coordinator, analytics, entry, field, name, unit, vehicle_coordinator=None):
+        super().__init__(coordinator)
+        self._analytics = analytics
+        self._entry = entry
+        self._field = field
+        self._name = name
+        self._unit = unit
+        self._vehicle_coordinator = vehicle_coordinator
+        _apply_sensor_classes(self, field)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        vdata = self._vehicle_coordinator.data if self._vehicle_coordinator else None
+        return _build_device_info(self._entry, vdata)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def icon(self):
+        return ICONS.get(self._field)
+
+    @property
+    def unique_id(self):
+        return f"{DOMAIN}-{self._entry.entry_id}-ch-{self._field}"
+
+    @property
+    def native_unit_of_measurement(self):
+        if self._field == "charging_cost_per_km":
+            currency = self._analytics.currency
+            return f"{currency}/km" if currency else None
+        return self._unit
+
+    def _capacity(self) -> float | None:
+        vdata = self._vehicle_coordinator.data if self._vehicle_coordinator else None
+        return ((vdata or {}).get("chargeState") or {}).get("batteryCapacity")
+
+    @property
+    def native_value(self):
+        if self._field == "charging_consumption":
+            return self._analytics.consumption_kwh_100km
+        if self._field == "charging_cost_per_km":
+            return self._analytics.cost_per_km
+        if self._field == "charging_loss":
+            return self._analytics.charging_loss_pct(self._capacity())
+        return None
+
+    @property
+    def extra_state_attributes(self):
+        a = self._analytics
+        if self._field == "charging_consumption":
+            return {"distance_km": round(a.distance_km, 1), "energy_kwh": round(a.distance_energy_kwh, 2)}
+        if self._field == "charging_loss":
+            return {"energy_added_kwh": round(a.soc_energy_kwh, 2), "soc_gain_pct": a.soc_gain_pct}
+        return {}
+
+
+class EVConduitTripSensor(EVConduitCoordinatorEntity, SensorEntity):
+    """Sensor for the last finished trip in the trip log."""
+
+    def __init__(self, coordinator, entry, field, name, unit, vehicle_coordinator=None):
+        super().__init__(coordinator)
+        self._entry = entry
+        self._field = field
+        self._name = name
+        self._unit = unit
+        self._vehicle_coordinator = vehicle_coordinator
+        _apply_sensor_classes(self, field)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        vdata = self._vehicle_coordinator.data if self._vehicle_coordinator else None
+        return _build_device_info(self._entry, vdata)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def icon(self):
+        return ICONS.get(self._field)
+
+    @property
+    def unique_id(self):
+        return f"{DOMAIN}-{self._entry.entry_id}-trip-{self._field}"
+
+    @property
+    def native_unit_of_measurement(self):
+        return self._unit
+
+    @property
+    def native_value(self):
+        trip = self.coordinator.data.last_trip if self.coordinator.data else None
+        if not trip:
+            return None
+        if self._field == "last_trip_distance":
+            return trip["distance_km"]
+        if self._field == "last_trip_energy":
+            return trip["energy_kwh"]
+        if self._field == "last_trip_efficiency":
+            return trip["efficiency_wh_km"]
+        if self._field == "last_trip_average_speed":
+            return trip["avg_speed_kmh"]
+        if self._field == "last_trip_duration":
+            start = _parse_timestamp(trip["start"])
+            end = _parse_timestamp(trip["end"])
+            return round((end - start).total_seconds() / 60) if start and end else None
+        if self._field == "last_trip_end":
+            return _parse_timestamp(trip["end"])
+        return None
+
+    @property
+    def extra_state_attributes(self):
+        if self._field != "last_trip_distance" or not self.coordinator.data:
+            return {}
+        trip = self.coordinator.data.last_trip or {}
+        return {
+            "start": trip.get("start"),
+            "soc_start": trip.get("soc_start"),
+            "soc_end": trip.get("soc_end"),
+            "total_trips": len(self.coordinator.data.trips),
+        }
+
+
+class EVConduitPerformanceSensor(SensorEntity):
+    """Diagnostic sensor reporting the integration's own performance metrics.
+
+    Metrics change with every request, so instead of being polled the state
+    is refreshed every PERFORMANCE_SENSOR_INTERVAL seconds, and only written
+    when the value or attributes changed.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+    # Metric breakdowns for the UI; the recorder keeps the state only
+    _unrecorded_attributes = frozenset({
+        "endpoints", "errors", "pushes", "handling_ms", "merge_ms",
+        "entity_writes", "vehicle_updates", "send_ms", "failed", "dropped",
+        "sync_ms", "pages", "confirm_ms", "sent", "timed_out", "superseded",
+        "deduplicated", "success_rate",
+    })
+
+    def __init__(self, metrics, entry, field, name, unit, vehicle_coordinator=None):
+        self._metrics = metrics
+        self._entry = entry
+        self._field = field
+        self._name = name
+        self._unit = unit
+        self._vehicle_coordinator = vehicle_coordinator
+        self._written = None
+        _apply_sensor_classes(self, field)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._written = (self.native_value, self.extra_state_attributes)
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_refresh, timedelta(seconds=PERFORMANCE_SENSOR_INTERVAL)
+            )
+        )
+
+    @callback
+    def _async_refresh(self, _now) -> None:
+        snapshot = (self.native_value, self.extra_state_attributes)
+        if snapshot == self._written:
+            return
+        self._written = snapshot
+        self.async_write_ha_state()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        vdata = self._vehicle_coordinator.data if self._vehicle_coordinator else None
+        return _build_device_info(self._entry, vdata)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def icon(self):
+        return ICONS.get(self._field)
+
+    @property
+    def unique_id(self):
+        return f"{DOMAIN}-{self._entry.entry_id}-perf-{self._field}"
+
+    @property
+    def native_unit_of_measurement(self):
+        return self._unit
+
+    def _avg(self, name: str) -> float | None:
+        hist = self._metrics.histogram(name)
+        return hist["avg"] if hist else None
+
+    @property
+    def native_value(self):
+        m = self._metrics
+        if self._field == "request_latency":
+            hists = [h for n, h in m.histograms.items() if n.startswith("request.")]
+            count = sum(h.count for h in hists)
+            return round(sum(h.total for h in hists) / count, 1) if count else None
+
+        if self._field == "rate_limited":
+            return m.counters["rate_limited"]
+
+        if self._field == "webhook_rate":
+            return m.rate_per_hour("webhook_pushes")
+
+        if self._field == "entity_writes_per_update":
+            updates = m.counters["vehicle_updates"]
+            return round(m.counters["entity_writes"] / updates, 1) if updates else None
+
+        if self._field == "abrp_latency":
+            return self._avg("abrp.send")
+
+        if self._field == "history_sync_duration":
+            return self._avg("history.sync")
+
+        if self._field == "command_latency":
+            return self._avg("command.confirm")
+
+        return None
+
+    @property
+    def extra_state_attributes(self):
+        m = self._metrics
+        if self._field == "request_latency":
+            return {
+                "endpoints": m.histograms_with_prefix("request."),
+                "errors": m.counters["request_errors"],
+            }
+        if self._field == "webhook_rate":
+            return {
+                "pushes": m.counters["webhook_pushes"],
+                "handling_ms": m.histogram("webhook.handling"),
+                "merge_ms": m.histogram("webhook.merge"),
+            }
+        if self._field == "entity_writes_per_update":
+            return {
+                "entity_writes": m.counters["entity_writes"],
+                "vehicle_updates": m.counters["vehicle_updates"],
+            }
+        if self._field == "abrp_latency":
+            return {
+                "send_ms": m.histogram("abrp.send"),
+                "failed": m.counters["abrp_failed"],
+                "dropped": m.counters["abrp_dropped"],
+            }
+        if self._field == "history_sync_duration":
+            return {
+                "sync_ms": m.histogram("history.sync"),
+                "pages": m.histogram("history.pages"),
+                "merge_ms": m.histogram("history.merge"),
+                "failed": m.counters["history_sync_failed"],
+            }
+        if self._field == "command_latency":
+            confirmed = m.counters["command_confirmed"]
+            finished = confirmed + m.counters["command_failed"] + m.counters["command_timeout"]
+            return {
+                "confirm_ms": m.histogram("command.confirm"),
+                "sent": m.counters["command_sent"],
+                "failed": m.counters["command_failed"],
+                "timed_out": m.counters["command_timeout"],
+                "superseded": m.counters["command_superseded"],
+                "deduplicated": m.counters["command_deduplicated"],
+                "success_rate": round(confirmed / finished * 100, 1) if finished else None,
+            }
+        return {}
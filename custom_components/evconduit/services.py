@@ -0,0 +1,363 @@
+# custom_components/evconduit/services.py
+
+"""Domain-wide services, dispatched to config entries by vehicle_id."""
+
+import logging
+import os
+
+import voluptuous as vol
+
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN, CONF_VEHICLE_ID, TRIPS_MAX_STORED
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICES = (
+    "set_charging", "update_odometer", "send_abrp_telemetry", "sync_charging_history",
+    "get_trips", "get_charging_stats", "query_charging_sessions",
+    "export_charging_history", "import_charging_history",
+)
+
+# Default directory (under the config dir) for charging history exports
+EXPORT_DIR = "evconduit_exports"
+
+
+def async_setup_services(hass) -> None:
+    """Register the global services once for the domain."""
+    if not hass.services.has_service(DOMAIN, "set_charging"):
+        schema = vol.Schema({
+            vol.Required("action"): vol.In(["START", "STOP"]),
+            vol.Optional("vehicle_id"): str,
+        })
+
+        async def _handle_charging(call):
+            action = call.data["action"]
+            target_vehicle = call.data.get("vehicle_id")
+            _LOGGER.debug("Service set_charging called with action=%s vehicle_id=%s", action, target_vehicle)
+
+            # Find matching command pipeline(s); the vehicle's confirmation
+            # is tracked in the background
+            domain_data = hass.data.get(DOMAIN, {})
+            clients_used = 0
+            for e in hass.config_entries.async_entries(DOMAIN):
+                if target_vehicle and e.data.get(CONF_VEHICLE_ID) != target_vehicle:
+                    continue
+                commands = domain_data.get(f"{e.entry_id}_commands")
+                if not commands:
+                    continue
+                try:
+                    result = await commands.async_send(action)
+                    if result:
+                        _LOGGER.info("Charging %s accepted for vehicle %s", action, e.data.get(CONF_VEHICLE_ID))
+                    else:
+                        _LOGGER.error("Charging %s failed for vehicle %s", action, e.data.get(CONF_VEHICLE_ID))
+                except Exception:
+                    _LOGGER.exception("Error in set_charging service for vehicle %s", e.data.get(CONF_VEHICLE_ID))
+                clients_used += 1
+                if target_vehicle:
+                    break
+
+            if clients_used == 0:
+                _LOGGER.error("No matching vehicle found for set_charging (vehicle_id=%s)", target_vehicle)
+
+        hass.services.async_register(DOMAIN, "set_charging", _handle_charging, schema=schema)
+        _LOGGER.debug("Service set_charging registered (global)")
+
+    if not hass.services.has_service(DOMAIN, "update_odometer"):
+        odometer_schema = vol.Schema({
+            vol.Optional("odometer_entity"): str,
+            vol.Optional("odometer_km"): vol.Coerce(float),
+            vol.Optional("vehicle_id"): str,
+        })
+
+        async def _handle_odometer(call):
+            odo_entity = call.data.get("odometer_entity")
+            odometer_km = call.data.get("odometer_km")
+            target_vehicle = call.data.get("vehicle_id")
+
+            if odo_entity:
+                state = hass.states.get(odo_entity)
+                if state is None:
+                    _LOGGER.error("Entity %s not found", odo_entity)
+                    return
+                try:
+                    odometer_km = float(state.state)
+                except (ValueError, TypeError):
+                    _LOGGER.error("Entity %s has invalid state: %s", odo_entity, state.state)
+                    return
+
+            if odometer_km is None:
+                _LOGGER.error("No odometer value provided (use odometer_entity or odometer_km)")
+                return
+
+            domain_data = hass.data.get(DOMAIN, {})
+            for e in hass.config_entries.async_entries(DOMAIN):
+                if target_vehicle and e.data.get(CONF_VEHICLE_ID) != target_vehicle:
+                    continue
+                c = domain_data.get(f"{e.entry_id}_client")
+                if not c:
+                    continue
+                try:
+                    result = await c.async_update_odometer(odometer_km)
+                    if result:
+                        _LOGGER.info("Odometer updated to %s km for vehicle %s", odometer_km, e.data.get(CONF_VEHICLE_ID))
+                    else:
+                        _LOGGER.warning("Odometer update failed for vehicle %s", e.data.get(CONF_VEHICLE_ID))
+                except Exception:
+                    _LOGGER.exception("Error in update_odometer service")
+                if target_vehicle:
+                    break
+
+        hass.services.async_register(DOMAIN, "update_odometer", _handle_odometer, schema=odometer_schema)
+        _LOGGER.debug("Service update_odometer registered (global)")
+
+    if not hass.services.has_service(DOMAIN, "send_abrp_telemetry"):
+        async def _handle_send_abrp(call):
+            """Force send current vehicle telemetry to ABRP."""
+            target_vehicle = call.data.get("vehicle_id") if call.data else None
+            domain_data = hass.data.get(DOMAIN, {})
+            for e in hass.config_entries.async_entries(DOMAIN):
+                if target_vehicle and e.data.get(CONF_VEHICLE_ID) != target_vehicle:
+                    continue
+                abrp = domain_data.get(f"{e.entry_id}_abrp")
+                if not abrp:
+                    continue
+                vcoord = domain_data.get(f"{e.entry_id}_vehicle")
+                if not vcoord or not vcoord.data:
+                    _LOGGER.warning("No vehicle data for ABRP telemetry (vehicle %s)", e.data.get(CONF_VEHICLE_ID))
+                    continue
+                abrp.enqueue(vcoord.data)
+                _LOGGER.info("ABRP telemetry queued for vehicle %s", e.data.get(CONF_VEHICLE_ID))
+                if target_vehicle:
+                    break
+
+        abrp_schema = vol.Schema({vol.Optional("vehicle_id"): str})
+        hass.services.async_register(DOMAIN, "send_abrp_telemetry", _handle_send_abrp, schema=abrp_schema)
+        _LOGGER.debug("Service send_abrp_telemetry registered (global)")
+
+    if not hass.services.has_service(DOMAIN, "sync_charging_history"):
+        async def _handle_sync_charging_history(call):
+            """Trigger an immediate incremental charging history sync."""
+            target_vehicle = call.data.get("vehicle_id") if call.data else None
+            domain_data = hass.data.get(DOMAIN, {})
+            for e in hass.config_entries.async_entries(DOMAIN):
+                if target_vehicle and e.data.get(CONF_VEHICLE_ID) != target_vehicle:
+                    continue
+                sync_fn = domain_data.get(f"{e.entry_id}_ch_sync")
+                if not sync_fn:
+                    _LOGGER.debug("No charging history sync configured for entry %s", e.entry_id)
+                    continue
+                try:
+                    await sync_fn(force=True)
+                    _LOGGER.info("Charging history sync triggered for vehicle %s", e.data.get(CONF_VEHICLE_ID))
+                except Exception:
+                    _LOGGER.exception("Error in sync_charging_history for vehicle %s", e.data.get(CONF_VEHICLE_ID))
+                if target_vehicle:
+                    break
+
+        sync_schema = vol.Schema({vol.Optional("vehicle_id"): str})
+        hass.services.async_register(DOMAIN, "sync_charging_history", _handle_sync_charging_history, schema=sync_schema)
+        _LOGGER.debug("Service sync_charging_history registered (global)")
+
+    if not hass.services.has_service(DOMAIN, "get_trips"):
+        async def _handle_get_trips(call):
+            """Return finished trips from the on-device trip log, newest first."""
+            target_vehicle = call.data.get("vehicle_id")
+            since = call.data.get("since")
+            since_iso = dt_util.as_utc(since).isoformat() if since else None
+            domain_data = hass.data.get(DOMAIN, {})
+            vehicles = {}
+            for e in hass.config_entries.async_entries(DOMAIN):
+                if target_vehicle and e.data.get(CONF_VEHICLE_ID) != target_vehicle:
+                    continue
+                trip_log = domain_data.get(f"{e.entry_id}_trips")
+                if not trip_log:
+                    continue
+                vehicles[e.data.get(CONF_VEHICLE_ID)] = trip_log.query(since_iso, call.data["limit"])
+                if target_vehicle:
+                    break
+            return {"vehicles": vehicles}
+
+        trips_schema = vol.Schema({
+            vol.Optional("vehicle_id"): str,
+            vol.Optional("since"): cv.datetime,
+            vol.Optional("limit", default=50): vol.All(vol.Coerce(int), vol.Range(min=1, max=TRIPS_MAX_STORED)),
+        })
+        hass.services.async_register(
+            DOMAIN, "get_trips", _handle_get_trips,
+            schema=trips_schema, supports_response=SupportsResponse.ONLY,
+        )
+        _LOGGER.debug("Service get_trips registered (global)")
+
+    if not hass.services.has_service(DOMAIN, "get_charging_stats"):
+        async def _handle_get_charging_stats(call):
+            """Return consumption, cost and per-location statistics from the charging history."""
+            target_vehicle = call.data.get("vehicle_id")
+            domain_data = hass.data.get(DOMAIN, {})
+            vehicles = {}
+            for e in hass.config_entries.async_entries(DOMAIN):
+                if target_vehicle and e.data.get(CONF_VEHICLE_ID) != target_vehicle:
+                    continue
+                history = domain_data.get(f"{e.entry_id}_ch_store")
+                if not history:
+                    continue
+                vcoord = domain_data.get(f"{e.entry_id}_vehicle")
+                vdata = (vcoord.data if vcoord else None) or {}
+                capacity = (vdata.get("chargeState") or {}).get("batteryCapacity")
+                vehicles[e.data.get(CONF_VEHICLE_ID)] = history.analytics.as_dict(capacity)
+                if target_vehicle:
+                    break
+            return {"vehicles": vehicles}
+
+        stats_schema = vol.Schema({vol.Optional("vehicle_id"): str})
+        hass.services.async_register(
+            DOMAIN, "get_charging_stats", _handle_get_charging_stats,
+            schema=stats_schema, supports_response=SupportsResponse.ONLY,
+        )
+        _LOGGER.debug("Service get_charging_stats registered (global)")
+
+    if not hass.services.has_service(DOMAIN, "query_charging_sessions"):
+        async def _handle_query_charging_sessions(call):
+            """Return a filtered page of stored charging sessions, newest first."""
+            from .charging_history import utc_key
+
+            target_vehicle = call.data.get("vehicle_id")
+            start = call.data.get("start")
+            end = call.data.get("end")
+            filters = {
+                # Naive times are local; bounds use the stored start_time format
+                "start": utc_key(dt_util.as_utc(start)) if start else None,
+                "end": utc_key(dt_util.as_utc(end)) if end else None,
+                "location": call.data.get("location"),
+                "currency": call.data.get("currency"),
+                "min_energy": call.data.get("min_energy"),
+                "limit": call.data["limit"],
+                "offset": call.data["offset"],
+            }
+            domain_data = hass.data.get(DOMAIN, {})
+            vehicles = {}
+            for e in hass.config_entries.async_entries(DOMAIN):
+                if target_vehicle and e.data.get(CONF_VEHICLE_ID) != target_vehicle:
+                    continue
+                history = domain_data.get(f"{e.entry_id}_ch_store")
+                if not history:
+                    continue
+                vehicles[e.data.get(CONF_VEHICLE_ID)] = history.query(**filters)
+                if target_vehicle:
+                    break
+            return {"vehicles": vehicles}
+
+        query_schema = vol.Schema({
+            vol.Optional("vehicle_id"): str,
+            vol.Optional("start"): cv.datetime,
+            vol.Optional("end"): cv.datetime,
+            vol.Optional("location"): str,
+            vol.Optional("currency"): str,
+            vol.Optional("min_energy"): vol.Coerce(float),
+            vol.Optional("limit", default=50): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
+            vol.Optional("offset", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        })
+        hass.services.async_register(
+            DOMAIN, "query_charging_sessions", _handle_query_charging_sessions,
+            schema=query_schema, supports_response=SupportsResponse.ONLY,
+        )
+        _LOGGER.debug("Service query_charging_sessions registered (global)")
+
+    if not hass.services.has_service(DOMAIN, "export_charging_history"):
+        async def _handle_export_charging_history(call):
+            """Write the stored charging sessions to a CSV, packed or parquet file per vehicle."""
+            from .history_export import FORMAT_EXTENSIONS, ExportError, async_export_history, parquet_available
+
+            target_vehicle = call.data.get("vehicle_id")
+            fmt = call.data["format"]
+            if fmt == "parquet" and not parquet_available():
+                raise ServiceValidationError("The parquet format needs the pyarrow package; use csv or packed")
+            directory = call.data.get("directory")
+            if directory:
+                directory = hass.config.path(directory)
+                if not hass.config.is_allowed_path(directory):
+                    raise ServiceValidationError(f"Export directory {directory} is not in allowlist_external_dirs")
+            else:
+                directory = hass.config.path(EXPORT_DIR)
+
+            domain_data = hass.data.get(DOMAIN, {})
+            vehicles = {}
+            for e in hass.config_entries.async_entries(DOMAIN):
+                vehicle_id = e.data.get(CONF_VEHICLE_ID)
+                if target_vehicle and vehicle_id != target_vehicle:
+                    continue
+                history = domain_data.get(f"{e.entry_id}_ch_store")
+                if not history:
+                    continue
+                path = os.path.join(directory, f"charging_sessions_{slugify(vehicle_id)}.{FORMAT_EXTENSIONS[fmt]}")
+                try:
+                    count = await async_export_history(hass, history, path, fmt)
+                except ExportError as err:
+                    raise HomeAssistantError(str(err)) from err
+                vehicles[vehicle_id] = {"path": path, "sessions": count}
+                if target_vehicle:
+                    break
+            return {"vehicles": vehicles}
+
+        export_schema = vol.Schema({
+            vol.Optional("vehicle_id"): str,
+            vol.Optional("format", default="csv"): vol.In(["csv", "packed", "parquet"]),
+            vol.Optional("directory"): str,
+        })
+        hass.services.async_register(
+            DOMAIN, "export_charging_history", _handle_export_charging_history,
+            schema=export_schema, supports_response=SupportsResponse.OPTIONAL,
+        )
+        _LOGGER.debug("Service export_charging_history registered (global)")
+
+    if not hass.services.has_service(DOMAIN, "import_charging_history"):
+        async def _handle_import_charging_history(call):
+            """Merge a previously exported charging history file into a vehicle's store."""
+            from .history_export import ExportError, async_import_history, format_from_path
+
+            target_vehicle = call.data.get("vehicle_id")
+            path = os.path.realpath(hass.config.path(call.data["path"]))
+            if not path.startswith(os.path.realpath(hass.config.path(EXPORT_DIR)) + os.sep) and not hass.config.is_allowed_path(path):
+                raise ServiceValidationError(f"Import file {path} is not in allowlist_external_dirs")
+            fmt = format_from_path(path)
+            if fmt is None:
+                raise ServiceValidationError(f"Unknown export file type: {path} (expected .csv, .evch or .parquet)")
+
+            domain_data = hass.data.get(DOMAIN, {})
+            targets = [
+                e for e in hass.config_entries.async_entries(DOMAIN)
+                if (not target_vehicle or e.data.get(CONF_VEHICLE_ID) == target_vehicle)
+                and domain_data.get(f"{e.entry_id}_ch_store")
+            ]
+            if not targets:
+                raise ServiceValidationError("No vehicle with charging history enabled matches vehicle_id")
+            if len(targets) > 1:
+                raise ServiceValidationError("Several vehicles have charging history; set vehicle_id")
+            entry = targets[0]
+            try:
+                result = await async_import_history(hass, domain_data[f"{entry.entry_id}_ch_store"], path, fmt)
+            except ExportError as err:
+                raise HomeAssistantError(str(err)) from err
+            return {"vehicles": {entry.data.get(CONF_VEHICLE_ID): result}}
+
+        import_schema = vol.Schema({
+            vol.Optional("vehicle_id"): str,
+            vol.Required("path"): str,
+        })
+        hass.services.async_register(
+            DOMAIN, "import_charging_history", _handle_import_charging_history,
+            schema=import_schema, supports_response=SupportsResponse.OPTIONAL,
+        )
+        _LOGGER.debug("Service import_charging_history registered (global)")
+
+
+def async_unload_services(hass) -> None:
+    """Remove the global services (called when the last entry is unloaded)."""
+    for svc in SERVICES:
+        if hass.services.has_service(DOMAIN, svc):
+            hass.services.async_remove(DOMAIN, svc)
+    _LOGGER.debug("All services removed (last entry unloaded)")
@@ -0,0 +1,214 @@
+# custom_components/evconduit/statistics.py
+
+"""Charging history imported into Home Assistant long-term statistics.
+
+Sessions are bucketed by the hour they started in and written as external
+statistics (``evconduit:<vehicle>_charge_energy`` and friends), so the
+energy dashboard and statistics cards can show hourly, daily and monthly
+totals without the history living in state attributes.
+
+Imports are incremental: on start the last row of each statistic is read
+back from the recorder, and every import continues the running sums from
+the last written rows, so only the newly merged sessions are iterated.
+Sessions older than the last imported hour (a backfill) rebuild the sums
+from the sessions before them instead.
+"""
+
+import logging
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics, get_last_statistics, list_statistic_ids,
+)
+from homeassistant.core import callback
+from homeassistant.util import slugify
+
+from .charging_history import utc_key
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _start_time(session: dict) -> str:
+    return session.get("start_time") or ""
+
+
+def _hour(value: str) -> datetime | None:
+    try:
+        start = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    return start.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+class ChargingStatistics:
+    """Writes a ChargingHistory's sessions as hourly external statistics.
+
+    One statistic is kept for energy (kWh), one for the session count and
+    one for cost per currency, each with a running ``sum``.
+    """
+
+    def __init__(self, hass, history, vehicle_id: str, name: str):
+        self.hass = hass
+        self._history = history
+        self._name = name
+        self._prefix = f"{DOMAIN}:{slugify(vehicle_id)}"
+        self.imported_until: datetime | None = None
+        # Last written (hour, state, sum) per statistic id
+        self._tails: dict[str, tuple[datetime, float, float]] = {}
+        # Currency of each cost statistic id
+        self._currencies: dict[str, str] = {}
+
+    @property
+    def energy_id(self) -> str:
+        return f"{self._prefix}_charge_energy"
+
+    @property
+    def count_id(self) -> str:
+        return f"{self._prefix}_charge_count"
+
+    def cost_id(self, currency: str) -> str:
+        return f"{self._prefix}_charge_cost_{slugify(currency)}"
+
+    async def async_start(self) -> None:
+        """Import everything after the last hour the recorder already has."""
+        instance = get_instance(self.hass)
+        cost_prefix = f"{self._prefix}_charge_cost_"
+        for meta in await instance.async_add_executor_job(list_statistic_ids, self.hass, None, "sum"):
+            if meta["statistic_id"].startswith(cost_prefix) and meta.get("unit_of_measurement"):
+                self._currencies.setdefault(meta["statistic_id"], meta["unit_of_measurement"])
+        for statistic_id in (self.energy_id, self.count_id, *self._currencies):
+            last = await instance.async_add_executor_job(
+                get_last_statistics, self.hass, 1, statistic_id, False, {"state", "sum"}
+            )
+            rows = last.get(statistic_id)
+            if rows:
+                # An import that ran in the meantime has newer values
+                self._tails.setdefault(statistic_id, (
+                    datetime.fromtimestamp(rows[0]["start"], timezone.utc),
+                    rows[0].get("state") or 0,
+                    rows[0].get("sum") or 0,
+                ))
+        tail = self._tails.get(self.energy_id)
+        if tail:
+            # Re-import the last hour: it may have gained sessions since
+            self.imported_until = tail[0]
+            self.async_import(self.imported_until.isoformat())
+        else:
+            self.async_import(None)
+
+    def _sum_before(self, statistic_id: str, hour: datetime) -> float:
+        """Running sum of a statistic before `hour`, from its last written row."""
+        tail = self._tails.get(statistic_id)
+        if tail is None:
+            return 0
+        start, state, total = tail
+        return total - state if start == hour else total
+
+    @callback
+    def async_import(self, since: str | None) -> None:
+        """Write the hourly buckets from the hour of `since` onwards (None = all)."""
+        sessions = self._history.sessions
+        first_hour = _hour(since) if since else None
+        tail = self._tails.get(self.energy_id)
+        if first_hour is None or tail is None:
+            # Nothing imported yet: everything
+            first_hour = None
+            index = 0
+        else:
+            # Stored start times are in utc_key form; compare like with like
+            index = bisect_left(sessions, utc_key(first_hour), key=_start_time)
+
+        # Running sums (cost per statistic id) up to the first rewritten hour
+        energy_sum = 0.0
+        count_sum = 0
+        cost_sums: dict[str, float] = defaultdict(float)
+        if first_hour is not None and tail[0] <= first_hour:
+            energy_sum = self._sum_before(self.energy_id, first_hour)
+            count_sum = self._sum_before(self.count_id, first_hour)
+            for statistic_id in self._currencies:
+                cost_sums[statistic_id] = self._sum_before(statistic_id, first_hour)
+        else:
+            for session in sessions[:index]:
+                energy_sum += session.get("energy_added_kwh") or 0
+                count_sum += 1
+                if session.get("currency"):
+                    cost_sums[self._cost_id_for(session["currency"])] += session.get("total_cost") or 0
+
+        # Per-hour totals from there on (sessions are sorted by start_time)
+        energy_rows: list[StatisticData] = []
+        count_rows: list[StatisticData] = []
+        cost_rows: dict[str, list[StatisticData]] = defaultdict(list)
+        hour = None
+        hour_energy = hour_count = 0
+        hour_costs: dict[str, float] = defaultdict(float)
+
+        def flush() -> None:
+            energy_rows.append(StatisticData(start=hour, state=round(hour_energy, 3), sum=round(energy_sum, 3)))
+            count_rows.append(StatisticData(start=hour, state=hour_count, sum=count_sum))
+            self._tails[self.energy_id] = (hour, hour_energy, energy_sum)
+            self._tails[self.count_id] = (hour, hour_count, count_sum)
+            for statistic_id, total in cost_sums.items():
+                cost_rows[statistic_id].append(
+                    StatisticData(start=hour, state=round(hour_costs[statistic_id], 2), sum=round(total, 2))
+                )
+                self._tails[statistic_id] = (hour, hour_costs[statistic_id], total)
+
+        for session in sessions[index:]:
+            session_hour = _hour(_start_time(session))
+            if session_hour is None:
+                continue
+            if session_hour != hour:
+                if hour is not None:
+                    flush()
+                hour = session_hour
+                hour_energy = hour_count = 0
+                hour_costs.clear()
+            energy = session.get("energy_added_kwh") or 0
+            energy_sum += energy
+            hour_energy += energy
+            count_sum += 1
+            hour_count += 1
+            currency = session.get("currency")
+            if currency:
+                statistic_id = self._cost_id_for(currency)
+                cost = session.get("total_cost") or 0
+                cost_sums[statistic_id] += cost
+                hour_costs[statistic_id] += cost
+        if hour is None:
+            return
+        flush()
+
+        async_add_external_statistics(self.hass, self._metadata(self.energy_id, "Charge Energy", "kWh"), energy_rows)
+        async_add_external_statistics(self.hass, self._metadata(self.count_id, "Charge Count", None), count_rows)
+        for statistic_id, rows in cost_rows.items():
+            currency = self._currencies[statistic_id]
+            async_add_external_statistics(
+                self.hass, self._metadata(statistic_id, f"Charge Cost {currency}", currency), rows
+            )
+        self.imported_until = hour
+        _LOGGER.debug(
+            "Imported %d hours of charging statistics for %s (from %s)",
+            len(energy_rows), self._prefix, first_hour or "start",
+        )
+
+    def _cost_id_for(self, currency: str) -> str:
+        statistic_id = self.cost_id(currency)
+        self._currencies.setdefault(statistic_id, currency)
+        return statistic_id
+
+    def _metadata(self, statistic_id: str, label: str, unit: str | None) -> StatisticMetaData:
+        return StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{self._name} {label}",
+            source=DOMAIN,
+            statistic_id=statistic_id,
+            unit_of_measurement=unit,
+        )
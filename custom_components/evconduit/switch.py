@@ -0,0 +1,90 @@
+# custom_components/evconduit/switch.py
+
+import logging
+
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity import DeviceInfo
+
+from .const import DOMAIN, ICONS
+from .sensor import EVConduitCoordinatorEntity, _build_device_info
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up the EVConduit charging switch."""
+    vehicle_coordinator = hass.data[DOMAIN].get(f"{entry.entry_id}_vehicle")
+    commands = hass.data[DOMAIN].get(f"{entry.entry_id}_commands")
+
+    if vehicle_coordinator is None or commands is None:
+        _LOGGER.error("Vehicle coordinator not found for charging switch")
+        return
+
+    async_add_entities([EVConduitChargingSwitch(vehicle_coordinator, entry, commands)])
+
+
+class EVConduitChargingSwitch(EVConduitCoordinatorEntity, SwitchEntity):
+    """Start and stop charging through the entry's command pipeline.
+
+    The state is ``chargeState.isCharging``, which the pipeline sets
+    optimistically when a command is sent; ``pending_command`` shows the
+    command until the vehicle confirms it. State is only written when the
+    charging state, the pending command or availability change.
+    """
+
+    def __init__(self, coordinator, entry, commands):
+        super().__init__(coordinator)
+        self._entry = entry
+        self._commands = commands
+        self._written = None
+
+    def _state_key(self):
+        return (self.available, self.is_on, self._commands.pending_action)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        key = self._state_key()
+        if key != self._written:
+            self._written = key
+            super()._handle_coordinator_update()
+
+    async def async_added_to_hass(self) -> None:
+        self._written = self._state_key()
+        await super().async_added_to_hass()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return _build_device_info(self._entry, self.coordinator.data)
+
+    @property
+    def name(self):
+        return "Charging"
+
+    @property
+    def icon(self):
+        return ICONS.get("charging_switch")
+
+    @property
+    def unique_id(self):
+        return f"{DOMAIN}-{self._entry.entry_id}-charging"
+
+    @property
+    def is_on(self) -> bool | None:
+        charge_state = (self.coordinator.data or {}).get("chargeState") or {}
+        return charge_state.get("isCharging")
+
+    @property
+    def extra_state_attributes(self):
+        return {"pending_command": self._commands.pending_action}
+
+    async def async_turn_on(self, **kwargs) -> None:
+        await self._async_send("START")
+
+    async def async_turn_off(self, **kwargs) -> None:
+        await self._async_send("STOP")
+
+    async def _async_send(self, action: str) -> None:
+        if not await self._commands.async_send(action):
+            raise HomeAssistantError(f"Charging {action} was not accepted by EVConduit")
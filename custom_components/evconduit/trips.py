@@ -0,0 +1,283 @@
+# custom_components/evconduit/trips.py
+
+"""Trip log built on-device from the vehicle update stream."""
+
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util.location import distance
+
+from .const import (
+    DOMAIN, TRIP_END_IDLE, TRIP_MOVE_THRESHOLD, TRIP_MIN_DISTANCE, TRIPS_MAX_STORED,
+    TRIP_SAVE_DELAY, PENDING_COMMAND_KEY,
+)
+from .features import Feature
+
+_LOGGER = logging.getLogger(__name__)
+
+# Column order of a stored trip row; rows are lists to keep the store small
+TRIP_COLUMNS = (
+    "start", "end", "distance_km", "energy_kwh", "avg_speed_kmh", "efficiency_wh_km",
+    "soc_start", "soc_end", "start_lat", "start_lon", "end_lat", "end_lon",
+)
+
+# Odometer increase (km) between two samples that counts as movement
+_ODOMETER_STEP = 0.1
+
+
+def trip_to_dict(row: list) -> dict:
+    return dict(zip(TRIP_COLUMNS, row))
+
+
+def _iso(ts: float) -> str:
+    # Fixed width, like the charging history's utc_key
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="microseconds")
+
+
+def vehicle_sample(data: dict, now: float) -> dict:
+    """Reduce a vehicle status payload to the values the trip detector uses."""
+    location = data.get("location") or {}
+    charge_state = data.get("chargeState") or {}
+    extra = data.get("abrp_extra") or {}
+    # Trips follow the vehicle's own isCharging, not a pending command's
+    pending = data.get(PENDING_COMMAND_KEY)
+    is_charging = pending.get("isCharging") if pending else charge_state.get("isCharging")
+    return {
+        "t": now,
+        "lat": location.get("latitude"),
+        "lon": location.get("longitude"),
+        "odo": (data.get("odometer") or {}).get("distance") or extra.get("odometer"),
+        "soc": charge_state.get("batteryLevel"),
+        "speed": extra.get("speed"),
+        "parked": extra.get("is_parked"),
+        "charging": bool(is_charging),
+    }
+
+
+def _step_km(a: dict, b: dict) -> float:
+    if None in (a["lat"], a["lon"], b["lat"], b["lon"]):
+        return 0.0
+    return (distance(a["lat"], a["lon"], b["lat"], b["lon"]) or 0.0) / 1000
+
+
+class TripDetector:
+    """Streaming trip segmentation with O(1) work and state per sample.
+
+    A trip starts at the last stationary sample before the vehicle is seen
+    moving (odometer, speed or position) and ends when it is parked, starts
+    charging, or has not moved for TRIP_END_IDLE seconds. Distance comes from
+    the odometer when available, otherwise from the summed GPS steps.
+    """
+
+    def __init__(self, trip: dict | None = None):
+        self.trip = trip
+        self._last: dict | None = None
+
+    @staticmethod
+    def _moved(a: dict, b: dict) -> bool:
+        if b["speed"] and b["parked"] is not True:
+            return True
+        if a["odo"] is not None and b["odo"] is not None and b["odo"] - a["odo"] >= _ODOMETER_STEP:
+            return True
+        return _step_km(a, b) * 1000 >= TRIP_MOVE_THRESHOLD
+
+    def update(self, sample: dict, capacity_kwh: float | None) -> list | None:
+        """Feed one sample; returns a finished trip row, if this sample ended one."""
+        prev, self._last = self._last, sample
+        trip = self.trip
+        if trip is None:
+            if prev is not None and not sample["charging"] and self._moved(prev, sample):
+                # Start at the last known stationary position. A parked car
+                # sends no updates, so an old sample only marks where (not
+                # when) the trip began.
+                start = prev
+                if sample["t"] - prev["t"] > TRIP_END_IDLE:
+                    start = dict(prev, t=sample["t"])
+                self.trip = {"start": start, "last": sample, "gps_km": _step_km(prev, sample)}
+            return None
+
+        if sample["charging"] or sample["parked"] is True:
+            return self.finish(capacity_kwh)
+        if self._moved(trip["last"], sample):
+            trip["gps_km"] += _step_km(trip["last"], sample)
+            trip["last"] = sample
+        elif sample["t"] - trip["last"]["t"] >= TRIP_END_IDLE:
+            return self.finish(capacity_kwh)
+        return None
+
+    def idle(self, now: float) -> bool:
+        """Return True if the trip in progress has not moved for TRIP_END_IDLE."""
+        return self.trip is not None and now - self.trip["last"]["t"] >= TRIP_END_IDLE
+
+    def finish(self, capacity_kwh: float | None) -> list | None:
+        """Close the trip in progress; returns its row, or None if it was too short."""
+        trip, self.trip = self.trip, None
+        if trip is None:
+            return None
+        start, end = trip["start"], trip["last"]
+        if start["odo"] is not None and end["odo"] is not None:
+            km = end["odo"] - start["odo"]
+        else:
+            km = trip["gps_km"]
+        if km < TRIP_MIN_DISTANCE:
+            return None
+
+        hours = (end["t"] - start["t"]) / 3600
+        energy = None
+        if capacity_kwh and start["soc"] is not None and end["soc"] is not None and start["soc"] > end["soc"]:
+            energy = round((start["soc"] - end["soc"]) / 100 * capacity_kwh, 2)
+        return [
+            _iso(start["t"]), _iso(end["t"]),
+            round(km, 1),
+            energy,
+            round(km / hours, 1) if hours > 0 else None,
+            round(energy * 1000 / km) if energy is not None else None,
+            start["soc"], end["soc"],
+            start["lat"], start["lon"], end["lat"], end["lon"],
+        ]
+
+
+class TripLog:
+    """Finished trips for one vehicle, persisted in a Store (newest last).
+
+    At most TRIPS_MAX_STORED trips are kept; the oldest are dropped. The
+    trip in progress is saved too, so a restart does not split a trip.
+    """
+
+    def __init__(self, hass, entry_id: str):
+        self.hass = hass
+        self.store = Store(hass, 1, f"{DOMAIN}.trips.{entry_id}")
+        self.trips: deque = deque(maxlen=TRIPS_MAX_STORED)
+        self.detector = TripDetector()
+
+        async def _trips_update():
+            return self
+
+        self.coordinator = DataUpdateCoordinator(
+            hass, _LOGGER,
+            name=f"{DOMAIN} trips",
+            update_method=_trips_update,
+            update_interval=None,  # Manual updates only
+        )
+
+    @property
+    def last_trip(self) -> dict | None:
+        return trip_to_dict(self.trips[-1]) if self.trips else None
+
+    async def async_load(self) -> None:
+        stored = await self.store.async_load() or {}
+        if stored.get("columns", list(TRIP_COLUMNS)) == list(TRIP_COLUMNS):
+            self.trips.extend(stored.get("trips") or [])
+        self.detector = TripDetector(stored.get("current"))
+        await self.coordinator.async_config_entry_first_refresh()
+
+    async def async_flush(self) -> None:
+        """Write the trips and the trip in progress now (used on unload)."""
+        await self.store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict:
+        return {"columns": list(TRIP_COLUMNS), "trips": list(self.trips), "current": self.detector.trip}
+
+    @callback
+    def async_update(self, sample: dict, capacity_kwh: float | None) -> None:
+        in_trip = self.detector.trip is not None
+        row = self.detector.update(sample, capacity_kwh)
+        if row is not None:
+            self._add(row)
+        elif (self.detector.trip is not None) != in_trip:
+            # A trip started (or a too-short one was dropped)
+            self.store.async_delay_save(self._data_to_save, 10)
+        elif in_trip:
+            # Keep the stored trip in progress current, so a restart resumes it
+            self.store.async_delay_save(self._data_to_save, TRIP_SAVE_DELAY)
+
+    @callback
+    def async_finish(self, capacity_kwh: float | None) -> None:
+        row = self.detector.finish(capacity_kwh)
+        if row is not None:
+            self._add(row)
+        else:
+            self.store.async_delay_save(self._data_to_save, 10)
+
+    def _add(self, row: list) -> None:
+        self.trips.append(row)
+        _LOGGER.debug("Trip recorded: %s", trip_to_dict(row))
+        self.store.async_delay_save(self._data_to_save, 1)
+        self.coordinator.async_set_updated_data(self)
+
+    def query(self, since: str | None = None, limit: int | None = None) -> list[dict]:
+        """Return finished trips newest-first, optionally only those starting at or after `since`."""
+        from .charging_history import utc_key
+
+        # Compare in UTC: `since` may have any offset, older rows another precision
+        since = utc_key(since) if since else None
+        result = []
+        for row in reversed(self.trips):
+            if since and utc_key(row[0]) < since:
+                break
+            result.append(trip_to_dict(row))
+            if limit and len(result) >= limit:
+                break
+        return result
+
+
+class TripFeature(Feature):
+    """Segment the vehicle update stream into trips."""
+
+    name = "trips"
+    watched = (
+        "location", "odometer", "abrp_extra.speed", "abrp_extra.is_parked",
+        "abrp_extra.odometer", "chargeState.isCharging", "chargeState.batteryLevel",
+        PENDING_COMMAND_KEY,
+    )
+
+    def __init__(self, hass, entry, client, coordinator, metrics):
+        super().__init__(hass, entry, client, coordinator, metrics)
+        self.log = TripLog(hass, entry.entry_id)
+        self._unsub_idle = None
+
+    async def async_setup(self) -> None:
+        await self.log.async_load()
+        self.hass.data[DOMAIN][f"{self.entry.entry_id}_trips"] = self.log
+
+    @callback
+    def async_start(self) -> None:
+        if self.coordinator.data:
+            self.async_vehicle_updated(self.coordinator.data, set())
+
+    @callback
+    def async_vehicle_updated(self, data: dict, changed: set[str]) -> None:
+        self.log.async_update(vehicle_sample(data, time.time()), self._capacity(data))
+        self._schedule_idle_check()
+
+    def _capacity(self, data: dict | None) -> float | None:
+        return ((data or {}).get("chargeState") or {}).get("batteryCapacity")
+
+    def _schedule_idle_check(self) -> None:
+        if self._unsub_idle:
+            self._unsub_idle()
+            self._unsub_idle = None
+        if self.log.detector.trip is not None:
+            self._unsub_idle = async_call_later(self.hass, TRIP_END_IDLE, self._async_idle_check)
+
+    @callback
+    def _async_idle_check(self, _now) -> None:
+        self._unsub_idle = None
+        if self.log.detector.idle(time.time()):
+            self.log.async_finish(self._capacity(self.coordinator.data))
+        else:
+            self._schedule_idle_check()
+
+    async def async_unload(self) -> None:
+        if self._unsub_idle:
+            self._unsub_idle()
+            self._unsub_idle = None
+        await self.log.async_flush()
+        self.hass.data[DOMAIN].pop(f"{self.entry.entry_id}_trips", None)
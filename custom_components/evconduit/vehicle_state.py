@@ -0,0 +1,88 @@
+# custom_components/evconduit/vehicle_state.py
+
+"""Persisted last-known vehicle status for fast, backend-independent restarts."""
+
+import logging
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .commands import ChargingCommandPipeline
+from .const import DOMAIN, VEHICLE_STATE_SAVE_DELAY
+from .features import Feature
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VehicleStateCache:
+    """Last good vehicle status payload (including capabilities), kept in a Store.
+
+    Updates are coalesced with a delayed save, so a burst of polls and
+    webhook pushes results in at most one write per save delay. The
+    optimistic state of a pending charging command is never saved: after a
+    restart there is no pipeline left to confirm or roll it back.
+    """
+
+    def __init__(self, hass, entry_id: str):
+        self.store = Store(hass, 1, f"{DOMAIN}.vehicle_state.{entry_id}")
+        self._data: dict | None = None
+        self._source: dict | None = None
+        self._dirty = False
+
+    async def async_load(self) -> dict | None:
+        """Return the stored vehicle status, or None if nothing was saved."""
+        stored = await self.store.async_load()
+        # Stores written before optimistic state was stripped may still carry it
+        self._data = ChargingCommandPipeline.strip((stored or {}).get("vehicle") or None)
+        return self._data
+
+    @callback
+    def async_update(self, vehicle_data: dict | None) -> None:
+        """Schedule a save of the latest non-empty vehicle status."""
+        if not vehicle_data or vehicle_data is self._source or vehicle_data is self._data:
+            return
+        self._source = vehicle_data
+        self._data = ChargingCommandPipeline.strip(vehicle_data)
+        self._dirty = True
+        self.store.async_delay_save(self._data_to_save, VEHICLE_STATE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        self._dirty = False
+        return {"vehicle": self._data}
+
+    async def async_flush(self) -> None:
+        """Write a pending update now (used on unload)."""
+        if self._dirty:
+            await self.store.async_save(self._data_to_save())
+
+
+class VehicleStateFeature(Feature):
+    """Persist every changed vehicle status through a VehicleStateCache."""
+
+    name = "vehicle_state"
+    watched = None
+
+    def __init__(self, hass, entry, client, coordinator, metrics):
+        super().__init__(hass, entry, client, coordinator, metrics)
+        self.cache = VehicleStateCache(hass, entry.entry_id)
+
+    async def async_restore(self) -> dict | None:
+        """Seed the coordinator with the stored status; returns it, or None."""
+        restored = await self.cache.async_load()
+        if restored:
+            _LOGGER.debug("Restored last-known vehicle status for entry %s", self.entry.entry_id)
+            self.client.has_initial_data = True
+            self.coordinator.async_set_updated_data(restored)
+        return restored
+
+    @callback
+    def async_start(self) -> None:
+        self.cache.async_update(self.coordinator.data)
+
+    @callback
+    def async_vehicle_updated(self, data: dict, changed: set[str]) -> None:
+        self.cache.async_update(data)
+
+    async def async_unload(self) -> None:
+        await self.cache.async_flush()
@@ -0,0 +1,361 @@
+"""
+End-to-end scaling benchmark: N vehicles x M stored charging sessions.
+
+For every combination of --entries and --sessions this script:
+
+  1. starts the local backend simulator (scripts/simulator.py) in a
+     subprocess, so its CPU time is not attributed to Home Assistant,
+  2. creates a throw-away Home Assistant config directory with the
+     integration linked into custom_components/, N evconduit config entries
+     pointing at the simulator and M charging sessions pre-stored per entry,
+  3. boots Home Assistant and, once started, unloads and re-sets-up all
+     entries to time async_setup_entry,
+  4. runs --polls refresh rounds over every vehicle coordinator and then
+     --pushes webhook pushes per vehicle,
+
+and reports:
+
+  setup_s        wall time to set up all entries concurrently
+  mem_mb         Python heap growth during setup (tracemalloc)
+  poll_cpu_ms    CPU time per vehicle poll (process time / polls)
+  lag_p95_ms     95th percentile event-loop lag during polls and pushes
+  lag_max_ms     worst event-loop lag
+  writes_per_s   entity state writes per second during polls and pushes
+  store_writes   Store writes (count) during the run
+  store_kb       bytes written by those Store writes
+
+Usage:
+
+  python scripts/benchmark.py --entries 1 10 50 --sessions 0 1000 50000
+  python scripts/benchmark.py --entries 10 --sessions 1000 --json bench.json
+
+Requires the homeassistant package in the current environment.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIMULATOR = os.path.join(REPO_ROOT, "scripts", "simulator.py")
+COMPONENT = os.path.join(REPO_ROOT, "custom_components", "evconduit")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def _write_json(path: str, data: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh)
+
+
+def _make_sessions(count: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    start = now - timedelta(hours=12 * count)
+    sessions = []
+    for i in range(count):
+        st = start + timedelta(hours=12 * i)
+        sessions.append({
+            "session_id": f"bench-{i:08d}",
+            "start_time": st.isoformat(),
+            "end_time": (st + timedelta(hours=2)).isoformat(),
+            "created_at": (st + timedelta(hours=2, minutes=1)).isoformat(),
+            "energy_added_kwh": 20.0 + i % 30,
+            "cost_per_kwh": 1.5,
+            "total_cost": round((20.0 + i % 30) * 1.5, 2),
+            "currency": "SEK",
+            "station_name": ("Home", "Work", None)[i % 3],
+            "location_lat": 59.33,
+            "location_lon": 18.06,
+            "battery_level_start": 20,
+            "battery_level_end": 80,
+        })
+    return sessions
+
+
+def _prepare_config_dir(config_dir: str, entries: int, sessions: int, http_port: int) -> list[str]:
+    """Create configuration.yaml, config entries and session stores."""
+    os.makedirs(os.path.join(config_dir, "custom_components"))
+    os.symlink(COMPONENT, os.path.join(config_dir, "custom_components", "evconduit"))
+    with open(os.path.join(config_dir, "configuration.yaml"), "w", encoding="utf-8") as fh:
+        fh.write(
+            "homeassistant:\n  name: bench\n  latitude: 59.33\n  longitude: 18.06\n"
+            "  elevation: 0\n  unit_system: metric\n  time_zone: UTC\n  currency: SEK\n"
+            f"http:\n  server_host: 127.0.0.1\n  server_port: {http_port}\n"
+            "webhook:\n"
+        )
+
+    stored = _make_sessions(sessions)
+    last_sync = stored[-1]["created_at"] if stored else None
+    entry_ids = []
+    config_entries = []
+    for i in range(entries):
+        entry_id = uuid.uuid4().hex
+        entry_ids.append(entry_id)
+        vehicle_id = f"sim-vehicle-{i:05d}"
+        config_entries.append({
+            "entry_id": entry_id,
+            "version": 1,
+            "minor_version": 1,
+            "domain": "evconduit",
+            "title": vehicle_id,
+            "data": {"api_key": "bench", "environment": "sandbox", "vehicle_id": vehicle_id},
+            "options": {"charging_history": True, "update_interval": 60},
+            "pref_disable_new_entities": False,
+            "pref_disable_polling": False,
+            "source": "user",
+            "unique_id": vehicle_id,
+            "disabled_by": None,
+        })
+        _write_json(
+            os.path.join(config_dir, ".storage", f"evconduit.charging_sessions.{entry_id}"),
+            {
+                "version": 1, "minor_version": 1,
+                "key": f"evconduit.charging_sessions.{entry_id}",
+                "data": {"last_sync": last_sync, "sessions": stored},
+            },
+        )
+    _write_json(
+        os.path.join(config_dir, ".storage", "core.config_entries"),
+        {"version": 1, "minor_version": 1, "key": "core.config_entries", "data": {"entries": config_entries}},
+    )
+    return entry_ids
+
+
+class LoopLagSampler:
+    """Measure how late the event loop wakes a periodic sleeper."""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task = None
+
+    def start(self) -> None:
+        self.samples = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class StoreWriteCounter:
+    """Count Store writes and bytes written by wrapping Store._write_data."""
+
+    def __init__(self):
+        from homeassistant.helpers.storage import Store
+
+        self._store_cls = Store
+        self._original = Store._write_data
+        self.writes = 0
+        self.bytes = 0
+        counter = self
+
+        def _write_data(store, path, data):
+            counter._original(store, path, data)
+            counter.writes += 1
+            try:
+                counter.bytes += os.path.getsize(path)
+            except OSError:
+                pass
+
+        Store._write_data = _write_data
+
+    def reset(self) -> None:
+        self.writes = 0
+        self.bytes = 0
+
+    def restore(self) -> None:
+        self._store_cls._write_data = self._original
+
+
+async def _wait_for_simulator(url: str, timeout: float = 30.0) -> None:
+    import aiohttp
+
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{url}/_sim/stats") as resp:
+                    if resp.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("simulator did not start")
+
+
+async def run_case(entries: int, sessions: int, polls: int, pushes: int, latency: float) -> dict:
+    """Run one N x M benchmark case and return its measurements."""
+    from homeassistant import bootstrap, runner
+    from homeassistant.const import EVENT_STATE_CHANGED
+
+    sim_port, http_port = _free_port(), _free_port()
+    sim_url = f"http://127.0.0.1:{sim_port}"
+    sim = subprocess.Popen(
+        [sys.executable, SIMULATOR, "--port", str(sim_port), "--vehicles", str(entries),
+         "--sessions", str(sessions), "--latency", str(latency)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    config_dir = tempfile.mkdtemp(prefix="evconduit-bench-")
+    hass = None
+    store_counter = None
+    try:
+        await _wait_for_simulator(sim_url)
+        entry_ids = _prepare_config_dir(config_dir, entries, sessions, http_port)
+
+        # Point the sandbox environment at the simulator
+        sys.path.insert(0, config_dir)
+        from custom_components.evconduit import const
+
+        const.ENVIRONMENTS["sandbox"] = sim_url
+
+        hass = await bootstrap.async_setup_hass(
+            runner.RuntimeConfig(config_dir=config_dir, skip_pip=True)
+        )
+        if hass is None:
+            raise RuntimeError("Home Assistant failed to bootstrap")
+        await hass.async_start()
+        await hass.async_block_till_done()
+        store_counter = StoreWriteCounter()
+
+        # Warm modules are loaded now; time a clean setup of every entry
+        for entry_id in entry_ids:
+            await hass.config_entries.async_unload(entry_id)
+        await hass.async_block_till_done()
+        tracemalloc.start()
+        mem_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        await asyncio.gather(*(hass.config_entries.async_setup(eid) for eid in entry_ids))
+        setup_s = time.perf_counter() - start
+        await hass.async_block_till_done()
+        mem_mb = (tracemalloc.get_traced_memory()[0] - mem_before) / 1e6
+        tracemalloc.stop()
+
+        state_writes = 0
+
+        def _count(_event):
+            nonlocal state_writes
+            state_writes += 1
+
+        unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _count)
+        sampler = LoopLagSampler()
+        sampler.start()
+        store_counter.reset()
+
+        coords = [
+            hass.data["evconduit"][f"{eid}_vehicle"]
+            for eid in entry_ids if f"{eid}_vehicle" in hass.data.get("evconduit", {})
+        ]
+        phase_start = time.perf_counter()
+        cpu_start = time.process_time()
+        for _ in range(polls):
+            await asyncio.gather(*(c.async_refresh() for c in coords))
+        poll_cpu = time.process_time() - cpu_start
+
+        # Webhook pushes go through the real aiohttp handler
+        import aiohttp
+
+        async with aiohttp.ClientSession() as session:
+            for i in range(pushes):
+                for n, eid in enumerate(entry_ids):
+                    payload = {"vehicle": {
+                        "id": f"sim-vehicle-{n:05d}",
+                        "chargeState": {"batteryLevel": 50 + i % 40, "chargeRate": 7.4},
+                    }}
+                    async with session.post(
+                        f"http://127.0.0.1:{http_port}/api/webhook/{eid}", json=payload
+                    ) as resp:
+                        await resp.read()
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - phase_start
+        await sampler.stop()
+        unsub()
+
+        return {
+            "entries": entries,
+            "sessions": sessions,
+            "setup_s": round(setup_s, 3),
+            "mem_mb": round(mem_mb, 2),
+            "poll_cpu_ms": round(1000 * poll_cpu / max(1, polls * len(coords)), 3),
+            "lag_p95_ms": round(1000 * _percentile(sampler.samples, 0.95), 2),
+            "lag_max_ms": round(1000 * max(sampler.samples, default=0.0), 2),
+            "writes_per_s": round(state_writes / elapsed, 1) if elapsed else 0.0,
+            "store_writes": store_counter.writes,
+            "store_kb": round(store_counter.bytes / 1024, 1),
+        }
+    finally:
+        if store_counter:
+            store_counter.restore()
+        if hass is not None:
+            await hass.async_stop(force=True)
+        sim.terminate()
+        sim.wait()
+        for name in [m for m in sys.modules if m.startswith("custom_components")]:
+            del sys.modules[name]
+        if config_dir in sys.path:
+            sys.path.remove(config_dir)
+        shutil.rmtree(config_dir, ignore_errors=True)
+
+
+def _print_table(rows: list[dict]) -> None:
+    if not rows:
+        return
+    cols = list(rows[0])
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in cols}
+    print("  ".join(c.rjust(widths[c]) for c in cols))
+    for r in rows:
+        print("  ".join(str(r[c]).rjust(widths[c]) for c in cols))
+
+
+async def _main(args) -> None:
+    rows = []
+    for entries in args.entries:
+        for sessions in args.sessions:
+            print(f"Running {entries} entries x {sessions} sessions ...", file=sys.stderr)
+            rows.append(await run_case(entries, sessions, args.polls, args.pushes, args.latency))
+    _print_table(rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(rows, fh, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EVConduit N x M scaling benchmark")
+    parser.add_argument("--entries", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[0, 1000, 50000])
+    parser.add_argument("--polls", type=int, default=5, help="refresh rounds per case")
+    parser.add_argument("--pushes", type=int, default=5, help="webhook pushes per vehicle")
+    parser.add_argument("--latency", type=float, default=20.0, help="simulator latency (ms)")
+    parser.add_argument("--json", help="also write results to this file")
+    asyncio.run(_main(parser.parse_args()))
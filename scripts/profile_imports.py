@@ -0,0 +1,93 @@
+"""
+Import-time profile of the integration.
+
+Runs a fresh interpreter with ``python -X importtime`` for each requested
+module, parses the report and prints:
+
+  total_ms    cumulative import time of the module itself
+  own_ms      time spent in evconduit modules (self time)
+  deps_ms     time spent importing everything else for the first time
+
+followed by the slowest imports. Home Assistant core modules that every
+integration shares are still counted, so compare numbers between runs of
+this script rather than against other integrations.
+
+Usage:
+
+  python scripts/profile_imports.py
+  python scripts/profile_imports.py --module custom_components.evconduit.sensor --top 30
+  python scripts/profile_imports.py --preload homeassistant.helpers.entity
+
+``--preload`` imports modules before timing starts, to approximate a
+running Home Assistant where the core helpers are already loaded.
+
+Requires the homeassistant package in the current environment.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "custom_components.evconduit",
+    "custom_components.evconduit.sensor",
+    "custom_components.evconduit.device_tracker",
+]
+
+# Loaded by Home Assistant itself before any integration is imported
+DEFAULT_PRELOAD = [
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.entity",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.sensor",
+]
+
+
+def profile(module: str, preload: list[str]) -> list[tuple[str, int, int]]:
+    """Return (name, self_us, cumulative_us) for every module imported by `module`."""
+    code = "".join(f"import {name}\n" for name in preload)
+    code += "import sys; sys.stderr.write('--- start ---\\n')\n"
+    code += f"import {module}\n"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    _, _, report = result.stderr.partition("--- start ---\n")
+    rows = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[12:].split("|"))
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="EVConduit import-time profile")
+    parser.add_argument("--module", action="append", help="module to profile (repeatable)")
+    parser.add_argument("--preload", action="append", help="module imported before timing (repeatable)")
+    parser.add_argument("--no-preload", action="store_true", help="time a cold interpreter")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args()
+
+    preload = [] if args.no_preload else (args.preload or DEFAULT_PRELOAD)
+    for module in args.module or DEFAULT_MODULES:
+        rows = profile(module, preload)
+        if not rows:
+            print(f"{module}: already imported by the preload")
+            continue
+        total = next((cum for name, _, cum in rows if name == module), max(cum for _, _, cum in rows))
+        own = sum(s for name, s, _ in rows if "evconduit" in name)
+        print(f"{module}")
+        print(f"  total_ms {total / 1000:8.1f}   own_ms {own / 1000:6.1f}   deps_ms {(total - own) / 1000:8.1f}")
+        for name, self_us, cum_us in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+            print(f"  {self_us / 1000:8.2f} ms self  {cum_us / 1000:8.2f} ms cum  {name}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
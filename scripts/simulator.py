@@ -0,0 +1,399 @@
+"""
+Local EVConduit backend simulator for load and integration testing.
+
+Implements the subset of the EVConduit API used by the integration so that
+EVConduitClient, the push webhook and charging history sync can be exercised
+without backend.evconduit.com:
+
+  GET    /api/me
+  GET    /api/user/vehicles
+  GET    /api/status/{vehicle_id}
+  POST   /api/charging/{vehicle_id}
+  GET    /api/ha/charging/sessions
+  POST   /api/ha/charging/{vehicle_id}/odometer
+  POST   /api/ha/electricity-rate
+  POST   /api/ha/electricity-tariff
+  POST   /api/ha/webhook/register
+  DELETE /api/ha/webhook/register
+  GET    /_sim/stats                  (request counters, not part of the real API)
+
+Usage:
+
+  python scripts/simulator.py --vehicles 1000 --sessions 5000 \\
+      --latency 80 --jitter 40 --rate-limit 0.02 --push-interval 5
+
+Point Home Assistant at it by changing ENVIRONMENTS["sandbox"] in const.py to
+http://127.0.0.1:8765 and selecting the sandbox environment. Once the
+integration registers its webhook, the simulator pushes scripted vehicle
+updates to <external_url>/api/webhook/<webhook_id> every --push-interval
+seconds. Every --session-every pushes it finishes a charge, appends a new
+session and sends event=charging_session_completed.
+
+The module can also be imported: ``async_start_simulator`` returns the
+running ``web.AppRunner`` and its ``SimulatorState``.
+"""
+
+import argparse
+import asyncio
+import bisect
+import logging
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import aiohttp
+from aiohttp import web
+
+_LOGGER = logging.getLogger("evconduit.simulator")
+
+BRANDS = (
+    ("Tesla", "Model 3"), ("Volkswagen", "ID.4"), ("Kia", "EV6"),
+    ("Hyundai", "Ioniq 5"), ("Polestar", "2"), ("BMW", "i4"),
+)
+STATIONS = ("Home", "Work", "Supercharger Gävle", "IONITY Jönköping", "Mall garage", None)
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+class SimulatorState:
+    """Deterministic fake account with vehicles, charging sessions and webhooks."""
+
+    def __init__(
+        self,
+        vehicles: int = 1,
+        sessions: int = 100,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rate_limit: float = 0.0,
+        api_key: str | None = None,
+        seed: int = 1,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.api_key = api_key
+        self.random = random.Random(seed)
+        self.requests: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+        self.webhooks: dict[str, dict] = {}
+        self.electricity_rates: list[dict] = []
+        self.tariffs: list[dict] = []
+        self.vehicles: dict[str, dict] = {}
+        for i in range(vehicles):
+            vid = f"sim-vehicle-{i:05d}"
+            self.vehicles[vid] = self._make_vehicle(vid, i)
+        self.sessions: list[dict] = self._make_sessions(sessions)
+        self._session_starts = [s["start_time"] for s in self.sessions]
+
+    # ---- data generation -------------------------------------------------
+
+    def _make_vehicle(self, vid: str, index: int) -> dict:
+        brand, model = BRANDS[index % len(BRANDS)]
+        rnd = self.random
+        return {
+            "id": vid,
+            "vehicleName": f"{brand} {model} #{index}",
+            "vendor": brand.upper(),
+            "lastSeen": _iso(datetime.now(timezone.utc)),
+            "isReachable": True,
+            "chargingState": "IDLE",
+            "information": {
+                "displayName": f"{brand} {model} #{index}",
+                "vin": f"SIMVIN{index:011d}",
+                "brand": brand,
+                "model": model,
+                "year": 2020 + index % 6,
+            },
+            "chargeState": {
+                "batteryLevel": rnd.randint(20, 90),
+                "batteryCapacity": 75.0,
+                "chargeLimit": 80,
+                "powerDeliveryState": "UNPLUGGED",
+                "chargeRate": None,
+                "chargeTimeRemaining": None,
+                "isPluggedIn": False,
+                "isCharging": False,
+                "range": rnd.randint(100, 450),
+            },
+            "location": {
+                "latitude": 59.33 + rnd.uniform(-0.2, 0.2),
+                "longitude": 18.06 + rnd.uniform(-0.2, 0.2),
+            },
+            "odometer": {"distance": rnd.randint(1000, 150000)},
+            "smartChargingPolicy": {"isEnabled": False, "minimumChargeLimit": 20},
+            "capabilities": {
+                "chargeState": {"isCapable": True},
+                "location": {"isCapable": True},
+                "odometer": {"isCapable": True},
+                "information": {"isCapable": True},
+                "smartChargingPolicy": {"isCapable": index % 2 == 0},
+                "abrp_extra": {"isCapable": index % 3 == 0},
+            },
+        }
+
+    def _make_session(self, start: datetime, index: int) -> dict:
+        rnd = self.random
+        duration = timedelta(minutes=rnd.randint(20, 600))
+        energy = round(rnd.uniform(3, 70), 3)
+        cost_per_kwh = round(rnd.uniform(0.5, 4.0), 3)
+        battery_start = rnd.randint(5, 60)
+        end = start + duration
+        return {
+            "session_id": f"sim-session-{index:08d}",
+            "start_time": _iso(start),
+            "end_time": _iso(end),
+            "created_at": _iso(end + timedelta(seconds=rnd.randint(5, 120))),
+            "energy_added_kwh": energy,
+            "cost_per_kwh": cost_per_kwh,
+            "total_cost": round(energy * cost_per_kwh, 2),
+            "currency": "SEK",
+            "station_name": rnd.choice(STATIONS),
+            "location_lat": 59.33 + rnd.uniform(-0.5, 0.5),
+            "location_lon": 18.06 + rnd.uniform(-0.5, 0.5),
+            "battery_level_start": battery_start,
+            "battery_level_end": min(100, battery_start + rnd.randint(10, 60)),
+        }
+
+    def _make_sessions(self, count: int) -> list[dict]:
+        now = datetime.now(timezone.utc)
+        start = now - timedelta(hours=12 * count)
+        return [self._make_session(start + timedelta(hours=12 * i), i) for i in range(count)]
+
+    def add_session(self) -> dict:
+        """Append a freshly finished session ending now."""
+        now = datetime.now(timezone.utc)
+        session = self._make_session(now - timedelta(hours=1), len(self.sessions))
+        session["end_time"] = _iso(now)
+        session["created_at"] = _iso(now)
+        self.sessions.append(session)
+        self._session_starts.append(session["start_time"])
+        return session
+
+    def sessions_since(self, since: str | None, limit: int) -> tuple[list[dict], bool]:
+        pos = bisect.bisect_right(self._session_starts, since) if since else 0
+        batch = self.sessions[pos:pos + limit]
+        return batch, pos + limit < len(self.sessions)
+
+    def tick_vehicle(self, vid: str) -> dict:
+        """Advance one vehicle by a small random step and return the change."""
+        v = self.vehicles[vid]
+        cs = v["chargeState"]
+        rnd = self.random
+        if cs["isCharging"]:
+            cs["batteryLevel"] = min(100, cs["batteryLevel"] + rnd.randint(1, 3))
+            cs["chargeRate"] = round(rnd.uniform(6, 11), 1)
+            if cs["batteryLevel"] >= cs["chargeLimit"]:
+                cs.update(isCharging=False, chargeRate=None, powerDeliveryState="PLUGGED_IN:COMPLETE")
+        else:
+            v["location"]["latitude"] += rnd.uniform(-0.001, 0.001)
+            v["location"]["longitude"] += rnd.uniform(-0.001, 0.001)
+        v["lastSeen"] = _iso(datetime.now(timezone.utc))
+        return {
+            "id": vid,
+            "lastSeen": v["lastSeen"],
+            "chargeState": dict(cs),
+            "location": dict(v["location"]),
+        }
+
+    # ---- request helpers -------------------------------------------------
+
+    async def before_request(self, request: web.Request, endpoint: str) -> web.Response | None:
+        """Apply latency, auth and 429 injection; return a response to short-circuit."""
+        self.requests[endpoint] += 1
+        if self.latency_ms or self.jitter_ms:
+            delay = max(0.0, self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms))
+            await asyncio.sleep(delay / 1000)
+        auth = request.headers.get("Authorization", "")
+        if not auth.startswith("Bearer ") or (self.api_key and auth[7:] != self.api_key):
+            return web.Response(status=401, text="Unauthorized")
+        if self.rate_limit and self.random.random() < self.rate_limit:
+            self.rate_limited[endpoint] += 1
+            return web.Response(status=429, text="Too Many Requests")
+        return None
+
+
+def build_app(state: SimulatorState) -> web.Application:
+    """Build the aiohttp application serving the simulated API."""
+    routes = web.RouteTableDef()
+
+    def endpoint(name: str):
+        def wrap(handler):
+            async def _wrapped(request: web.Request) -> web.Response:
+                early = await state.before_request(request, name)
+                if early is not None:
+                    return early
+                return await handler(request)
+            return _wrapped
+        return wrap
+
+    @routes.get("/api/me")
+    @endpoint("me")
+    async def _me(request):
+        return web.json_response({
+            "tier": "pro", "email": "sim@example.com", "name": "Simulator",
+            "role": "user", "sms_credits": 0,
+        })
+
+    @routes.get("/api/user/vehicles")
+    @endpoint("vehicles")
+    async def _vehicles(request):
+        return web.json_response([
+            {"id": vid, "information": v["information"]} for vid, v in state.vehicles.items()
+        ])
+
+    @routes.get("/api/status/{vehicle_id}")
+    @endpoint("status")
+    async def _status(request):
+        v = state.vehicles.get(request.match_info["vehicle_id"])
+        if v is None:
+            return web.Response(status=400, text="Unknown vehicle")
+        return web.json_response(v)
+
+    @routes.post("/api/charging/{vehicle_id}")
+    @endpoint("charging")
+    async def _charging(request):
+        v = state.vehicles.get(request.match_info["vehicle_id"])
+        if v is None:
+            return web.Response(status=400, text="Unknown vehicle")
+        action = (await request.json()).get("action")
+        if action not in ("START", "STOP"):
+            return web.Response(status=400, text="Invalid action")
+        cs = v["chargeState"]
+        cs.update(isPluggedIn=True, isCharging=action == "START")
+        return web.json_response({"status": "ok", "action": action})
+
+    @routes.get("/api/ha/charging/sessions")
+    @endpoint("charging_sessions")
+    async def _sessions(request):
+        limit = min(int(request.query.get("limit", 50)), 500)
+        batch, has_more = state.sessions_since(request.query.get("since"), limit)
+        return web.json_response({"sessions": batch, "has_more": has_more})
+
+    @routes.post("/api/ha/charging/{vehicle_id}/odometer")
+    @endpoint("odometer")
+    async def _odometer(request):
+        if not state.sessions:
+            return web.Response(status=404, text="No session")
+        state.sessions[-1]["odometer_km"] = (await request.json()).get("odometer_km")
+        return web.json_response({"session_id": state.sessions[-1]["session_id"]})
+
+    @routes.post("/api/ha/electricity-rate")
+    @endpoint("electricity_rate")
+    async def _rate(request):
+        state.electricity_rates.append(await request.json())
+        return web.json_response({"status": "ok"})
+
+    @routes.post("/api/ha/electricity-tariff")
+    @endpoint("electricity_tariff")
+    async def _tariff(request):
+        state.tariffs.append(await request.json())
+        return web.json_response({"status": "ok"})
+
+    @routes.post("/api/ha/webhook/register")
+    @endpoint("webhook_register")
+    async def _register(request):
+        payload = await request.json()
+        state.webhooks[payload["webhook_id"]] = payload
+        return web.json_response({"status": "registered"})
+
+    @routes.delete("/api/ha/webhook/register")
+    @endpoint("webhook_unregister")
+    async def _unregister(request):
+        return web.json_response({"status": "unregistered"})
+
+    @routes.get("/_sim/stats")
+    async def _stats(request):
+        return web.json_response({
+            "requests": dict(state.requests),
+            "rate_limited": dict(state.rate_limited),
+            "vehicles": len(state.vehicles),
+            "sessions": len(state.sessions),
+            "webhooks": len(state.webhooks),
+            "electricity_rates": len(state.electricity_rates),
+            "tariffs": len(state.tariffs),
+        })
+
+    app = web.Application()
+    app.add_routes(routes)
+    return app
+
+
+async def async_push_webhooks(state: SimulatorState, interval: float, session_every: int = 0) -> None:
+    """Push scripted vehicle updates to every registered webhook, forever."""
+    pushes = 0
+    async with aiohttp.ClientSession() as session:
+        while True:
+            await asyncio.sleep(interval)
+            pushes += 1
+            finish = session_every and pushes % session_every == 0
+            for webhook_id, reg in list(state.webhooks.items()):
+                vid = reg.get("vehicle_id") or next(iter(state.vehicles))
+                if vid not in state.vehicles:
+                    continue
+                payload = {"vehicle": state.tick_vehicle(vid), "vehicleId": vid}
+                if finish:
+                    state.add_session()
+                    payload["event"] = "charging_session_completed"
+                url = f"{reg['external_url']}/api/webhook/{webhook_id}"
+                start = time.monotonic()
+                try:
+                    async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                        _LOGGER.debug("Pushed to %s: HTTP %s in %.3fs", url, resp.status, time.monotonic() - start)
+                except (TimeoutError, aiohttp.ClientError) as err:
+                    _LOGGER.warning("Webhook push to %s failed: %s", url, err)
+
+
+async def async_start_simulator(
+    host: str = "127.0.0.1", port: int = 8765, **kwargs
+) -> tuple[web.AppRunner, SimulatorState]:
+    """Start the simulator on host:port and return (runner, state)."""
+    state = SimulatorState(**kwargs)
+    runner = web.AppRunner(build_app(state))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    _LOGGER.info(
+        "EVConduit simulator on http://%s:%s (%d vehicles, %d sessions)",
+        host, port, len(state.vehicles), len(state.sessions),
+    )
+    return runner, state
+
+
+async def _main(args) -> None:
+    runner, state = await async_start_simulator(
+        args.host, args.port,
+        vehicles=args.vehicles, sessions=args.sessions,
+        latency_ms=args.latency, jitter_ms=args.jitter,
+        rate_limit=args.rate_limit, api_key=args.api_key, seed=args.seed,
+    )
+    try:
+        if args.push_interval:
+            await async_push_webhooks(state, args.push_interval, args.session_every)
+        else:
+            await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--vehicles", type=int, default=1, help="number of simulated vehicles")
+    parser.add_argument("--sessions", type=int, default=100, help="number of stored charging sessions")
+    parser.add_argument("--latency", type=float, default=0.0, help="mean response latency (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latency jitter (± ms)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="probability of answering 429")
+    parser.add_argument("--api-key", default=None, help="only accept this bearer token")
+    parser.add_argument("--push-interval", type=float, default=0.0, help="seconds between webhook pushes")
+    parser.add_argument("--session-every", type=int, default=0, help="finish a charge every N pushes")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass